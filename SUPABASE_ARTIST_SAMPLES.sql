@@ -0,0 +1,25 @@
+-- ============================================
+-- SAMPLE ARTWORKS PER ARTIST
+-- Run this AFTER running SUPABASE_QUERY_INDEXES.sql
+-- ============================================
+-- Called by GET /api/public/art-class-matches/{id}:
+--   supabase.rpc('artist_sample_artworks', {'p_artist_ids': [...], 'p_per_artist': 3})
+-- Returns each artist's p_per_artist most viewed approved artworks in one
+-- round trip. Each artist is a LIMIT read of idx_artworks_artist_approved_views
+-- (artist_id, is_approved, views DESC), so the cost follows the number of
+-- artists, not the size of their portfolios.
+
+CREATE OR REPLACE FUNCTION public.artist_sample_artworks(p_artist_ids UUID[], p_per_artist INT DEFAULT 3)
+RETURNS SETOF public.artworks AS $$
+  SELECT sample.*
+  FROM unnest(p_artist_ids) AS artist(id)
+  CROSS JOIN LATERAL (
+    SELECT * FROM public.artworks
+    WHERE artworks.artist_id = artist.id AND artworks.is_approved = TRUE
+    ORDER BY artworks.views DESC
+    LIMIT p_per_artist
+  ) AS sample;
+$$ LANGUAGE sql STABLE;
+
+-- Only the backend (service role) may call it
+REVOKE EXECUTE ON FUNCTION public.artist_sample_artworks(UUID[], INT) FROM PUBLIC, anon, authenticated;
@@ -0,0 +1,68 @@
+-- ============================================
+-- ART CLASS ENQUIRY SUBMISSION
+-- Run this AFTER running SUPABASE_SCHEMA.sql
+-- ============================================
+-- Called by POST /api/public/art-class-enquiry once the backend has matched
+-- teachers:
+--   supabase.rpc('create_art_class_enquiry', {'p_user_id': ..., 'p_art_type': ..., ...})
+-- Enforces one enquiry per user per 30 days and inserts it in one round
+-- trip, filling the user's name, email and (if not given) location from
+-- their profile. Returns the inserted enquiry, or NULL when the user
+-- already has one in the last 30 days.
+
+CREATE OR REPLACE FUNCTION public.create_art_class_enquiry(
+  p_user_id UUID,
+  p_art_type TEXT,
+  p_skill_level TEXT,
+  p_duration TEXT,
+  p_budget_range TEXT,
+  p_class_type TEXT,
+  p_user_location TEXT DEFAULT NULL,
+  p_matched_artists UUID[] DEFAULT '{}'
+)
+RETURNS JSONB AS $$
+DECLARE
+  v_profile RECORD;
+  v_enquiry public.art_class_enquiries;
+BEGIN
+  -- Concurrent submissions by the same user queue here until the first one
+  -- commits, so the check below sees its row. The lock is per user and is
+  -- released at the end of the transaction.
+  PERFORM pg_advisory_xact_lock(hashtextextended('art_class_enquiry:' || p_user_id::text, 0));
+
+  IF EXISTS (
+    SELECT 1 FROM public.art_class_enquiries
+    WHERE user_id = p_user_id AND created_at >= NOW() - INTERVAL '30 days'
+  ) THEN
+    RETURN NULL;
+  END IF;
+
+  SELECT full_name, email, location INTO v_profile FROM public.profiles WHERE id = p_user_id;
+
+  INSERT INTO public.art_class_enquiries (
+    user_id, user_name, user_email, user_location, art_type, skill_level, duration,
+    budget_range, class_type, status, matched_artists, contacts_revealed
+  ) VALUES (
+    p_user_id,
+    COALESCE(v_profile.full_name, ''),
+    COALESCE(v_profile.email, ''),
+    COALESCE(NULLIF(p_user_location, ''), v_profile.location, ''),
+    p_art_type, p_skill_level, p_duration, p_budget_range, p_class_type,
+    CASE WHEN cardinality(p_matched_artists) > 0 THEN 'matched' ELSE 'pending' END,
+    COALESCE(p_matched_artists, '{}'),
+    '{}'
+  )
+  RETURNING * INTO v_enquiry;
+
+  RETURN to_jsonb(v_enquiry);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Only the backend (service role) may call it
+REVOKE EXECUTE ON FUNCTION public.create_art_class_enquiry(UUID, TEXT, TEXT, TEXT, TEXT, TEXT, TEXT, UUID[])
+  FROM PUBLIC, anon, authenticated;
+
+-- The quota check is a range scan of one user's recent enquiries
+-- (also created by SUPABASE_QUERY_INDEXES.sql)
+CREATE INDEX IF NOT EXISTS idx_enquiries_user_created
+  ON public.art_class_enquiries (user_id, created_at DESC);
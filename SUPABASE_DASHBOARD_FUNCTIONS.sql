@@ -0,0 +1,22 @@
+-- ============================================
+-- DASHBOARD AGGREGATE FUNCTIONS
+-- Run this AFTER running SUPABASE_SCHEMA.sql
+-- ============================================
+-- Each dashboard endpoint fetches all of its numbers with one RPC call.
+-- Counting and summing happen in the database, so the response is a
+-- single small JSON object however large the tables grow.
+-- The platform-wide admin and kalakar numbers come from the
+-- platform_counters table instead (see SUPABASE_PLATFORM_COUNTERS.sql).
+
+-- GET /api/artist/dashboard
+CREATE OR REPLACE FUNCTION public.artist_dashboard_stats(p_artist_id UUID)
+RETURNS JSONB AS $$
+  SELECT jsonb_build_object(
+    'total_artworks', (SELECT COUNT(*) FROM public.artworks WHERE artist_id = p_artist_id),
+    'portfolio_views', (SELECT COALESCE(SUM(views), 0) FROM public.artworks WHERE artist_id = p_artist_id),
+    'completed_orders', (SELECT COUNT(*) FROM public.orders WHERE artist_id = p_artist_id)
+  );
+$$ LANGUAGE sql STABLE;
+
+-- Only the backend (service role) may call it
+REVOKE EXECUTE ON FUNCTION public.artist_dashboard_stats(UUID) FROM PUBLIC, anon, authenticated;
@@ -0,0 +1,66 @@
+-- ============================================
+-- PAINTINGS MARKETPLACE FACETS
+-- Run this AFTER running SUPABASE_SCHEMA.sql
+-- ============================================
+-- Called by GET /api/public/paintings alongside the first page of results:
+--   supabase.rpc('painting_facets', {'p_category': ..., 'p_min_price': ...,
+--                'p_max_price': ..., 'p_location': ..., 'p_available': ...})
+-- Returns {"total": n, "categories": {"<category>": n}, "price_buckets": {"<bucket>": n}}.
+-- Each facet is counted with every filter applied except its own, so the
+-- counts show what selecting another value would return.
+-- Price buckets match the marketplace filter: under-5000, 5000-15000,
+-- 15000-50000 and above-50000 (lower bound inclusive).
+
+-- sort=views ranks by artworks.views; an artwork nobody has viewed has 0
+-- views, not NULL (which would sort it before the most viewed ones)
+UPDATE public.artworks SET views = 0 WHERE views IS NULL;
+ALTER TABLE public.artworks ALTER COLUMN views SET DEFAULT 0;
+ALTER TABLE public.artworks ALTER COLUMN views SET NOT NULL;
+
+CREATE OR REPLACE FUNCTION public.painting_facets(
+  p_category TEXT DEFAULT NULL,
+  p_min_price NUMERIC DEFAULT NULL,
+  p_max_price NUMERIC DEFAULT NULL,
+  p_location TEXT DEFAULT NULL,
+  p_available BOOLEAN DEFAULT NULL
+)
+RETURNS JSONB AS $$
+  WITH base AS (
+    SELECT a.category, a.price
+    FROM public.artworks a
+    JOIN public.profiles p ON p.id = a.artist_id
+    WHERE a.is_approved
+      AND (p_location IS NULL OR p.location ILIKE '%' || p_location || '%')
+      AND (p_available IS NULL OR a.is_available = p_available)
+  ),
+  priced AS (
+    SELECT * FROM base
+    WHERE (p_min_price IS NULL OR price >= p_min_price)
+      AND (p_max_price IS NULL OR price < p_max_price)
+  )
+  SELECT jsonb_build_object(
+    'total', (
+      SELECT COUNT(*) FROM priced
+      WHERE p_category IS NULL OR category = p_category
+    ),
+    'categories', COALESCE((
+      SELECT jsonb_object_agg(category, n)
+      FROM (SELECT category, COUNT(*) AS n FROM priced GROUP BY category) c
+    ), '{}'::jsonb),
+    'price_buckets', COALESCE((
+      SELECT jsonb_object_agg(bucket, n)
+      FROM (
+        SELECT CASE
+                 WHEN price < 5000 THEN 'under-5000'
+                 WHEN price < 15000 THEN '5000-15000'
+                 WHEN price < 50000 THEN '15000-50000'
+                 ELSE 'above-50000'
+               END AS bucket,
+               COUNT(*) AS n
+        FROM base
+        WHERE p_category IS NULL OR category = p_category
+        GROUP BY 1
+      ) b
+    ), '{}'::jsonb)
+  );
+$$ LANGUAGE sql STABLE;
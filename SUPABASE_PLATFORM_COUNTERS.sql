@@ -0,0 +1,209 @@
+-- ============================================
+-- PLATFORM COUNTERS
+-- Run this AFTER running SUPABASE_SCHEMA.sql
+-- ============================================
+-- A single-row table of platform statistics, kept current by triggers on
+-- artworks, exhibitions and profiles. GET /api/public/stats, the admin
+-- dashboard and the kalakar analytics read it with one primary-key
+-- lookup (id = 1) instead of recounting the tables on every request.
+-- If the counters ever drift, recompute them with:
+--   python scripts/reconcile_counters.py
+-- which calls reconcile_platform_counters() below.
+
+CREATE TABLE IF NOT EXISTS public.platform_counters (
+  id INT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+  total_users BIGINT NOT NULL DEFAULT 0,
+  approved_artists BIGINT NOT NULL DEFAULT 0,
+  pending_artists BIGINT NOT NULL DEFAULT 0,
+  approved_artworks BIGINT NOT NULL DEFAULT 0,
+  pending_artworks BIGINT NOT NULL DEFAULT 0,
+  total_exhibitions BIGINT NOT NULL DEFAULT 0,
+  approved_exhibitions BIGINT NOT NULL DEFAULT 0,
+  pending_exhibitions BIGINT NOT NULL DEFAULT 0,
+  active_exhibitions BIGINT NOT NULL DEFAULT 0,
+  archived_exhibitions BIGINT NOT NULL DEFAULT 0,
+  total_revenue NUMERIC NOT NULL DEFAULT 0,
+  voluntary_platform_fees NUMERIC NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+INSERT INTO public.platform_counters (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
+
+-- RLS with no policies: only the backend (service role) can read the row,
+-- since it holds revenue and admin-only pending counts
+ALTER TABLE public.platform_counters ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Platform counters are viewable by everyone" ON public.platform_counters;
+
+-- ---------- artworks ----------
+CREATE OR REPLACE FUNCTION public.count_artworks_change()
+RETURNS TRIGGER AS $$
+DECLARE
+  d_approved INT := 0;
+  d_pending INT := 0;
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    d_approved := d_approved - (OLD.is_approved IS TRUE)::INT;
+    d_pending := d_pending - (OLD.is_approved IS FALSE)::INT;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    d_approved := d_approved + (NEW.is_approved IS TRUE)::INT;
+    d_pending := d_pending + (NEW.is_approved IS FALSE)::INT;
+  END IF;
+
+  IF d_approved <> 0 OR d_pending <> 0 THEN
+    UPDATE public.platform_counters
+    SET approved_artworks = approved_artworks + d_approved,
+        pending_artworks = pending_artworks + d_pending,
+        updated_at = NOW()
+    WHERE id = 1;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS count_artworks ON public.artworks;
+CREATE TRIGGER count_artworks
+  AFTER INSERT OR DELETE OR UPDATE OF is_approved ON public.artworks
+  FOR EACH ROW EXECUTE FUNCTION public.count_artworks_change();
+
+-- ---------- profiles ----------
+CREATE OR REPLACE FUNCTION public.count_profiles_change()
+RETURNS TRIGGER AS $$
+DECLARE
+  d_users INT := 0;
+  d_approved INT := 0;
+  d_pending INT := 0;
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    d_users := d_users - (TG_OP = 'DELETE')::INT;
+    d_approved := d_approved - (OLD.role = 'artist' AND OLD.is_approved IS TRUE)::INT;
+    d_pending := d_pending - (OLD.role = 'artist' AND OLD.is_approved IS FALSE)::INT;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    d_users := d_users + (TG_OP = 'INSERT')::INT;
+    d_approved := d_approved + (NEW.role = 'artist' AND NEW.is_approved IS TRUE)::INT;
+    d_pending := d_pending + (NEW.role = 'artist' AND NEW.is_approved IS FALSE)::INT;
+  END IF;
+
+  IF d_users <> 0 OR d_approved <> 0 OR d_pending <> 0 THEN
+    UPDATE public.platform_counters
+    SET total_users = total_users + d_users,
+        approved_artists = approved_artists + d_approved,
+        pending_artists = pending_artists + d_pending,
+        updated_at = NOW()
+    WHERE id = 1;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS count_profiles ON public.profiles;
+CREATE TRIGGER count_profiles
+  AFTER INSERT OR DELETE OR UPDATE OF role, is_approved ON public.profiles
+  FOR EACH ROW EXECUTE FUNCTION public.count_profiles_change();
+
+-- ---------- exhibitions ----------
+CREATE OR REPLACE FUNCTION public.count_exhibitions_change()
+RETURNS TRIGGER AS $$
+DECLARE
+  d_total INT := 0;
+  d_approved INT := 0;
+  d_pending INT := 0;
+  d_active INT := 0;
+  d_archived INT := 0;
+  d_revenue NUMERIC := 0;
+  d_voluntary NUMERIC := 0;
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    d_total := d_total - (TG_OP = 'DELETE')::INT;
+    d_approved := d_approved - (OLD.is_approved IS TRUE)::INT;
+    d_pending := d_pending - (OLD.is_approved IS FALSE)::INT;
+    d_active := d_active - (OLD.status = 'active')::INT;
+    d_archived := d_archived - (OLD.status = 'archived')::INT;
+    d_revenue := d_revenue - COALESCE(OLD.fees, 0);
+    d_voluntary := d_voluntary - COALESCE(OLD.voluntary_platform_fee, 0);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    d_total := d_total + (TG_OP = 'INSERT')::INT;
+    d_approved := d_approved + (NEW.is_approved IS TRUE)::INT;
+    d_pending := d_pending + (NEW.is_approved IS FALSE)::INT;
+    d_active := d_active + (NEW.status = 'active')::INT;
+    d_archived := d_archived + (NEW.status = 'archived')::INT;
+    d_revenue := d_revenue + COALESCE(NEW.fees, 0);
+    d_voluntary := d_voluntary + COALESCE(NEW.voluntary_platform_fee, 0);
+  END IF;
+
+  IF d_total <> 0 OR d_approved <> 0 OR d_pending <> 0 OR d_active <> 0
+     OR d_archived <> 0 OR d_revenue <> 0 OR d_voluntary <> 0 THEN
+    UPDATE public.platform_counters
+    SET total_exhibitions = total_exhibitions + d_total,
+        approved_exhibitions = approved_exhibitions + d_approved,
+        pending_exhibitions = pending_exhibitions + d_pending,
+        active_exhibitions = active_exhibitions + d_active,
+        archived_exhibitions = archived_exhibitions + d_archived,
+        total_revenue = total_revenue + d_revenue,
+        voluntary_platform_fees = voluntary_platform_fees + d_voluntary,
+        updated_at = NOW()
+    WHERE id = 1;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS count_exhibitions ON public.exhibitions;
+CREATE TRIGGER count_exhibitions
+  AFTER INSERT OR DELETE OR UPDATE OF is_approved, status, fees, voluntary_platform_fee ON public.exhibitions
+  FOR EACH ROW EXECUTE FUNCTION public.count_exhibitions_change();
+
+-- ---------- reconcile ----------
+-- Recompute every counter from the base tables. Writers to the three
+-- tables wait for the duration of the recount so no delta is lost.
+-- Returns the counters as they were before and after.
+CREATE OR REPLACE FUNCTION public.reconcile_platform_counters()
+RETURNS JSONB AS $$
+DECLARE
+  before_row JSONB;
+  after_row JSONB;
+BEGIN
+  LOCK TABLE public.artworks, public.exhibitions, public.profiles IN SHARE MODE;
+
+  SELECT to_jsonb(c) INTO before_row FROM public.platform_counters c WHERE id = 1;
+
+  INSERT INTO public.platform_counters (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
+
+  UPDATE public.platform_counters SET
+    total_users = (SELECT COUNT(*) FROM public.profiles),
+    approved_artists = (SELECT COUNT(*) FROM public.profiles WHERE role = 'artist' AND is_approved IS TRUE),
+    pending_artists = (SELECT COUNT(*) FROM public.profiles WHERE role = 'artist' AND is_approved IS FALSE),
+    approved_artworks = (SELECT COUNT(*) FROM public.artworks WHERE is_approved IS TRUE),
+    pending_artworks = (SELECT COUNT(*) FROM public.artworks WHERE is_approved IS FALSE),
+    total_exhibitions = e.total,
+    approved_exhibitions = e.approved,
+    pending_exhibitions = e.pending,
+    active_exhibitions = e.active,
+    archived_exhibitions = e.archived,
+    total_revenue = e.revenue,
+    voluntary_platform_fees = e.voluntary,
+    updated_at = NOW()
+  FROM (
+    SELECT COUNT(*) AS total,
+           COUNT(*) FILTER (WHERE is_approved IS TRUE) AS approved,
+           COUNT(*) FILTER (WHERE is_approved IS FALSE) AS pending,
+           COUNT(*) FILTER (WHERE status = 'active') AS active,
+           COUNT(*) FILTER (WHERE status = 'archived') AS archived,
+           COALESCE(SUM(fees), 0) AS revenue,
+           COALESCE(SUM(voluntary_platform_fee), 0) AS voluntary
+    FROM public.exhibitions
+  ) AS e
+  WHERE id = 1;
+
+  SELECT to_jsonb(c) INTO after_row FROM public.platform_counters c WHERE id = 1;
+  RETURN jsonb_build_object('before', before_row, 'after', after_row);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+REVOKE EXECUTE ON FUNCTION public.reconcile_platform_counters() FROM PUBLIC, anon, authenticated;
+
+-- Seed the counters from the existing data
+SELECT public.reconcile_platform_counters();
@@ -0,0 +1,22 @@
+-- ============================================
+-- PROFILES CHANGE FEED
+-- Run this AFTER running SUPABASE_SCHEMA.sql
+-- ============================================
+-- Every backend worker keeps an in-memory index of teaching artists for
+-- art-class matching (backend/teacher_index.py). It refreshes by reading
+-- profiles changed since its last refresh, in (updated_at, id) order:
+--   supabase.table('profiles').select(...).or_('updated_at.gt...').order('updated_at').order('id')
+-- so profiles need an updated_at column that every UPDATE bumps.
+
+ALTER TABLE public.profiles
+  ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+
+UPDATE public.profiles SET updated_at = COALESCE(created_at, NOW()) WHERE updated_at IS NULL;
+
+DROP TRIGGER IF EXISTS update_profiles_updated_at ON public.profiles;
+CREATE TRIGGER update_profiles_updated_at BEFORE UPDATE ON public.profiles
+  FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Keyset scan of the change feed
+CREATE INDEX IF NOT EXISTS idx_profiles_updated
+  ON public.profiles (updated_at, id);
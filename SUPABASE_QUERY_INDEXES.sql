@@ -0,0 +1,70 @@
+-- ============================================
+-- COMPOSITE AND PARTIAL INDEXES
+-- Run this AFTER running SUPABASE_SCHEMA.sql
+-- ============================================
+-- The schema only indexes single columns, but the hot queries in
+-- backend/server.py filter on several columns and order by another.
+-- Each index below is matched to the queries it serves; partial indexes
+-- (WHERE is_approved) only hold the rows the public pages can show.
+-- On a busy production database run each statement on its own through
+-- psql with CREATE INDEX CONCURRENTLY to avoid blocking writes.
+-- Before/after plans: python benchmarks/bench_query_indexes.py
+
+-- ---------- artworks ----------
+-- GET /api/public/paintings (sort=newest, keyset on created_at, id)
+CREATE INDEX IF NOT EXISTS idx_artworks_approved_created
+  ON public.artworks (created_at DESC, id DESC) WHERE is_approved;
+
+-- GET /api/public/paintings (sort=price_asc / price_desc)
+CREATE INDEX IF NOT EXISTS idx_artworks_approved_price
+  ON public.artworks (price, id) WHERE is_approved;
+
+-- GET /api/public/paintings (sort=views)
+CREATE INDEX IF NOT EXISTS idx_artworks_approved_views
+  ON public.artworks (views DESC, id DESC) WHERE is_approved;
+
+-- GET /api/public/art-class-matches/{id}, POST /api/admin/feature-registered-artist
+CREATE INDEX IF NOT EXISTS idx_artworks_artist_approved_views
+  ON public.artworks (artist_id, is_approved, views DESC);
+
+-- GET /api/public/artist/{id}
+CREATE INDEX IF NOT EXISTS idx_artworks_artist_approved_created
+  ON public.artworks (artist_id, created_at DESC) WHERE is_approved;
+
+-- GET /api/admin/pending-artworks
+CREATE INDEX IF NOT EXISTS idx_artworks_pending
+  ON public.artworks (created_at) WHERE is_approved = FALSE;
+
+-- ---------- profiles ----------
+-- GET /api/public/artists (keyset on created_at, id), GET /api/admin/pending-artists,
+-- GET /api/admin/approved-artists, POST /api/public/art-class-enquiry
+CREATE INDEX IF NOT EXISTS idx_profiles_role_approved_active
+  ON public.profiles (role, is_approved, is_active, created_at DESC, id DESC);
+
+-- GET /api/admin/users (keyset on created_at, id)
+CREATE INDEX IF NOT EXISTS idx_profiles_created
+  ON public.profiles (created_at DESC, id DESC);
+
+-- ---------- art_class_enquiries ----------
+-- POST /api/public/art-class-enquiry (one per month), GET /api/user/my-enquiries
+CREATE INDEX IF NOT EXISTS idx_enquiries_user_created
+  ON public.art_class_enquiries (user_id, created_at DESC);
+-- Its leading column makes the single-column index redundant
+DROP INDEX IF EXISTS public.idx_enquiries_user_id;
+
+-- ---------- exhibitions ----------
+-- GET /api/public/exhibitions/active, /archived, GET /api/admin/pending-exhibitions
+CREATE INDEX IF NOT EXISTS idx_exhibitions_approved_status
+  ON public.exhibitions (is_approved, status);
+
+-- GET /api/public/exhibitions (keyset on created_at, id), GET /api/admin/kalakar/payment-records
+CREATE INDEX IF NOT EXISTS idx_exhibitions_approved_created
+  ON public.exhibitions (created_at DESC, id DESC) WHERE is_approved;
+
+-- ---------- orders ----------
+-- GET /api/artist/orders
+CREATE INDEX IF NOT EXISTS idx_orders_artist_created
+  ON public.orders (artist_id, created_at DESC);
+DROP INDEX IF EXISTS public.idx_orders_artist_id;
+
+ANALYZE public.artworks, public.profiles, public.art_class_enquiries, public.exhibitions, public.orders;
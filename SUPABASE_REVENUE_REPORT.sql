@@ -0,0 +1,39 @@
+-- ============================================
+-- KALAKAR REVENUE REPORT
+-- Run this AFTER running SUPABASE_SCHEMA.sql
+-- ============================================
+-- Called by GET /api/admin/kalakar/revenue-report:
+--   supabase.rpc('exhibition_revenue_columns', {'p_since': ..., 'p_until': ...})
+-- Returns the fee columns of every exhibition created in [p_since, p_until)
+-- as parallel arrays, in one round trip and without PostgREST's row limit:
+--   {"created_at": [epoch seconds, ...], "exhibition_type": [...], "fees": [...],
+--    "additional_artwork_fee": [...], "voluntary_platform_fee": [...]}
+-- The backend buckets and sums them with NumPy, so one fetch serves the
+-- daily, weekly and monthly views. Like platform_counters.total_revenue,
+-- every exhibition counts, approved or not.
+
+CREATE OR REPLACE FUNCTION public.exhibition_revenue_columns(
+  p_since TIMESTAMPTZ DEFAULT NULL,
+  p_until TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS JSON AS $$
+  -- All aggregates consume the same rows in the same order, so the arrays
+  -- line up. json_agg (not jsonb_agg) and no ORDER BY: the backend only sums
+  -- them, and this halves the time at 100k rows.
+  SELECT json_build_object(
+    'created_at', COALESCE(json_agg(EXTRACT(EPOCH FROM created_at)::float8), '[]'::json),
+    'exhibition_type', COALESCE(json_agg(COALESCE(exhibition_type, 'Kalakanksh')), '[]'::json),
+    'fees', COALESCE(json_agg(COALESCE(fees, 0)), '[]'::json),
+    'additional_artwork_fee', COALESCE(json_agg(COALESCE(additional_artwork_fee, 0)), '[]'::json),
+    'voluntary_platform_fee', COALESCE(json_agg(COALESCE(voluntary_platform_fee, 0)), '[]'::json)
+  )
+  FROM public.exhibitions
+  WHERE (p_since IS NULL OR created_at >= p_since)
+    AND (p_until IS NULL OR created_at < p_until);
+$$ LANGUAGE sql STABLE;
+
+-- Only the backend (service role) may call it
+REVOKE EXECUTE ON FUNCTION public.exhibition_revenue_columns(TIMESTAMPTZ, TIMESTAMPTZ) FROM PUBLIC, anon, authenticated;
+
+-- Range scans on created_at for p_since / p_until
+CREATE INDEX IF NOT EXISTS idx_exhibitions_created_at ON public.exhibitions (created_at);
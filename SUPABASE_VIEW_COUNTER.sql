@@ -0,0 +1,20 @@
+-- ============================================
+-- ARTWORK VIEW COUNTER
+-- Run this AFTER running SUPABASE_SCHEMA.sql
+-- ============================================
+-- The backend buffers artwork page views in memory and periodically
+-- flushes them with a single call:
+--   supabase.rpc('increment_artwork_views', {'view_counts': {"<artwork id>": 3, ...}})
+-- Each row is incremented in place, so concurrent flushes from several
+-- workers never lose counts.
+
+CREATE OR REPLACE FUNCTION public.increment_artwork_views(view_counts JSONB)
+RETURNS VOID AS $$
+  UPDATE public.artworks AS a
+  SET views = COALESCE(a.views, 0) + v.value::INT
+  FROM jsonb_each_text(view_counts) AS v
+  WHERE a.id = v.key::UUID;
+$$ LANGUAGE sql SECURITY DEFINER;
+
+-- Only the backend (service role) may call it
+REVOKE EXECUTE ON FUNCTION public.increment_artwork_views(JSONB) FROM PUBLIC, anon, authenticated;
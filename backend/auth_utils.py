@@ -1,9 +1,16 @@
 import os
+import time
+import asyncio
+import hashlib
 import jwt
 import httpx
 from fastapi import HTTPException, Security, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
+from supabase_client import run_query
+from cache_utils import TTLCache
+from metrics import auth_verify_duration
+from tracing import span
 
 security = HTTPBearer()
 
@@ -11,36 +18,157 @@ security = HTTPBearer()
 SUPABASE_URL = os.environ.get('SUPABASE_URL', 'https://lurvhgzauuzwftfymjym.supabase.co')
 SUPABASE_JWT_SECRET = os.environ.get('SUPABASE_JWT_SECRET', '')  # Get from Supabase settings
 
+# Development only: accept tokens without checking their signature. Never
+# set this in production; without it, tokens that no configured key can
+# verify are rejected.
+AUTH_INSECURE_SKIP_VERIFY = os.environ.get('AUTH_INSECURE_SKIP_VERIFY', '').lower() in ('1', 'true', 'yes')
+
+# JWKS for asymmetric (RS256/ES256) tokens; set SUPABASE_JWKS_URL to an
+# empty string to turn it off. Parsed public keys are kept
+# indexed by `kid`; an unknown `kid` triggers a refresh at most once every
+# JWKS_MIN_REFRESH_INTERVAL seconds, and keys older than JWKS_TTL are
+# refreshed in the background while the current ones keep serving.
+SUPABASE_JWKS_URL = os.environ.get('SUPABASE_JWKS_URL', f"{SUPABASE_URL}/auth/v1/.well-known/jwks.json")
+JWKS_TTL = float(os.environ.get('JWKS_TTL', '600'))
+JWKS_MIN_REFRESH_INTERVAL = float(os.environ.get('JWKS_MIN_REFRESH_INTERVAL', '30'))
+JWKS_FETCH_TIMEOUT = float(os.environ.get('JWKS_FETCH_TIMEOUT', '5'))
+ASYMMETRIC_ALGORITHMS = ["RS256", "ES256"]
+
 # Cache for JWKS
 _jwks_cache = None
+_jwks_keys = {}
+_jwks_fetched_at = None
+_jwks_refresh = None  # In-flight refresh shared by all callers
+
+# Cache for role/approval lookups, keyed by user id
+PROFILE_CACHE_TTL = float(os.environ.get('PROFILE_CACHE_TTL', '30'))
+PROFILE_CACHE_SIZE = int(os.environ.get('PROFILE_CACHE_SIZE', '10000'))
+_profile_cache = TTLCache('auth_profiles', maxsize=PROFILE_CACHE_SIZE, ttl=PROFILE_CACHE_TTL)
+
+# Cache for verified token claims, keyed by SHA-256 of the token.
+# Accepted tokens expire at their `exp` (capped at TOKEN_CACHE_MAX_TTL);
+# rejected tokens are remembered for TOKEN_NEGATIVE_TTL seconds.
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', '10000'))
+TOKEN_CACHE_MAX_TTL = float(os.environ.get('TOKEN_CACHE_MAX_TTL', '300'))
+TOKEN_NEGATIVE_TTL = float(os.environ.get('TOKEN_NEGATIVE_TTL', '10'))
+_token_cache = TTLCache('auth_tokens', maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_MAX_TTL)
 
 def get_supabase_for_auth():
     """Get Supabase client for auth checks"""
     from supabase_client import get_supabase_client
     return get_supabase_client()
 
+def invalidate_profile(user_id: str):
+    """Drop a cached role/approval lookup after the profile changes"""
+    _profile_cache.invalidate(user_id)
+
+async def _fetch_jwks() -> dict:
+    async with httpx.AsyncClient(timeout=JWKS_FETCH_TIMEOUT) as client:
+        response = await client.get(SUPABASE_JWKS_URL)
+        response.raise_for_status()
+        return response.json()
+
+async def _refresh_jwks() -> dict:
+    """Fetch the JWKS and re-index its public keys by kid"""
+    global _jwks_cache, _jwks_keys, _jwks_fetched_at
+    # Stamp before fetching so failed fetches are rate limited too
+    _jwks_fetched_at = time.monotonic()
+    try:
+        jwks = await _fetch_jwks()
+    except Exception as e:
+        print(f"Error fetching JWKS: {e}")
+        return _jwks_keys
+    
+    keys = {}
+    for jwk in jwks.get('keys', []):
+        try:
+            keys[jwk.get('kid')] = jwt.PyJWK(jwk)
+        except jwt.PyJWKError as e:
+            print(f"Skipping unusable JWK {jwk.get('kid')}: {e}")
+    
+    _jwks_cache = jwks
+    _jwks_keys = keys
+    return keys
+
+def refresh_jwks() -> asyncio.Future:
+    """Start a JWKS refresh, or join the one already in flight"""
+    global _jwks_refresh
+    if _jwks_refresh is None or _jwks_refresh.done():
+        _jwks_refresh = asyncio.ensure_future(_refresh_jwks())
+    return _jwks_refresh
+
 async def get_jwks():
     """Fetch JWKS from Supabase"""
-    global _jwks_cache
-    if _jwks_cache:
-        return _jwks_cache
+    if _jwks_cache is None:
+        await asyncio.shield(refresh_jwks())
+    return _jwks_cache
+
+async def get_signing_key(kid: Optional[str]) -> jwt.PyJWK:
+    """Return the public key for `kid`, refreshing the JWKS when needed"""
+    key = _jwks_keys.get(kid)
+    age = None if _jwks_fetched_at is None else time.monotonic() - _jwks_fetched_at
+    
+    if key is not None:
+        if age > JWKS_TTL:
+            refresh_jwks()
+        return key
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{SUPABASE_URL}/auth/v1/.well-known/jwks.json")
-        _jwks_cache = response.json()
-        return _jwks_cache
+    # Unknown kid: the keys may have rotated. Join an in-flight refresh, or
+    # start one if the last fetch is old enough.
+    if _jwks_refresh is not None and not _jwks_refresh.done():
+        keys = await asyncio.shield(_jwks_refresh)
+    elif age is None or age >= JWKS_MIN_REFRESH_INTERVAL:
+        keys = await asyncio.shield(refresh_jwks())
+    else:
+        keys = _jwks_keys
+    
+    key = keys.get(kid)
+    if key is None:
+        raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+    return key
 
-async def verify_supabase_token(credentials: HTTPAuthorizationCredentials = Security(security)) -> dict:
+async def decode_token(token: str) -> dict:
     """
-    Verify Supabase JWT token
-    Returns user data from token and database profile
+    Verify a JWT and return its claims.
+    Claims of tokens already verified in this process are reused until the
+    token expires; rejected tokens fail fast from a short negative cache.
     """
-    token = credentials.credentials
+    started = time.perf_counter()
+    result = 'rejected'
+    try:
+        payload, result = await _decode_token(token)
+        return payload
+    finally:
+        auth_verify_duration.observe(time.perf_counter() - started, result)
+
+async def _decode_token(token: str) -> tuple:
+    """Return (claims, 'cached', 'verified' or 'unverified'), or raise if the token is rejected"""
+    token_key = hashlib.sha256(token.encode()).digest()
+    cached = _token_cache.get(token_key)
+    if isinstance(cached, str):
+        raise HTTPException(status_code=401, detail=cached)
+    if cached is not None:
+        return cached, 'cached'
     
     try:
-        # Decode and verify JWT
-        # Note: For production, verify with JWKS
-        if SUPABASE_JWT_SECRET:
+        # The server's configuration decides which keys and algorithms are
+        # accepted; the header only picks among them and names the key
+        header = jwt.get_unverified_header(token)
+        alg = header.get('alg')
+        if AUTH_INSECURE_SKIP_VERIFY:
+            # Not cached, and not counted as verified
+            return jwt.decode(token, options={"verify_signature": False}), 'unverified'
+        elif SUPABASE_JWKS_URL and alg in ASYMMETRIC_ALGORITHMS:
+            # Production: verify against the project's published signing keys,
+            # with the algorithm the key was published for
+            signing_key = await get_signing_key(header.get('kid'))
+            payload = jwt.decode(
+                token,
+                signing_key.key,
+                algorithms=[signing_key.algorithm_name],
+                audience="authenticated"
+            )
+        elif SUPABASE_JWT_SECRET and alg == "HS256":
             payload = jwt.decode(
                 token,
                 SUPABASE_JWT_SECRET,
@@ -48,8 +176,35 @@ async def verify_supabase_token(credentials: HTTPAuthorizationCredentials = Secu
                 audience="authenticated"
             )
         else:
-            # For development/testing - decode without verification
-            payload = jwt.decode(token, options={"verify_signature": False})
+            raise jwt.InvalidAlgorithmError(f"Unsupported signing algorithm: {alg}")
+    except jwt.ExpiredSignatureError:
+        _token_cache.set(token_key, "Token has expired", ttl=TOKEN_NEGATIVE_TTL)
+        raise
+    except jwt.InvalidTokenError as e:
+        _token_cache.set(token_key, f"Invalid token: {str(e)}", ttl=TOKEN_NEGATIVE_TTL)
+        raise
+    
+    # Only cache tokens that carry an expiry, and never past it
+    exp = payload.get('exp')
+    if isinstance(exp, (int, float)):
+        ttl = min(TOKEN_CACHE_MAX_TTL, exp - time.time())
+        if ttl > 0:
+            _token_cache.set(token_key, payload, ttl=ttl)
+    
+    return payload, 'verified'
+
+async def verify_supabase_token(credentials: HTTPAuthorizationCredentials = Security(security)) -> dict:
+    """
+    Verify Supabase JWT token
+    Returns user data from token and database profile
+    """
+    with span("auth.verify"):
+        return await _verify_token(credentials.credentials)
+
+async def _verify_token(token: str) -> dict:
+    try:
+        # Decode and verify JWT
+        payload = await decode_token(token)
         
         user_id = payload.get('sub')
         email = payload.get('email')
@@ -59,13 +214,18 @@ async def verify_supabase_token(credentials: HTTPAuthorizationCredentials = Secu
         
         # Fetch the actual role from the profiles table
         try:
-            supabase = get_supabase_for_auth()
-            profile = supabase.table('profiles').select('role, is_approved, is_active').eq('id', user_id).single().execute()
+            profile_data = _profile_cache.get(user_id)
+            if profile_data is None:
+                supabase = get_supabase_for_auth()
+                profile = await run_query(supabase.table('profiles').select('role, is_approved, is_active').eq('id', user_id).single())
+                profile_data = profile.data
+                if profile_data:
+                    _profile_cache.set(user_id, profile_data)
             
-            if profile.data:
-                role = profile.data.get('role', 'user')
-                is_approved = profile.data.get('is_approved', False)
-                is_active = profile.data.get('is_active', True)
+            if profile_data:
+                role = profile_data.get('role', 'user')
+                is_approved = profile_data.get('is_approved', False)
+                is_active = profile_data.get('is_active', True)
             else:
                 role = payload.get('user_metadata', {}).get('role', 'user')
                 is_approved = True
@@ -84,6 +244,8 @@ async def verify_supabase_token(credentials: HTTPAuthorizationCredentials = Secu
             "is_active": is_active
         }
     
+    except HTTPException:
+        raise
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
     except jwt.InvalidTokenError as e:
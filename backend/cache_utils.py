@@ -0,0 +1,243 @@
+import time
+import asyncio
+import functools
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from fast_json import dumps
+
+# All caches created in this process, by name, so their counters can be scraped
+_caches = {}
+
+class TTLCache:
+    """
+    Bounded in-process cache with per-entry expiry and LRU eviction.
+    Entries live at most `ttl` seconds (or until their own `expires_at`)
+    and the least recently used entry is dropped once `maxsize` is reached.
+    Caches are per worker process; the TTL bounds how stale another worker can be.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        _caches[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+class ResponseCache:
+    """
+    Cache of route responses with stale-while-revalidate and a memory budget.
+    A fresh entry is served as-is; a stale one (older than its ttl but within
+    its stale_ttl) is served immediately while one background task reloads
+    it. Least recently used entries are evicted once the estimated size of
+    all cached responses exceeds `max_bytes`.
+    """
+
+    def __init__(self, name: str, max_bytes: int):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.total_bytes = 0
+        self._data = OrderedDict()  # (route, key) -> (value, size, fresh_until, stale_until)
+        self._generations = {}  # route -> bumped on invalidation
+        self._refreshing = set()
+        _caches[name] = self
+
+    async def get_or_load(self, route: str, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float, stale_ttl: float) -> Any:
+        cache_key = (route, key)
+        entry = self._data.get(cache_key)
+        now = time.monotonic()
+        if entry is not None:
+            value, _, fresh_until, stale_until = entry
+            if now < fresh_until:
+                self._data.move_to_end(cache_key)
+                self.hits += 1
+                return value
+            if now < stale_until:
+                self._data.move_to_end(cache_key)
+                self.stale_hits += 1
+                if cache_key not in self._refreshing:
+                    self._refreshing.add(cache_key)
+                    asyncio.ensure_future(self._refresh(route, cache_key, loader, ttl, stale_ttl))
+                return value
+        
+        self.misses += 1
+        generation = self.generation(route)
+        value = await loader()
+        self._store(route, cache_key, value, ttl, stale_ttl, generation)
+        return value
+
+    async def _refresh(self, route, cache_key, loader, ttl, stale_ttl):
+        generation = self.generation(route)
+        try:
+            value = await loader()
+            self._store(route, cache_key, value, ttl, stale_ttl, generation)
+        except Exception as e:
+            print(f"Error refreshing cached response for {route}: {e}")
+        finally:
+            self._refreshing.discard(cache_key)
+
+    def _store(self, route, cache_key, value, ttl, stale_ttl, generation):
+        # A load that started before an invalidation must not bring old data back
+        if self.generation(route) != generation:
+            return
+        size = len(dumps(value))
+        # Replace the old entry even when the new value is too big to keep;
+        # otherwise it would be served stale and reloaded on every hit
+        self._drop(cache_key)
+        if size > self.max_bytes:
+            return
+        now = time.monotonic()
+        self._data[cache_key] = (value, size, now + ttl, now + ttl + stale_ttl)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            oldest = next(iter(self._data))
+            self._drop(oldest)
+
+    def _drop(self, cache_key):
+        entry = self._data.pop(cache_key, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+
+    def generation(self, route: str) -> int:
+        """Bumped each time `route` is invalidated"""
+        return self._generations.get(route, 0)
+
+    def invalidate(self, *routes: str):
+        """Drop every cached response for the given routes"""
+        for route in routes:
+            self._generations[route] = self._generations.get(route, 0) + 1
+            for cache_key in [k for k in self._data if k[0] == route]:
+                self._drop(cache_key)
+
+    def clear(self):
+        self._data.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "size": len(self._data),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+class SingleFlight:
+    """
+    Shares one in-flight call among concurrent callers asking for the same key.
+    The call runs as its own task, so a caller disconnecting does not cancel
+    it for the others; its result or exception is fanned out to every caller.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self._inflight = {}
+        _caches[name] = self
+
+    async def do(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(loader())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        self._inflight.pop(key, None)
+        # Mark the exception retrieved even if every caller went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        requests = self.calls + self.coalesced
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / requests, 4) if requests else 0.0,
+            "in_flight": len(self._inflight),
+        }
+
+def single_flight(flight: SingleFlight, route: str, generation: Optional[Callable[[], Hashable]] = None):
+    """
+    Decorator that coalesces concurrent calls of a route handler with the
+    same parameters. Place it below the @app.get decorator. `generation`,
+    when given, is part of the key, so calls made after an invalidation
+    start a new load instead of joining one that began before it.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(**kwargs):
+            key = (route, tuple(sorted(kwargs.items())), generation() if generation else None)
+            return await flight.do(key, lambda: handler(**kwargs))
+        return wrapper
+    return decorator
+
+def cached_response(cache: ResponseCache, route: str, ttl: float, stale_ttl: float):
+    """
+    Decorator for route handlers whose response depends only on their
+    parameters. Place it below the @app.get decorator.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(**kwargs):
+            key = tuple(sorted(kwargs.items()))
+            return await cache.get_or_load(route, key, lambda: handler(**kwargs), ttl, stale_ttl)
+        return wrapper
+    return decorator
+
+def cache_stats() -> dict:
+    """Hit/miss counters for every cache in this process"""
+    return {name: cache.stats() for name, cache in _caches.items()}
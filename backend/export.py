@@ -0,0 +1,79 @@
+import os
+import io
+import csv
+import asyncio
+from typing import AsyncIterator, Callable, Optional
+from fastapi.responses import StreamingResponse
+
+from supabase_client import run_query
+from pagination import paginate, split_page
+from fast_json import dumps
+
+# Rows fetched per round trip while exporting. At most two batches (the one
+# being written and the one being fetched) are held in memory at a time.
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '1000'))
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+async def iter_rows(build_query: Callable, column: str = 'created_at', desc: bool = True,
+                    batch_size: Optional[int] = None) -> AsyncIterator[dict]:
+    """
+    Yield every row of a select query, one keyset page at a time.
+    `build_query` returns a fresh select builder for each page (builders
+    are mutated by filters). The next page is requested while the current
+    one is being consumed.
+    """
+    size = batch_size or EXPORT_BATCH_SIZE
+
+    def fetch(cursor):
+        return asyncio.ensure_future(run_query(paginate(build_query(), cursor, size, column=column, desc=desc)))
+
+    pending = fetch(None)
+    try:
+        while pending is not None:
+            result = await pending
+            rows, cursor = split_page(result.data or [], size, column=column)
+            pending = fetch(cursor) if cursor else None
+            for row in rows:
+                yield row
+    finally:
+        # The client went away mid-export
+        if pending is not None:
+            pending.cancel()
+
+async def ndjson_lines(rows: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    """One JSON object per line"""
+    async for row in rows:
+        yield dumps(row) + b'\n'
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode()
+    return value
+
+async def csv_lines(rows: AsyncIterator[dict]) -> AsyncIterator[str]:
+    """CSV with a header taken from the first row; nested values are written as JSON"""
+    buffer = io.StringIO()
+    writer = None
+    async for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(row.keys()), extrasaction='ignore')
+            writer.writeheader()
+        writer.writerow({key: _csv_value(value) for key, value in row.items()})
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+def export_response(rows: AsyncIterator[dict], export_format: str, filename: str) -> StreamingResponse:
+    """Stream rows as an NDJSON or CSV download"""
+    body = csv_lines(rows) if export_format == 'csv' else ndjson_lines(rows)
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
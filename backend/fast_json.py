@@ -0,0 +1,42 @@
+import functools
+from decimal import Decimal
+
+import orjson
+from pydantic import BaseModel
+from starlette.responses import JSONResponse, Response
+
+def _default(value):
+    """Types orjson does not encode natively"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode='json')
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+def dumps(value) -> bytes:
+    """Encode Supabase rows (dicts, lists, strings, numbers, datetimes) as UTF-8 JSON"""
+    return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded by orjson, several times faster than the stdlib on row lists"""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+def fast_json(handler):
+    """
+    Return a route handler's result as a FastJSONResponse. FastAPI passes a
+    returned Response through untouched, so the rows skip jsonable_encoder's
+    walk over every value. Place it directly below the @app.get decorator.
+    The wrapper keeps the handler's signature; direct callers get the
+    response and read the JSON from its body.
+    """
+    @functools.wraps(handler)
+    async def wrapper(*args, **kwargs):
+        result = await handler(*args, **kwargs)
+        if isinstance(result, Response):
+            return result
+        return FastJSONResponse(result)
+    return wrapper
@@ -0,0 +1,65 @@
+import os
+import re
+import csv
+import math
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# Offline gazetteer of Indian cities and towns: name, state, lat, lon and
+# pipe-separated aliases (old or alternate spellings). Locations are
+# free text ("Andheri, Mumbai", "Navi Mumbai", "bangalore"), resolved to
+# the first place named in them.
+GAZETTEER_PATH = os.environ.get(
+    'GAZETTEER_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'gazetteer_in.csv')
+)
+
+EARTH_RADIUS_KM = 6371.0
+
+_NON_LETTERS = re.compile(r'[^a-z,]+')
+
+def _normalize(text: str) -> str:
+    return ' '.join(_NON_LETTERS.sub(' ', text.lower()).split())
+
+@lru_cache(maxsize=1)
+def _places() -> dict:
+    """normalized name or alias -> (lat, lon)"""
+    places = {}
+    with open(GAZETTEER_PATH, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            point = (float(row['lat']), float(row['lon']))
+            for name in [row['name']] + [alias for alias in (row.get('aliases') or '').split('|') if alias]:
+                places.setdefault(_normalize(name), point)
+    return places
+
+@lru_cache(maxsize=20000)
+def geocode(location: Optional[str]) -> Optional[Tuple[float, float]]:
+    """
+    (lat, lon) of the place named in a free-text location, or None.
+    A comma-separated part that is exactly a place wins, earliest first
+    ("Thane, Mumbai" is Thane). Otherwise the longest run of words naming a
+    place, rightmost first, since addresses end with the city
+    ("Anand Vihar East Delhi" is Delhi, "Navi Mumbai West" is Navi Mumbai).
+    """
+    if not location:
+        return None
+    places = _places()
+    parts = [part.strip() for part in _normalize(location).split(',') if part.strip()]
+    for part in parts:
+        if part in places:
+            return places[part]
+    for part in reversed(parts):
+        words = part.split()
+        for length in range(min(len(words), 4), 0, -1):
+            for start in range(len(words) - length, -1, -1):
+                point = places.get(' '.join(words[start:start + length]))
+                if point is not None:
+                    return point
+    return None
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
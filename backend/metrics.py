@@ -0,0 +1,182 @@
+import time
+from bisect import bisect_left
+from typing import Tuple
+
+from cache_utils import cache_stats
+
+# Every metric created in this process, rendered in this order by render_metrics()
+_metrics = []
+
+# Latency buckets in seconds, from cache hits to slow upstream calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names, values, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}  # label values -> state
+        _metrics.append(self)
+
+    def render(self) -> list:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}']
+        for labels, state in sorted(self._values.items()):
+            lines.extend(self._render_series(labels, state))
+        return lines
+
+    def _render_series(self, labels, state) -> list:
+        return [f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(state)}']
+
+class Counter(_Metric):
+    """Monotonic count, labelled by `labelnames`"""
+    kind = 'counter'
+
+    def inc(self, *labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+class Gauge(_Metric):
+    """Value that goes up and down, labelled by `labelnames`"""
+    kind = 'gauge'
+
+    def inc(self, *labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values in fixed cumulative buckets.
+    An observation is one bisect and two additions, cheap enough for every request.
+    """
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels):
+        state = self._values.get(labels)
+        if state is None:
+            # Per-bucket counts (last one is +Inf), then sum
+            state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+
+    def _render_series(self, labels, state) -> list:
+        counts, total = state
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}')
+        label_text = _format_labels(self.labelnames, labels)
+        lines.append(f'{self.name}_sum{label_text} {_format_value(total)}')
+        lines.append(f'{self.name}_count{label_text} {cumulative}')
+        return lines
+
+# Metrics are updated from the event loop only, so they need no locking.
+
+http_requests_in_flight = Gauge('http_requests_in_flight', 'HTTP requests currently being served')
+http_requests_total = Counter('http_requests_total', 'HTTP requests served', ('method', 'route', 'status'))
+http_request_duration = Histogram(
+    'http_request_duration_seconds', 'Time to serve an HTTP request, by route template', ('method', 'route')
+)
+
+supabase_calls_in_flight = Gauge('supabase_calls_in_flight', 'Supabase calls currently queued or running')
+supabase_call_duration = Histogram(
+    'supabase_call_duration_seconds', 'Time for one Supabase round trip, including the wait for a pool thread',
+    ('table', 'operation')
+)
+supabase_call_errors = Counter('supabase_call_errors_total', 'Supabase calls that raised', ('table', 'operation'))
+
+auth_verify_duration = Histogram(
+    'auth_token_verify_seconds', 'Time to verify a JWT, by outcome (cached, verified, unverified, rejected)', ('result',)
+)
+
+OPERATIONS = {'GET': 'select', 'HEAD': 'select', 'POST': 'insert', 'PATCH': 'update', 'DELETE': 'delete'}
+
+def describe_query(query) -> Tuple[str, str]:
+    """(table, operation) labels for a built Supabase query"""
+    path = getattr(query, 'path', '') or ''
+    if path.startswith('/rpc/'):
+        return path[len('/rpc/'):], 'rpc'
+    return path.lstrip('/') or 'unknown', OPERATIONS.get(getattr(query, 'http_method', ''), 'unknown')
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency and status per route template.
+    Requests that match no route share the "unmatched" label, so scanning
+    random paths cannot grow the number of series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+            # The router stores the matched route in the (shared) scope
+            route = getattr(scope.get('route'), 'path', None) or 'unmatched'
+            http_request_duration.observe(elapsed, scope['method'], route)
+            http_requests_total.inc(scope['method'], route, str(status))
+
+# Cache counters that only ever grow; everything else is exported as a gauge
+_CACHE_COUNTERS = {'hits', 'misses', 'stale_hits', 'calls', 'coalesced'}
+
+def _render_cache_stats() -> list:
+    series = {}
+    for cache, stats in cache_stats().items():
+        for key, value in stats.items():
+            if isinstance(value, (int, float)):
+                name = f'cache_{key}_total' if key in _CACHE_COUNTERS else f'cache_{key}'
+                series.setdefault(name, []).append((cache, value))
+    lines = []
+    for name, values in series.items():
+        kind = 'counter' if name.endswith('_total') else 'gauge'
+        lines.append(f'# TYPE {name} {kind}')
+        for cache, value in values:
+            lines.append(f'{name}{{cache="{_escape(cache)}"}} {_format_value(value)}')
+    return lines
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    lines.extend(_render_cache_stats())
+    return '\n'.join(lines) + '\n'
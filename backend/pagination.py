@@ -0,0 +1,68 @@
+import os
+import json
+import uuid
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi import HTTPException
+
+# Keyset pagination on (sort column, id), newest first by default. Each page
+# filters past the last row of the previous one instead of using OFFSET, so
+# deep pages cost the same as the first. NULLs in the sort column are ordered
+# as Postgres does by default (after every value: first when descending,
+# last when ascending), which the (column DESC, id DESC) indexes also follow.
+PAGE_SIZE = int(os.environ.get('PAGE_SIZE', '24'))
+MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', '100'))
+
+def page_size(limit: Optional[int]) -> int:
+    """Clamp a requested page size to 1..MAX_PAGE_SIZE"""
+    if not limit:
+        return PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+def encode_cursor(row: dict, column: str = 'created_at') -> str:
+    """Opaque cursor pointing just past `row` in an ordering by `column`"""
+    raw = json.dumps([column, row[column], row['id']]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor: str, column: str = 'created_at') -> Tuple[object, str]:
+    """Return (column value or None, id) from a cursor, rejecting anything malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_column, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        # Validate every part so the values are safe to embed in a filter
+        if cursor_column != column:
+            raise ValueError("cursor belongs to another ordering")
+        if isinstance(value, str):
+            datetime.fromisoformat(value)
+        elif value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValueError("unsupported cursor value")
+        uuid.UUID(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value, row_id
+
+def paginate(query, cursor: Optional[str], size: int, column: str = 'created_at', desc: bool = True):
+    """Apply the keyset filter, ordering and limit for one page to a select query"""
+    if cursor:
+        value, row_id = decode_cursor(cursor, column)
+        op = 'lt' if desc else 'gt'
+        if value is None:
+            # Within the NULLs: the rest of them, then (descending) every value
+            filters = f'and({column}.is.null,id.{op}.{row_id})'
+            if desc:
+                filters = f'{column}.not.is.null,' + filters
+        else:
+            filters = f'{column}.{op}."{value}",and({column}.eq."{value}",id.{op}.{row_id})'
+            if not desc:
+                filters += f',{column}.is.null'
+        query = query.or_(filters)
+    # One extra row tells us whether another page exists
+    return query.order(column, desc=desc).order('id', desc=desc).limit(size + 1)
+
+def split_page(rows: list, size: int, column: str = 'created_at') -> Tuple[list, Optional[str]]:
+    """Trim the look-ahead row and return (page rows, next cursor or None)"""
+    if len(rows) > size:
+        rows = rows[:size]
+        return rows, encode_cursor(rows[-1], column)
+    return rows, None
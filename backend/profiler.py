@@ -0,0 +1,108 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+import tracemalloc
+from collections import Counter
+
+# Nothing here runs until a profile is requested; one profile at a time per worker
+_profile_lock = threading.Lock()
+
+# Leaf frames of threads that are parked, not working (pool workers waiting
+# for a job, the event loop waiting for I/O). Dropped unless include_idle.
+IDLE_LEAVES = {
+    ('wait', 'threading.py'),
+    ('get', 'queue.py'),
+    ('_worker', 'thread.py'),
+    ('select', 'selectors.py'),
+}
+
+class ProfilerBusy(Exception):
+    """Another profile is already running in this worker"""
+
+def _frame_label(code) -> str:
+    path = code.co_filename
+    short = os.path.join(os.path.basename(os.path.dirname(path)), os.path.basename(path))
+    return f'{code.co_name} ({short}:{code.co_firstlineno})'
+
+def _sample_stacks(seconds: float, interval: float, include_idle: bool) -> Counter:
+    """Sample every thread's stack until `seconds` pass; runs on its own thread"""
+    me = threading.get_ident()
+    stacks = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            leaf = frame.f_code
+            if not include_idle and (leaf.co_name, os.path.basename(leaf.co_filename)) in IDLE_LEAVES:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            labels.append(names.get(ident, f'thread-{ident}'))
+            stacks[';'.join(reversed(labels))] += 1
+        time.sleep(interval)
+    return stacks
+
+async def cpu_profile(seconds: float, interval: float = 0.01, include_idle: bool = False) -> str:
+    """
+    Sample the stacks of every thread in this worker for `seconds`.
+    Returns collapsed stacks ("thread;outer;...;leaf count" per line), the
+    input format of flamegraph.pl, speedscope and similar viewers.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy()
+    try:
+        loop = asyncio.get_running_loop()
+        stacks = await loop.run_in_executor(None, _sample_stacks, seconds, interval, include_idle)
+    finally:
+        _profile_lock.release()
+    return ''.join(f'{stack} {count}\n' for stack, count in stacks.most_common())
+
+async def memory_profile(seconds: float, limit: int = 30, frames: int = 1) -> dict:
+    """
+    Trace allocations for `seconds` and return the source lines whose
+    live allocations grew the most in that window. tracemalloc is stopped
+    again afterwards unless it was already running.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy()
+    started_here = not tracemalloc.is_tracing()
+    try:
+        if started_here:
+            tracemalloc.start(frames)
+        before = tracemalloc.take_snapshot()
+        await asyncio.sleep(seconds)
+        after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        if started_here:
+            tracemalloc.stop()
+        _profile_lock.release()
+
+    ignore = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    ]
+    group_by = 'traceback' if frames > 1 else 'lineno'
+    diff = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), group_by)
+    top = []
+    for stat in diff[:limit]:
+        top.append({
+            "traceback": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+            "size_diff_kb": round(stat.size_diff / 1024, 1),
+            "size_kb": round(stat.size / 1024, 1),
+            "count_diff": stat.count_diff,
+            "count": stat.count,
+        })
+    return {
+        "seconds": seconds,
+        "traced_current_kb": round(current / 1024, 1),
+        "traced_peak_kb": round(peak / 1024, 1),
+        "top": top,
+    }
@@ -0,0 +1,116 @@
+import os
+import asyncio
+from datetime import date
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from cache_utils import TTLCache, SingleFlight
+from supabase_client import run_query
+
+REVENUE_COLUMNS = ('fees', 'additional_artwork_fee', 'voluntary_platform_fee')
+REVENUE_PERIODS = ('day', 'week', 'month')
+
+# Buckets start at local midnight in this timezone; weeks start on Monday
+REVENUE_REPORT_TIMEZONE = os.environ.get('REVENUE_REPORT_TIMEZONE', 'Asia/Kolkata')
+# Reports are rebuilt at most this often (exhibition writes clear the cache sooner)
+REVENUE_REPORT_CACHE_TTL = float(os.environ.get('REVENUE_REPORT_CACHE_TTL', '300'))
+
+revenue_report_cache = TTLCache('revenue_reports', maxsize=64, ttl=REVENUE_REPORT_CACHE_TTL)
+_report_flight = SingleFlight('revenue_report_single_flight')
+_report_generation = 0  # bumped by invalidate_revenue_reports
+
+def invalidate_revenue_reports():
+    """Drop cached reports after an exhibition write; loads already running are neither cached nor joined"""
+    global _report_generation
+    _report_generation += 1
+    revenue_report_cache.clear()
+
+def _bucket_starts(epoch_seconds: np.ndarray, period: str) -> np.ndarray:
+    """Local start date of the day/week/month each timestamp falls in"""
+    local = (
+        pd.DatetimeIndex(epoch_seconds.astype('datetime64[s]'))
+        .tz_localize('UTC')
+        .tz_convert(REVENUE_REPORT_TIMEZONE)
+        .tz_localize(None)
+        .to_numpy()
+    )
+    days = local.astype('datetime64[D]')
+    if period == 'day':
+        return days
+    if period == 'week':
+        # 1970-01-01 was a Thursday: shift to the preceding Monday
+        return days - (days.astype(np.int64) + 3) % 7
+    return days.astype('datetime64[M]').astype('datetime64[D]')
+
+def _totals(sums: dict, index) -> dict:
+    totals = {column: round(float(sums[column][index]), 2) for column in REVENUE_COLUMNS}
+    totals['exhibitions'] = int(sums['exhibitions'][index])
+    return totals
+
+def build_revenue_report(columns: dict, period: str) -> dict:
+    """
+    Sum the fee columns per period bucket and exhibition type.
+    `columns` holds parallel arrays as returned by exhibition_revenue_columns.
+    Each (bucket, type) pair becomes one integer group, and every column is
+    summed with a single weighted bincount.
+    """
+    starts = _bucket_starts(np.asarray(columns.get('created_at') or [], dtype=np.float64), period)
+    buckets, bucket_index = np.unique(starts, return_inverse=True)
+    type_index, types = pd.factorize(np.asarray(columns.get('exhibition_type') or [], dtype=object), sort=True)
+    group = bucket_index * len(types) + type_index
+    size = len(buckets) * len(types)
+
+    by_type = {'exhibitions': np.bincount(group, minlength=size).reshape(len(buckets), len(types))}
+    for column in REVENUE_COLUMNS:
+        values = np.asarray(columns.get(column) or [], dtype=np.float64)
+        by_type[column] = np.bincount(group, weights=values, minlength=size).reshape(len(buckets), len(types))
+    by_bucket = {column: sums.sum(axis=1) for column, sums in by_type.items()}
+    overall = {column: sums.sum(axis=0, keepdims=True) for column, sums in by_bucket.items()}
+
+    report_buckets = []
+    for i, start in enumerate(buckets):
+        report_buckets.append({
+            "start": str(start),
+            "totals": _totals(by_bucket, i),
+            "by_type": {
+                str(exhibition_type): _totals(by_type, (i, j))
+                for j, exhibition_type in enumerate(types)
+                if by_type['exhibitions'][i, j]
+            },
+        })
+    return {
+        "period": period,
+        "timezone": REVENUE_REPORT_TIMEZONE,
+        "totals": _totals(overall, 0),
+        "buckets": report_buckets,
+    }
+
+def _local_midnight(day: Optional[date]) -> Optional[str]:
+    if day is None:
+        return None
+    return pd.Timestamp(day).tz_localize(REVENUE_REPORT_TIMEZONE).isoformat()
+
+async def revenue_report(supabase, period: str, since: Optional[date] = None, until: Optional[date] = None) -> dict:
+    """Cached revenue report for exhibitions created in [since, until)"""
+    key = (period, since, until)
+    report = revenue_report_cache.get(key)
+    if report is not None:
+        return report
+    generation = _report_generation
+
+    async def load():
+        result = await run_query(supabase.rpc('exhibition_revenue_columns', {
+            'p_since': _local_midnight(since),
+            'p_until': _local_midnight(until),
+        }))
+        # Bucketing 100k+ rows takes tens of milliseconds; keep it off the event loop
+        loop = asyncio.get_running_loop()
+        report = await loop.run_in_executor(None, build_revenue_report, result.data or {}, period)
+        # A load that started before an invalidation must not bring old data back
+        if generation == _report_generation:
+            revenue_report_cache.set(key, report)
+        return report
+
+    return await _report_flight.do((key, generation), load)
@@ -1,12 +1,14 @@
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone
 import os
 import time
+import secrets
 import boto3
 from dotenv import load_dotenv
 import uuid
@@ -39,9 +41,24 @@ from auth_utils import (
     require_admin,
     require_lead_chitrakar,
     require_kalakar,
-    get_current_user
+    get_current_user,
+    invalidate_profile
 )
-from supabase_client import get_supabase_client
+from supabase_client import get_supabase_client, run_query, gather_queries, shutdown_query_pool
+from cache_utils import TTLCache, ResponseCache, SingleFlight, cached_response, single_flight, cache_stats
+from view_counter import record_view, start_view_flusher, stop_view_flusher
+from geo import geocode
+from teacher_index import (
+    start_teacher_index, stop_teacher_index, teacher_index_ready, match_teachers, match_nearby_teachers,
+    upsert_teacher, remove_teacher
+)
+from pagination import page_size, paginate, split_page
+from metrics import MetricsMiddleware, render_metrics
+from tracing import TracingMiddleware, span, slow_traces, TRACE_SLOW_THRESHOLD_MS
+from profiler import cpu_profile, memory_profile, ProfilerBusy
+from fast_json import fast_json
+from export import iter_rows, export_response, EXPORT_FORMATS
+from revenue_report import revenue_report, invalidate_revenue_reports, REVENUE_PERIODS
 
 app = FastAPI(title="ChitraKalakar API")
 security = HTTPBearer()
@@ -56,6 +73,83 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# One trace per request; slow ones are kept for /api/admin/traces
+app.add_middleware(TracingMiddleware)
+
+# Per-route latency and status for /api/metrics; outermost, so it times the whole stack
+app.add_middleware(MetricsMiddleware)
+
+# Bearer token required to scrape /api/metrics (open when unset)
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# Response cache for anonymous catalog reads. Entries are served fresh for
+# the route's TTL, then stale for up to RESPONSE_CACHE_STALE_TTL while they
+# reload in the background. Admin mutations invalidate the affected routes.
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+RESPONSE_CACHE_STALE_TTL = float(os.environ.get('RESPONSE_CACHE_STALE_TTL', '300'))
+response_cache = ResponseCache('public_responses', max_bytes=RESPONSE_CACHE_MAX_BYTES)
+
+PUBLIC_EXHIBITION_ROUTES = ("/api/public/exhibitions", "/api/public/exhibitions/active", "/api/public/exhibitions/archived")
+
+def public_cache(route: str, ttl: float):
+    """Cache a public route's response for `ttl` seconds"""
+    return cached_response(response_cache, route, ttl=ttl, stale_ttl=RESPONSE_CACHE_STALE_TTL)
+
+# Concurrent identical public reads share one upstream call
+public_flight = SingleFlight('public_single_flight')
+
+def coalesce(route: str):
+    """
+    Coalesce concurrent calls of a public route with the same parameters.
+    Calls made after the route's cache is invalidated don't join earlier loads.
+    """
+    return single_flight(public_flight, route, generation=lambda: response_cache.generation(route))
+
+# Short-lived memory of ids that public detail lookups did not find, keyed
+# by (kind, id). Cleared for an id when a matching row is created or approved.
+NOT_FOUND_CACHE_TTL = float(os.environ.get('NOT_FOUND_CACHE_TTL', '60'))
+NOT_FOUND_CACHE_SIZE = int(os.environ.get('NOT_FOUND_CACHE_SIZE', '50000'))
+not_found_cache = TTLCache('public_not_found', maxsize=NOT_FOUND_CACHE_SIZE, ttl=NOT_FOUND_CACHE_TTL)
+# Per-id count of those clears, so a lookup that started before one does not
+# cache its miss; kept for as long as a miss would be
+not_found_generations = TTLCache('public_not_found_generations', maxsize=NOT_FOUND_CACHE_SIZE, ttl=NOT_FOUND_CACHE_TTL)
+
+def check_public_id(kind: str, value: str, detail: str) -> int:
+    """
+    Reject malformed ids, and ids recently found missing, without a database
+    call. Returns the id's generation, to pass to remember_not_found.
+    """
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        raise HTTPException(status_code=404, detail=detail)
+    if not_found_cache.get((kind, value)):
+        raise HTTPException(status_code=404, detail=detail)
+    return not_found_generations.get((kind, value), 0)
+
+def remember_not_found(kind: str, value: str, detail: str, generation: int):
+    """Cache a missing id, unless it was cleared since the lookup began, and raise the 404"""
+    if not_found_generations.get((kind, value), 0) == generation:
+        not_found_cache.set((kind, value), True)
+    raise HTTPException(status_code=404, detail=detail)
+
+# Detail route of each kind; its generation keys the route's coalesced lookups
+NOT_FOUND_ROUTES = {
+    'artist': "/api/public/artist/{artist_id}",
+    'painting': "/api/public/painting/{painting_id}",
+    'featured_artist': "/api/public/featured-artist/{artist_id}",
+}
+
+def forget_not_found(kind: str, value: str):
+    """
+    Clear a cached miss once the row exists. Lookups already running won't
+    cache it again, and later requests won't join them.
+    """
+    key = (kind, value)
+    not_found_generations.set(key, not_found_generations.get(key, 0) + 1)
+    not_found_cache.invalidate(key)
+    response_cache.invalidate(NOT_FOUND_ROUTES[kind])
+
 # ============ MODELS ============
 
 class ProfileUpdateRequest(BaseModel):
@@ -129,41 +223,68 @@ class CreateSubAdminRequest(BaseModel):
     role: str
     location: Optional[str] = None
 
+@app.on_event("startup")
+async def startup_event():
+    start_view_flusher()
+    start_teacher_index()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await stop_view_flusher()
+    await stop_teacher_index()
+    shutdown_query_pool()
+
+async def get_platform_counters(supabase) -> dict:
+    """
+    Read the trigger-maintained platform counters (see
+    SUPABASE_PLATFORM_COUNTERS.sql) with one primary-key lookup
+    """
+    response = await run_query(supabase.table('platform_counters').select('*').eq('id', 1).limit(1))
+    return response.data[0] if response.data else {}
+
 # ============ HEALTH CHECK ============
 
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy", "database": "supabase"}
 
+@app.get("/api/metrics")
+async def get_metrics(request: Request):
+    """Prometheus metrics for this worker: route and Supabase call latencies, caches, auth"""
+    if METRICS_TOKEN and not secrets.compare_digest(request.headers.get('authorization', ''), f"Bearer {METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 # ============ PUBLIC ROUTES ============
 
 @app.get("/api/public/stats")
+@public_cache("/api/public/stats", ttl=60)
+@coalesce("/api/public/stats")
 async def get_public_stats():
     """Get platform statistics"""
     supabase = get_supabase_client()
-    
-    # Get counts
-    artists_response = supabase.table('profiles').select('id', count='exact').eq('role', 'artist').eq('is_approved', True).execute()
-    artworks_response = supabase.table('artworks').select('id', count='exact').eq('is_approved', True).execute()
-    exhibitions_response = supabase.table('exhibitions').select('id', count='exact').eq('is_approved', True).execute()
+    counters = await get_platform_counters(supabase)
     
     return {
-        "total_artists": artists_response.count or 0,
-        "total_artworks": artworks_response.count or 0,
-        "active_exhibitions": exhibitions_response.count or 0,
+        "total_artists": counters.get('approved_artists', 0),
+        "total_artworks": counters.get('approved_artworks', 0),
+        "active_exhibitions": counters.get('approved_exhibitions', 0),
         "satisfaction_rate": 98
     }
 
 @app.get("/api/public/featured-artists")
+@fast_json
+@public_cache("/api/public/featured-artists", ttl=60)
+@coalesce("/api/public/featured-artists")
 async def get_featured_artists():
     """Get featured artists (contemporary and registered)"""
     supabase = get_supabase_client()
     
-    # Get contemporary featured artists
-    contemporary = supabase.table('featured_artists').select('*').eq('type', 'contemporary').eq('is_featured', True).execute()
-    
-    # Get registered featured artists
-    registered = supabase.table('featured_artists').select('*').eq('type', 'registered').eq('is_featured', True).execute()
+    # Get contemporary and registered featured artists
+    contemporary, registered = await gather_queries(
+        supabase.table('featured_artists').select('*').eq('type', 'contemporary').eq('is_featured', True),
+        supabase.table('featured_artists').select('*').eq('type', 'registered').eq('is_featured', True),
+    )
     
     return {
         "contemporary": contemporary.data or [],
@@ -171,18 +292,24 @@ async def get_featured_artists():
     }
 
 @app.get("/api/public/artists")
-async def get_public_artists():
-    """Get all approved artists (without contact info for public view)"""
+@fast_json
+@public_cache("/api/public/artists", ttl=60)
+@coalesce("/api/public/artists")
+async def get_public_artists(cursor: Optional[str] = None, limit: Optional[int] = None):
+    """Get approved artists, one page at a time (without contact info for public view)"""
     supabase = get_supabase_client()
+    size = page_size(limit)
     
-    # Get all approved and active artists (including avatar)
-    artists = supabase.table('profiles').select(
+    # Get approved and active artists (including avatar)
+    query = supabase.table('profiles').select(
         'id, full_name, bio, categories, location, avatar, created_at'
-    ).eq('role', 'artist').eq('is_approved', True).eq('is_active', True).execute()
+    ).eq('role', 'artist').eq('is_approved', True).eq('is_active', True)
+    artists = await run_query(paginate(query, cursor, size))
+    rows, next_cursor = split_page(artists.data or [], size)
     
     # Transform full_name to name for frontend compatibility
     artist_list = []
-    for artist in (artists.data or []):
+    for artist in rows:
         artist_list.append({
             "id": artist.get("id"),
             "name": artist.get("full_name"),
@@ -193,186 +320,269 @@ async def get_public_artists():
             "created_at": artist.get("created_at")
         })
     
-    return {"artists": artist_list}
+    return {"artists": artist_list, "next_cursor": next_cursor}
 
 @app.get("/api/public/artist/{artist_id}")
+@fast_json
+@coalesce("/api/public/artist/{artist_id}")
 async def get_public_artist_detail(artist_id: str):
     """Get artist detail with artworks (without contact info)"""
+    generation = check_public_id('artist', artist_id, "Artist not found")
     supabase = get_supabase_client()
     
-    # Get artist without contact info
-    artist = supabase.table('profiles').select(
-        'id, full_name, bio, categories, location, created_at'
-    ).eq('id', artist_id).eq('role', 'artist').eq('is_approved', True).single().execute()
+    # Get artist without contact info, and their approved artworks
+    artist, artworks = await gather_queries(
+        supabase.table('profiles').select(
+            'id, full_name, bio, categories, location, created_at'
+        ).eq('id', artist_id).eq('role', 'artist').eq('is_approved', True).limit(1),
+        supabase.table('artworks').select('*').eq('artist_id', artist_id).eq('is_approved', True).order('created_at', desc=True),
+    )
     
     if not artist.data:
-        raise HTTPException(status_code=404, detail="Artist not found")
-    
-    # Get artist's approved artworks
-    artworks = supabase.table('artworks').select('*').eq('artist_id', artist_id).eq('is_approved', True).order('created_at', desc=True).execute()
+        remember_not_found('artist', artist_id, "Artist not found", generation)
     
     return {
-        "artist": artist.data,
+        "artist": artist.data[0],
         "artworks": artworks.data or []
     }
 
+# Marketplace sort options: (column, descending)
+PAINTING_SORTS = {
+    "newest": ("created_at", True),
+    "price_asc": ("price", False),
+    "price_desc": ("price", True),
+    "views": ("views", True),
+}
+
 @app.get("/api/public/paintings")
-async def get_public_paintings():
-    """Get all approved artworks for marketplace (without artist contact info)"""
+@fast_json
+@public_cache("/api/public/paintings", ttl=30)
+@coalesce("/api/public/paintings")
+async def get_public_paintings(
+    category: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    location: Optional[str] = None,
+    available: Optional[bool] = None,
+    sort: str = "newest",
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+):
+    """
+    Get approved artworks for marketplace, filtered and sorted server-side,
+    one page at a time (without artist contact info).
+    The first page also carries facet counts per category and price bucket.
+    """
+    if sort not in PAINTING_SORTS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort. Use one of: {', '.join(PAINTING_SORTS)}")
+    sort_column, sort_desc = PAINTING_SORTS[sort]
+    
     supabase = get_supabase_client()
+    size = page_size(limit)
     
-    # Get all approved artworks with artist name (but no contact info)
-    artworks = supabase.table('artworks').select(
+    # Get approved artworks with artist name (but no contact info)
+    query = supabase.table('artworks').select(
         '*, profiles.inner(id, full_name, avatar, location)'
-    ).eq('is_approved', True).order('created_at', desc=True).execute()
+    ).eq('is_approved', True)
+    if category:
+        query = query.eq('category', category)
+    if min_price is not None:
+        query = query.gte('price', min_price)
+    if max_price is not None:
+        query = query.lt('price', max_price)
+    if location:
+        query = query.ilike('profiles.location', f'%{location}%')
+    if available is not None:
+        query = query.eq('is_available', available)
+    
+    page_query = paginate(query, cursor, size, column=sort_column, desc=sort_desc)
+    if cursor:
+        artworks = await run_query(page_query)
+        facets = None
+    else:
+        artworks, facet_counts = await gather_queries(
+            page_query,
+            supabase.rpc('painting_facets', {
+                'p_category': category,
+                'p_min_price': min_price,
+                'p_max_price': max_price,
+                'p_location': location,
+                'p_available': available,
+            }),
+        )
+        facets = facet_counts.data or {"total": 0, "categories": {}, "price_buckets": {}}
     
-    return {"paintings": artworks.data or []}
+    paintings, next_cursor = split_page(artworks.data or [], size, column=sort_column)
+    
+    return {"paintings": paintings, "next_cursor": next_cursor, "facets": facets}
 
-@app.get("/api/public/painting/{painting_id}")
-async def get_painting_detail(painting_id: str):
-    """Get painting detail with artist info (without contact)"""
+async def _load_painting(painting_id: str, generation: int) -> dict:
     supabase = get_supabase_client()
     
-    painting = supabase.table('artworks').select(
+    painting = await run_query(supabase.table('artworks').select(
         '*, profiles.inner(id, full_name, avatar, location, bio, categories)'
-    ).eq('id', painting_id).eq('is_approved', True).single().execute()
+    ).eq('id', painting_id).eq('is_approved', True).limit(1))
     
     if not painting.data:
-        raise HTTPException(status_code=404, detail="Painting not found")
+        remember_not_found('painting', painting_id, "Painting not found", generation)
     
-    # Increment views
-    current_views = painting.data.get('views', 0)
-    supabase.table('artworks').update({'views': current_views + 1}).eq('id', painting_id).execute()
+    return painting.data[0]
+
+@app.get("/api/public/painting/{painting_id}")
+async def get_painting_detail(painting_id: str):
+    """Get painting detail with artist info (without contact)"""
+    generation = check_public_id('painting', painting_id, "Painting not found")
+    
+    # Concurrent requests share the lookup (not one begun before the painting
+    # was approved), but every one counts as a view
+    painting = await public_flight.do(
+        ("/api/public/painting/{painting_id}", painting_id, generation),
+        lambda: _load_painting(painting_id, generation),
+    )
     
-    return {"painting": painting.data}
+    # Count the view; it is written back in batches off the request path
+    record_view(painting_id)
+    
+    return {"painting": painting}
 
 @app.get("/api/public/featured-artist/{artist_id}")
+@coalesce("/api/public/featured-artist/{artist_id}")
 async def get_featured_artist_detail(artist_id: str):
     """Get detailed info about a featured artist"""
+    generation = check_public_id('featured_artist', artist_id, "Artist not found")
     supabase = get_supabase_client()
     
-    artist = supabase.table('featured_artists').select('*').eq('id', artist_id).single().execute()
+    artist = await run_query(supabase.table('featured_artists').select('*').eq('id', artist_id).limit(1))
     
     if not artist.data:
-        raise HTTPException(status_code=404, detail="Artist not found")
+        remember_not_found('featured_artist', artist_id, "Artist not found", generation)
     
-    return {"artist": artist.data}
+    return {"artist": artist.data[0]}
 
 @app.get("/api/public/exhibitions")
-async def get_public_exhibitions():
-    """Get all approved exhibitions"""
+@fast_json
+@public_cache("/api/public/exhibitions", ttl=60)
+@coalesce("/api/public/exhibitions")
+async def get_public_exhibitions(cursor: Optional[str] = None, limit: Optional[int] = None):
+    """Get approved exhibitions, one page at a time"""
     supabase = get_supabase_client()
+    size = page_size(limit)
     
-    exhibitions = supabase.table('exhibitions').select('*, users(name)').eq('is_approved', True).order('created_at', desc=True).execute()
+    query = supabase.table('exhibitions').select('*, users(name)').eq('is_approved', True)
+    exhibitions = await run_query(paginate(query, cursor, size))
+    rows, next_cursor = split_page(exhibitions.data or [], size)
     
-    return {"exhibitions": exhibitions.data or []}
+    return {"exhibitions": rows, "next_cursor": next_cursor}
 
 @app.get("/api/public/exhibitions/active")
+@fast_json
+@public_cache("/api/public/exhibitions/active", ttl=60)
+@coalesce("/api/public/exhibitions/active")
 async def get_active_exhibitions():
     """Get active exhibitions"""
     supabase = get_supabase_client()
     
-    exhibitions = supabase.table('exhibitions').select('*, users(name)').eq('is_approved', True).eq('status', 'active').execute()
+    exhibitions = await run_query(supabase.table('exhibitions').select('*, users(name)').eq('is_approved', True).eq('status', 'active'))
     
     return {"exhibitions": exhibitions.data or []}
 
 @app.get("/api/public/exhibitions/archived")
+@fast_json
+@public_cache("/api/public/exhibitions/archived", ttl=300)
+@coalesce("/api/public/exhibitions/archived")
 async def get_archived_exhibitions():
     """Get archived exhibitions"""
     supabase = get_supabase_client()
     
-    exhibitions = supabase.table('exhibitions').select('*, users(name)').eq('is_approved', True).eq('status', 'archived').execute()
+    exhibitions = await run_query(supabase.table('exhibitions').select('*, users(name)').eq('is_approved', True).eq('status', 'archived'))
     
     return {"exhibitions": exhibitions.data or []}
 
 # ============ ART CLASS ENQUIRY ROUTES ============
 
+# Teaching rate budgets per class type: online classes only offer the two lower ranges
+CLASS_BUDGET_RANGES = {
+    "online": {
+        "250-350": (250, 350),
+        "350-500": (350, 500),
+    },
+    "offline": {
+        "250-350": (250, 350),
+        "350-500": (350, 500),
+        "500-1000": (500, 1000),
+    },
+}
+
+async def query_matching_artists(supabase, art_type, mode, min_rate, max_rate, location) -> list:
+    """Match teachers with a database query, used until the in-memory teacher index has loaded"""
+    query = supabase.table('profiles').select('id').eq('role', 'artist').eq('is_approved', True).eq('is_active', True).not_.is_('teaching_rate', 'null')
+    if mode:
+        query = query.eq(f'teaches_{mode}', True)
+    if location:
+        query = query.ilike('location', f'%{location}%')
+    if min_rate is not None:
+        query = query.gte('teaching_rate', min_rate).lte('teaching_rate', max_rate)
+    if art_type:
+        query = query.contains('categories', [art_type])
+    
+    matching_artists = await run_query(query.order('teaching_rate').order('id').limit(3))
+    return [artist['id'] for artist in (matching_artists.data or [])]
+
 @app.post("/api/public/art-class-enquiry")
 async def create_art_class_enquiry(enquiry_data: ArtClassEnquiryCreate, user: dict = Depends(require_user)):
     """Submit art class enquiry - one per month per user"""
     supabase = get_supabase_client()
     
-    # Check if user already has an active enquiry in the last 30 days
-    thirty_days_ago = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
-    
-    existing = supabase.table('art_class_enquiries').select('id').eq('user_id', user['id']).gte('created_at', thirty_days_ago).execute()
-    
-    if existing.data:
-        raise HTTPException(status_code=400, detail="You can only submit one enquiry per month")
-    
     # Find matching artists
-    query = supabase.table('profiles').select('*').eq('role', 'artist').eq('is_approved', True).eq('is_active', True).not_.is_('teaching_rate', 'null')
-    
-    # Filter by class type
-    if enquiry_data.class_type == "online":
-        query = query.eq('teaches_online', True)
-    elif enquiry_data.class_type == "offline":
-        query = query.eq('teaches_offline', True)
-        if enquiry_data.user_location:
-            query = query.ilike('location', f'%{enquiry_data.user_location}%')
-    
-    # Filter by budget range - different options for online vs offline
-    if enquiry_data.class_type == "online":
-        # Online classes: only 250-350 and 350-500 (no 500-1000)
-        budget_ranges = {
-            "250-350": (250, 350),
-            "350-500": (350, 500)
-        }
-        if enquiry_data.budget_range in budget_ranges:
-            min_rate, max_rate = budget_ranges[enquiry_data.budget_range]
-            query = query.gte('teaching_rate', min_rate).lte('teaching_rate', max_rate)
-    elif enquiry_data.class_type == "offline":
-        # Offline/In-person classes: all three budget ranges
-        budget_ranges = {
-            "250-350": (250, 350),
-            "350-500": (350, 500),
-            "500-1000": (500, 1000)
-        }
-        if enquiry_data.budget_range in budget_ranges:
-            min_rate, max_rate = budget_ranges[enquiry_data.budget_range]
-            query = query.gte('teaching_rate', min_rate).lte('teaching_rate', max_rate)
-    
-    # Filter by art category
-    if enquiry_data.art_type:
-        query = query.contains('categories', [enquiry_data.art_type])
-    
-    matching_artists = query.order('teaching_rate').limit(3).execute()
-    matched_ids = [artist['id'] for artist in (matching_artists.data or [])]
-    
-    # Get user info
-    user_profile = supabase.table('profiles').select('full_name, email, location').eq('id', user['id']).single().execute()
-    
-    # Create enquiry
-    enquiry = {
-        "user_id": user['id'],
-        "user_name": user_profile.data.get('name', ''),
-        "user_email": user_profile.data.get('email', ''),
-        "user_location": enquiry_data.user_location or user_profile.data.get('location', ''),
-        "art_type": enquiry_data.art_type,
-        "skill_level": enquiry_data.skill_level,
-        "duration": enquiry_data.duration,
-        "budget_range": enquiry_data.budget_range,
-        "class_type": enquiry_data.class_type,
-        "status": "matched" if matched_ids else "pending",
-        "matched_artists": matched_ids,
-        "contacts_revealed": []
-    }
-    
-    result = supabase.table('art_class_enquiries').insert(enquiry).execute()
+    mode = enquiry_data.class_type if enquiry_data.class_type in CLASS_BUDGET_RANGES else None
+    min_rate, max_rate = CLASS_BUDGET_RANGES.get(mode, {}).get(enquiry_data.budget_range, (None, None))
+    location = enquiry_data.user_location if mode == "offline" else None
+    if mode == "offline" and not location:
+        # Offline classes are matched to where the profile says the user is
+        profile = await run_query(supabase.table('profiles').select('location').eq('id', user['id']).single())
+        location = (profile.data or {}).get('location')
+    point = geocode(location)
+    if teacher_index_ready():
+        matched_ids = []
+        if point is not None:
+            # Nearest offline teachers first, then any whose location names the place but didn't geocode
+            matched_ids = match_nearby_teachers(enquiry_data.art_type, *point, min_rate, max_rate, limit=3)
+        if len(matched_ids) < 3:
+            more = match_teachers(enquiry_data.art_type, mode, min_rate, max_rate, location, limit=3 + len(matched_ids))
+            matched_ids += [artist_id for artist_id in more if artist_id not in matched_ids][:3 - len(matched_ids)]
+    else:
+        matched_ids = await query_matching_artists(supabase, enquiry_data.art_type, mode, min_rate, max_rate, location)
+    
+    # Check the monthly quota and insert in one transaction (see SUPABASE_ART_CLASS_ENQUIRY.sql);
+    # returns nothing when the user already has an enquiry in the last 30 days
+    result = await run_query(supabase.rpc('create_art_class_enquiry', {
+        "p_user_id": user['id'],
+        "p_art_type": enquiry_data.art_type,
+        "p_skill_level": enquiry_data.skill_level,
+        "p_duration": enquiry_data.duration,
+        "p_budget_range": enquiry_data.budget_range,
+        "p_class_type": enquiry_data.class_type,
+        "p_user_location": enquiry_data.user_location,
+        "p_matched_artists": matched_ids,
+    }))
+    
+    if not result.data:
+        raise HTTPException(status_code=400, detail="You can only submit one enquiry per month")
     
     return {
         "success": True,
-        "enquiry_id": result.data[0]['id'],
+        "enquiry_id": result.data['id'],
         "matched_count": len(matched_ids),
         "message": f"Found {len(matched_ids)} matching artist(s)"
     }
 
 @app.get("/api/public/art-class-matches/{enquiry_id}")
+@fast_json
 async def get_art_class_matches(enquiry_id: str, user: dict = Depends(require_user)):
     """Get matching artists for an enquiry"""
     supabase = get_supabase_client()
     
-    enquiry = supabase.table('art_class_enquiries').select('*').eq('id', enquiry_id).eq('user_id', user['id']).single().execute()
+    enquiry = await run_query(supabase.table('art_class_enquiries').select('*').eq('id', enquiry_id).eq('user_id', user['id']).single())
     
     if not enquiry.data:
         raise HTTPException(status_code=404, detail="Enquiry not found")
@@ -380,23 +590,36 @@ async def get_art_class_matches(enquiry_id: str, user: dict = Depends(require_us
     # Check if expired
     expires_at = datetime.fromisoformat(enquiry.data['expires_at'])
     if datetime.now(timezone.utc) > expires_at:
-        supabase.table('art_class_enquiries').update({"status": "expired"}).eq('id', enquiry_id).execute()
+        await run_query(supabase.table('art_class_enquiries').update({"status": "expired"}).eq('id', enquiry_id))
         raise HTTPException(status_code=400, detail="This enquiry has expired")
     
-    # Get matched artists
+    # Get matched artists, and the 3 most viewed approved artworks of each
+    # (see SUPABASE_ARTIST_SAMPLES.sql), in one batch each
+    matched_ids = enquiry.data.get('matched_artists') or []
+    contacts_revealed = enquiry.data.get('contacts_revealed') or []
     matched_artists = []
-    for artist_id in (enquiry.data.get('matched_artists') or []):
-        artist = supabase.table('profiles').select('*').eq('id', artist_id).single().execute()
-        if artist.data:
-            # Get sample artworks
-            artworks = supabase.table('artworks').select('*').eq('artist_id', artist_id).eq('is_approved', True).order('views', desc=True).limit(3).execute()
-            artist.data['sample_artworks'] = artworks.data or []
+    if matched_ids:
+        profiles, artworks = await gather_queries(
+            supabase.table('profiles').select('*').in_('id', matched_ids),
+            supabase.rpc('artist_sample_artworks', {'p_artist_ids': matched_ids, 'p_per_artist': 3}),
+        )
+        
+        sample_artworks = {}
+        for artwork in (artworks.data or []):
+            sample_artworks.setdefault(artwork['artist_id'], []).append(artwork)
+        
+        profiles_by_id = {profile['id']: profile for profile in (profiles.data or [])}
+        for artist_id in matched_ids:
+            artist = profiles_by_id.get(artist_id)
+            if not artist:
+                continue
+            artist['sample_artworks'] = sample_artworks.get(artist_id, [])
             
             # Hide contact if not revealed
-            if artist_id not in (enquiry.data.get('contacts_revealed') or []):
-                artist.data['phone'] = "***HIDDEN***"
+            if artist_id not in contacts_revealed:
+                artist['phone'] = "***HIDDEN***"
             
-            matched_artists.append(artist.data)
+            matched_artists.append(artist)
     
     return {
         "success": True,
@@ -417,7 +640,7 @@ async def reveal_artist_contact(request: RevealContactRequest, user: dict = Depe
     """Reveal artist contact - limited to 3 per enquiry"""
     supabase = get_supabase_client()
     
-    enquiry = supabase.table('art_class_enquiries').select('*').eq('id', request.enquiry_id).eq('user_id', user['id']).single().execute()
+    enquiry = await run_query(supabase.table('art_class_enquiries').select('*').eq('id', request.enquiry_id).eq('user_id', user['id']).single())
     
     if not enquiry.data:
         raise HTTPException(status_code=404, detail="Enquiry not found")
@@ -434,10 +657,10 @@ async def reveal_artist_contact(request: RevealContactRequest, user: dict = Depe
     
     # Reveal contact
     contacts_revealed.append(request.artist_id)
-    supabase.table('art_class_enquiries').update({"contacts_revealed": contacts_revealed}).eq('id', request.enquiry_id).execute()
+    await run_query(supabase.table('art_class_enquiries').update({"contacts_revealed": contacts_revealed}).eq('id', request.enquiry_id))
     
     # Get artist contact
-    artist = supabase.table('profiles').select('phone, email, name').eq('id', request.artist_id).single().execute()
+    artist = await run_query(supabase.table('profiles').select('phone, email, name').eq('id', request.artist_id).single())
     
     return {
         "success": True,
@@ -448,11 +671,12 @@ async def reveal_artist_contact(request: RevealContactRequest, user: dict = Depe
 # ============ USER ROUTES ============
 
 @app.get("/api/user/my-enquiries")
+@fast_json
 async def get_my_art_class_enquiries(user: dict = Depends(require_user)):
     """Get user's art class enquiries"""
     supabase = get_supabase_client()
     
-    enquiries = supabase.table('art_class_enquiries').select('*').eq('user_id', user['id']).order('created_at', desc=True).execute()
+    enquiries = await run_query(supabase.table('art_class_enquiries').select('*').eq('user_id', user['id']).order('created_at', desc=True))
     
     return {"enquiries": enquiries.data or []}
 
@@ -461,7 +685,7 @@ async def get_user_profile(user: dict = Depends(require_user)):
     """Get current user profile"""
     supabase = get_supabase_client()
     
-    profile = supabase.table('profiles').select('*').eq('id', user['id']).single().execute()
+    profile = await run_query(supabase.table('profiles').select('*').eq('id', user['id']).single())
     
     if not profile.data:
         raise HTTPException(status_code=404, detail="Profile not found")
@@ -475,24 +699,22 @@ async def get_admin_dashboard(admin: dict = Depends(require_admin)):
     """Get admin dashboard statistics"""
     supabase = get_supabase_client()
     
-    pending_artists = supabase.table('profiles').select('id', count='exact').eq('role', 'artist').eq('is_approved', False).execute()
-    pending_artworks = supabase.table('artworks').select('id', count='exact').eq('is_approved', False).execute()
-    pending_exhibitions = supabase.table('exhibitions').select('id', count='exact').eq('is_approved', False).execute()
-    total_users = supabase.table('profiles').select('id', count='exact').execute()
+    stats = await get_platform_counters(supabase)
     
     return {
-        "pending_artists": pending_artists.count or 0,
-        "pending_artworks": pending_artworks.count or 0,
-        "pending_exhibitions": pending_exhibitions.count or 0,
-        "total_users": total_users.count or 0
+        "pending_artists": stats.get('pending_artists', 0),
+        "pending_artworks": stats.get('pending_artworks', 0),
+        "pending_exhibitions": stats.get('pending_exhibitions', 0),
+        "total_users": stats.get('total_users', 0)
     }
 
 @app.get("/api/admin/pending-artists")
+@fast_json
 async def get_pending_artists(admin: dict = Depends(require_admin)):
     """Get artists awaiting approval"""
     supabase = get_supabase_client()
     
-    artists = supabase.table('profiles').select('*').eq('role', 'artist').eq('is_approved', False).execute()
+    artists = await run_query(supabase.table('profiles').select('*').eq('role', 'artist').eq('is_approved', False))
     
     return {"artists": artists.data or []}
 
@@ -502,18 +724,26 @@ async def approve_artist(artist_id: str, approved: bool, admin: dict = Depends(r
     supabase = get_supabase_client()
     
     if approved:
-        result = supabase.table('profiles').update({"is_approved": True, "is_active": True}).eq('id', artist_id).execute()
+        result = await run_query(supabase.table('profiles').update({"is_approved": True, "is_active": True}).eq('id', artist_id))
+        for profile in result.data or []:
+            upsert_teacher(profile)
     else:
-        result = supabase.table('profiles').delete().eq('id', artist_id).execute()
+        result = await run_query(supabase.table('profiles').delete().eq('id', artist_id))
+        remove_teacher(artist_id)
+    
+    invalidate_profile(artist_id)
+    forget_not_found('artist', artist_id)
+    response_cache.invalidate("/api/public/stats", "/api/public/artists", "/api/public/paintings")
     
     return {"success": True, "message": f"Artist {'approved' if approved else 'rejected'}"}
 
 @app.get("/api/admin/pending-artworks")
+@fast_json
 async def get_pending_artworks(admin: dict = Depends(require_admin)):
     """Get artworks awaiting approval"""
     supabase = get_supabase_client()
     
-    artworks = supabase.table('artworks').select('*, users(name)').eq('is_approved', False).execute()
+    artworks = await run_query(supabase.table('artworks').select('*, users(name)').eq('is_approved', False))
     
     return {"artworks": artworks.data or []}
 
@@ -523,18 +753,22 @@ async def approve_artwork(request: ArtworkApprovalRequest, admin: dict = Depends
     supabase = get_supabase_client()
     
     if request.approved:
-        result = supabase.table('artworks').update({"is_approved": True}).eq('id', request.artwork_id).execute()
+        result = await run_query(supabase.table('artworks').update({"is_approved": True}).eq('id', request.artwork_id))
+        forget_not_found('painting', request.artwork_id)
     else:
-        result = supabase.table('artworks').delete().eq('id', request.artwork_id).execute()
+        result = await run_query(supabase.table('artworks').delete().eq('id', request.artwork_id))
+    
+    response_cache.invalidate("/api/public/stats", "/api/public/paintings")
     
     return {"success": True, "message": f"Artwork {'approved' if request.approved else 'rejected'}"}
 
 @app.get("/api/admin/pending-exhibitions")
+@fast_json
 async def get_pending_exhibitions(admin: dict = Depends(require_admin)):
     """Get exhibitions awaiting approval"""
     supabase = get_supabase_client()
     
-    exhibitions = supabase.table('exhibitions').select('*, users(name)').eq('is_approved', False).execute()
+    exhibitions = await run_query(supabase.table('exhibitions').select('*, users(name)').eq('is_approved', False))
     
     return {"exhibitions": exhibitions.data or []}
 
@@ -544,27 +778,48 @@ async def approve_exhibition(request: ExhibitionApprovalRequest, admin: dict = D
     supabase = get_supabase_client()
     
     if request.approved:
-        result = supabase.table('exhibitions').update({"is_approved": True, "status": "active"}).eq('id', request.exhibition_id).execute()
+        result = await run_query(supabase.table('exhibitions').update({"is_approved": True, "status": "active"}).eq('id', request.exhibition_id))
     else:
-        result = supabase.table('exhibitions').delete().eq('id', request.exhibition_id).execute()
+        result = await run_query(supabase.table('exhibitions').delete().eq('id', request.exhibition_id))
+    
+    response_cache.invalidate("/api/public/stats", *PUBLIC_EXHIBITION_ROUTES)
+    invalidate_revenue_reports()
     
     return {"success": True, "message": f"Exhibition {'approved' if request.approved else 'rejected'}"}
 
 @app.get("/api/admin/users")
-async def get_all_users(admin: dict = Depends(require_admin)):
-    """Get all users"""
+@fast_json
+async def get_all_users(cursor: Optional[str] = None, limit: Optional[int] = None, admin: dict = Depends(require_admin)):
+    """Get users, one page at a time"""
+    supabase = get_supabase_client()
+    size = page_size(limit)
+    
+    users = await run_query(paginate(supabase.table('profiles').select('*'), cursor, size))
+    rows, next_cursor = split_page(users.data or [], size)
+    
+    return {"users": rows, "next_cursor": next_cursor}
+
+def check_export_format(export_format: str):
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid format. Use one of: {', '.join(EXPORT_FORMATS)}")
+
+@app.get("/api/admin/users/export")
+async def export_users(format: str = "ndjson", admin: dict = Depends(require_admin)):
+    """Stream every user as NDJSON or CSV, newest first"""
+    check_export_format(format)
     supabase = get_supabase_client()
     
-    users = supabase.table('profiles').select('*').execute()
+    rows = iter_rows(lambda: supabase.table('profiles').select('*'))
     
-    return {"users": users.data or []}
+    return export_response(rows, format, "users")
 
 @app.get("/api/admin/approved-artists")
+@fast_json
 async def get_approved_artists(admin: dict = Depends(require_admin)):
     """Get approved artists for featuring"""
     supabase = get_supabase_client()
     
-    artists = supabase.table('profiles').select('*').eq('role', 'artist').eq('is_approved', True).execute()
+    artists = await run_query(supabase.table('profiles').select('*').eq('role', 'artist').eq('is_approved', True))
     
     return {"artists": artists.data or []}
 
@@ -584,7 +839,10 @@ async def feature_contemporary_artist(artist_data: FeaturedArtistCreate, admin:
         "is_featured": True
     }
     
-    result = supabase.table('featured_artists').insert(featured_artist).execute()
+    result = await run_query(supabase.table('featured_artists').insert(featured_artist))
+    
+    forget_not_found('featured_artist', result.data[0]['id'])
+    response_cache.invalidate("/api/public/featured-artists")
     
     return {"success": True, "artist": result.data[0]}
 
@@ -593,7 +851,9 @@ async def delete_contemporary_artist(artist_id: str, admin: dict = Depends(requi
     """Remove a contemporary featured artist"""
     supabase = get_supabase_client()
     
-    result = supabase.table('featured_artists').delete().eq('id', artist_id).execute()
+    result = await run_query(supabase.table('featured_artists').delete().eq('id', artist_id))
+    
+    response_cache.invalidate("/api/public/featured-artists")
     
     return {"success": True, "message": "Featured artist removed"}
 
@@ -604,13 +864,13 @@ async def feature_registered_artist(request: FeatureRegisteredArtistRequest, adm
     
     if request.featured:
         # Get artist details
-        artist = supabase.table('profiles').select('*').eq('id', request.artist_id).single().execute()
+        artist = await run_query(supabase.table('profiles').select('*').eq('id', request.artist_id).single())
         
         if not artist.data:
             raise HTTPException(status_code=404, detail="Artist not found")
         
         # Get artist's artworks
-        artworks = supabase.table('artworks').select('*').eq('artist_id', request.artist_id).eq('is_approved', True).order('views', desc=True).limit(10).execute()
+        artworks = await run_query(supabase.table('artworks').select('*').eq('artist_id', request.artist_id).eq('is_approved', True).order('views', desc=True).limit(10))
         
         # Create featured entry
         featured_artist = {
@@ -625,10 +885,13 @@ async def feature_registered_artist(request: FeatureRegisteredArtistRequest, adm
             "is_featured": True
         }
         
-        result = supabase.table('featured_artists').insert(featured_artist).execute()
+        result = await run_query(supabase.table('featured_artists').insert(featured_artist))
+        forget_not_found('featured_artist', result.data[0]['id'])
     else:
         # Remove from featured
-        result = supabase.table('featured_artists').delete().eq('artist_id', request.artist_id).execute()
+        result = await run_query(supabase.table('featured_artists').delete().eq('artist_id', request.artist_id))
+    
+    response_cache.invalidate("/api/public/featured-artists")
     
     return {"success": True, "message": f"Artist {'featured' if request.featured else 'unfeatured'}"}
 
@@ -636,18 +899,58 @@ async def feature_registered_artist(request: FeatureRegisteredArtistRequest, adm
 async def create_sub_admin(request: CreateSubAdminRequest, admin: dict = Depends(require_admin)):
     """Admin can create sub-admin users"""
     # Note: This would need to create a Supabase Auth user
-    # For now, return instruction to create via Supabase dashboard
+    # For now, return instruction to create via Supabase dashboard.
+    # Once it writes roles here, call invalidate_profile() for the affected user.
     raise HTTPException(status_code=501, detail="Please create sub-admin users via Supabase Auth dashboard and update their role in the users table")
 
 @app.get("/api/admin/sub-admins")
+@fast_json
 async def get_sub_admins(admin: dict = Depends(require_admin)):
     """Get all sub-admin users"""
     supabase = get_supabase_client()
     
-    sub_admins = supabase.table('profiles').select('*').in_('role', ['lead_chitrakar', 'kalakar']).execute()
+    sub_admins = await run_query(supabase.table('profiles').select('*').in_('role', ['lead_chitrakar', 'kalakar']))
     
     return {"sub_admins": sub_admins.data or []}
 
+@app.get("/api/admin/cache-stats")
+async def get_cache_stats(admin: dict = Depends(require_admin)):
+    """Hit/miss counters for the in-process caches of this worker"""
+    return {"caches": cache_stats()}
+
+@app.get("/api/admin/traces")
+async def get_slow_traces(limit: int = 50, admin: dict = Depends(require_admin)):
+    """Span breakdown of the most recent requests slower than TRACE_SLOW_THRESHOLD_MS in this worker"""
+    return {"threshold_ms": TRACE_SLOW_THRESHOLD_MS, "traces": slow_traces(max(1, min(limit, 200)))}
+
+# Longest profile an admin can request; the request is held open for its duration
+PROFILE_MAX_SECONDS = float(os.environ.get('PROFILE_MAX_SECONDS', '60'))
+
+@app.get("/api/admin/profile")
+async def profile_worker(
+    mode: str = "cpu",
+    seconds: float = 10,
+    interval_ms: float = 10,
+    include_idle: bool = False,
+    limit: int = 30,
+    admin: dict = Depends(require_admin),
+):
+    """
+    Profile the worker serving this request for `seconds`.
+    cpu: sampled stacks of every thread, in collapsed (flamegraph) format.
+    memory: source lines whose live allocations grew most, via tracemalloc.
+    """
+    seconds = max(0.1, min(seconds, PROFILE_MAX_SECONDS))
+    try:
+        if mode == "cpu":
+            interval = max(1.0, min(interval_ms, 1000.0)) / 1000
+            return PlainTextResponse(await cpu_profile(seconds, interval, include_idle))
+        if mode == "memory":
+            return await memory_profile(seconds, max(1, min(limit, 200)))
+    except ProfilerBusy:
+        raise HTTPException(status_code=409, detail="A profile is already running in this worker")
+    raise HTTPException(status_code=400, detail="mode must be 'cpu' or 'memory'")
+
 # ============ LEAD CHITRAKAR ROUTES ============
 
 @app.post("/api/admin/lead-chitrakar/approve-artwork")
@@ -656,9 +959,12 @@ async def lead_chitrakar_approve_artwork(request: ArtworkApprovalRequest, user:
     supabase = get_supabase_client()
     
     if request.approved:
-        result = supabase.table('artworks').update({"is_approved": True}).eq('id', request.artwork_id).execute()
+        result = await run_query(supabase.table('artworks').update({"is_approved": True}).eq('id', request.artwork_id))
+        forget_not_found('painting', request.artwork_id)
     else:
-        result = supabase.table('artworks').delete().eq('id', request.artwork_id).execute()
+        result = await run_query(supabase.table('artworks').delete().eq('id', request.artwork_id))
+    
+    response_cache.invalidate("/api/public/stats", "/api/public/paintings")
     
     return {"success": True, "message": f"Artwork {'approved' if request.approved else 'rejected'}"}
 
@@ -669,32 +975,53 @@ async def kalakar_exhibitions_analytics(user: dict = Depends(require_kalakar)):
     """Kalakar can view exhibition analytics"""
     supabase = get_supabase_client()
     
-    total = supabase.table('exhibitions').select('id', count='exact').execute()
-    active = supabase.table('exhibitions').select('id', count='exact').eq('status', 'active').execute()
-    archived = supabase.table('exhibitions').select('id', count='exact').eq('status', 'archived').execute()
-    
-    # Get revenue
-    exhibitions = supabase.table('exhibitions').select('fees, voluntary_platform_fee').execute()
-    total_revenue = sum(e.get('fees', 0) for e in (exhibitions.data or []))
-    voluntary_fees = sum(e.get('voluntary_platform_fee', 0) for e in (exhibitions.data or []))
+    stats = await get_platform_counters(supabase)
     
     return {
-        "total_exhibitions": total.count or 0,
-        "active_exhibitions": active.count or 0,
-        "archived_exhibitions": archived.count or 0,
-        "total_revenue": total_revenue,
-        "voluntary_platform_fees": voluntary_fees
+        "total_exhibitions": stats.get('total_exhibitions', 0),
+        "active_exhibitions": stats.get('active_exhibitions', 0),
+        "archived_exhibitions": stats.get('archived_exhibitions', 0),
+        "total_revenue": stats.get('total_revenue', 0),
+        "voluntary_platform_fees": stats.get('voluntary_platform_fees', 0)
     }
 
+@app.get("/api/admin/kalakar/revenue-report")
+@fast_json
+async def kalakar_revenue_report(
+    period: str = "month",
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    user: dict = Depends(require_kalakar),
+):
+    """Exhibition fees per day, week or month, split by exhibition type"""
+    if period not in REVENUE_PERIODS:
+        raise HTTPException(status_code=400, detail=f"Invalid period. Use one of: {', '.join(REVENUE_PERIODS)}")
+    if since and until and since >= until:
+        raise HTTPException(status_code=400, detail="since must be before until")
+    supabase = get_supabase_client()
+    
+    return await revenue_report(supabase, period, since, until)
+
 @app.get("/api/admin/kalakar/payment-records")
+@fast_json
 async def kalakar_payment_records(user: dict = Depends(require_kalakar)):
     """Kalakar can view payment records"""
     supabase = get_supabase_client()
     
-    exhibitions = supabase.table('exhibitions').select('*, users(name)').eq('is_approved', True).order('created_at', desc=True).execute()
+    exhibitions = await run_query(supabase.table('exhibitions').select('*, users(name)').eq('is_approved', True).order('created_at', desc=True))
     
     return {"payment_records": exhibitions.data or []}
 
+@app.get("/api/admin/kalakar/payment-records/export")
+async def export_payment_records(format: str = "ndjson", user: dict = Depends(require_kalakar)):
+    """Stream every payment record as NDJSON or CSV, newest first"""
+    check_export_format(format)
+    supabase = get_supabase_client()
+    
+    rows = iter_rows(lambda: supabase.table('exhibitions').select('*, users(name)').eq('is_approved', True))
+    
+    return export_response(rows, format, "payment-records")
+
 # ============ ARTIST ROUTES ============
 
 @app.get("/api/artist/profile")
@@ -702,7 +1029,7 @@ async def get_artist_profile(artist: dict = Depends(require_artist)):
     """Get artist profile"""
     supabase = get_supabase_client()
     
-    profile = supabase.table('profiles').select('*').eq('id', artist['id']).single().execute()
+    profile = await run_query(supabase.table('profiles').select('*').eq('id', artist['id']).single())
     
     return {"profile": profile.data}
 
@@ -718,25 +1045,32 @@ async def update_profile(
     if not update_data:
         return {"success": True}
 
-    supabase.table('profiles') \
-        .update(update_data) \
-        .eq('id', user['id']) \
-        .execute()
+    await run_query(
+        supabase.table('profiles')
+        .update(update_data)
+        .eq('id', user['id'])
+    )
+    invalidate_profile(user['id'])
+    response_cache.invalidate("/api/public/artists", "/api/public/paintings")
 
-    updated_user = supabase.table('profiles') \
-        .select('*') \
-        .eq('id', user['id']) \
-        .single() \
-        .execute()
+    updated_user = await run_query(
+        supabase.table('profiles')
+        .select('*')
+        .eq('id', user['id'])
+        .single()
+    )
+
+    upsert_teacher(updated_user.data)
 
     return {"success": True, "user": updated_user.data}
 
 @app.get("/api/artist/artworks")
+@fast_json
 async def get_artist_artworks(artist: dict = Depends(require_artist)):
     """Get artist's artworks"""
     supabase = get_supabase_client()
     
-    artworks = supabase.table('artworks').select('*').eq('artist_id', artist['id']).execute()
+    artworks = await run_query(supabase.table('artworks').select('*').eq('artist_id', artist['id']))
     
     return {"artworks": artworks.data or []}
 
@@ -766,7 +1100,7 @@ async def create_artwork(
              "views": 0,
         } 
 
-        result = supabase.table("artworks").insert(artwork_data).execute()
+        result = await run_query(supabase.table("artworks").insert(artwork_data))
 
         if not result.data:
             raise HTTPException(status_code=400, detail="Insert failed - no data returned")
@@ -783,39 +1117,30 @@ async def create_artwork(
 async def get_artist_dashboard(artist: dict = Depends(require_artist)):
     supabase = get_supabase_client()
 
-    artworks = supabase.table("artworks") \
-        .select("id", count="exact") \
-        .eq("artist_id", artist["id"]) \
-        .execute()
-
-    orders = supabase.table("orders") \
-        .select("id", count="exact") \
-        .eq("artist_id", artist["id"]) \
-        .execute()
-
-    views = supabase.table("artworks") \
-        .select("views") \
-        .eq("artist_id", artist["id"]) \
-        .execute()
-
-    total_views = sum(a.get("views", 0) for a in (views.data or []))
+    # Counts and view total in one round trip (see SUPABASE_DASHBOARD_FUNCTIONS.sql)
+    stats = await run_query(
+        supabase.rpc("artist_dashboard_stats", {"p_artist_id": artist["id"]})
+    )
+    stats = stats.data or {}
 
     return {
-        "total_artworks": artworks.count or 0,
-        "completed_orders": orders.count or 0,
-        "portfolio_views": total_views,
+        "total_artworks": stats.get("total_artworks", 0),
+        "completed_orders": stats.get("completed_orders", 0),
+        "portfolio_views": stats.get("portfolio_views", 0),
         "total_earnings": 0
     }
 
 @app.get("/api/artist/orders")
+@fast_json
 async def get_artist_orders(artist: dict = Depends(require_artist)):
     supabase = get_supabase_client()
 
-    orders = supabase.table("orders") \
-        .select("*") \
-        .eq("artist_id", artist["id"]) \
-        .order("created_at", desc=True) \
-        .execute()
+    orders = await run_query(
+        supabase.table("orders")
+        .select("*")
+        .eq("artist_id", artist["id"])
+        .order("created_at", desc=True)
+    )
 
     return {"orders": orders.data or []}
 
@@ -825,21 +1150,24 @@ async def delete_artist_artwork(artwork_id: str, artist: dict = Depends(require_
     supabase = get_supabase_client()
     
     # Verify artwork belongs to artist
-    artwork = supabase.table('artworks').select('id').eq('id', artwork_id).eq('artist_id', artist['id']).single().execute()
+    artwork = await run_query(supabase.table('artworks').select('id').eq('id', artwork_id).eq('artist_id', artist['id']).single())
     
     if not artwork.data:
         raise HTTPException(status_code=404, detail="Artwork not found or not owned by you")
     
-    supabase.table('artworks').delete().eq('id', artwork_id).execute()
+    await run_query(supabase.table('artworks').delete().eq('id', artwork_id))
+    
+    response_cache.invalidate("/api/public/stats", "/api/public/paintings")
     
     return {"success": True, "message": "Artwork deleted successfully"}
 
 @app.get("/api/artist/exhibitions")
+@fast_json
 async def get_artist_exhibitions(artist: dict = Depends(require_artist)):
     """Get artist's exhibitions"""
     supabase = get_supabase_client()
     
-    exhibitions = supabase.table('exhibitions').select('*').eq('artist_id', artist['id']).execute()
+    exhibitions = await run_query(supabase.table('exhibitions').select('*').eq('artist_id', artist['id']))
     
     return {"exhibitions": exhibitions.data or []}
 
@@ -888,7 +1216,8 @@ async def create_exhibition(exhibition: ExhibitionCreate, artist: dict = Depends
         "is_approved": False
     }
     
-    result = supabase.table('exhibitions').insert(exhibition_data).execute()
+    result = await run_query(supabase.table('exhibitions').insert(exhibition_data))
+    invalidate_revenue_reports()
     
     return {"success": True, "exhibition": result.data[0], "message": f"Exhibition submitted. Total fee: ₹{total_fees}"}
 
@@ -909,15 +1238,16 @@ async def get_upload_url(
         if not bucket_name:
             raise HTTPException(status_code=500, detail="AWS_S3_BUCKET not configured")
         
-        upload_url = s3.generate_presigned_url(
-            "put_object",
-            Params={
-                "Bucket": bucket_name,
-                "Key": key,
-                "ContentType": body.content_type,
-            },
-            ExpiresIn=300,
-        )
+        with span("s3.presign", bucket=bucket_name, key=key):
+            upload_url = s3.generate_presigned_url(
+                "put_object",
+                Params={
+                    "Bucket": bucket_name,
+                    "Key": key,
+                    "ContentType": body.content_type,
+                },
+                ExpiresIn=300,
+            )
 
         public_url = (
             f"https://{bucket_name}"
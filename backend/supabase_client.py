@@ -1,14 +1,71 @@
 import os
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from supabase import create_client, Client
+from metrics import describe_query, supabase_calls_in_flight, supabase_call_duration, supabase_call_errors
+from tracing import span
 
 SUPABASE_URL = os.environ.get('SUPABASE_URL', 'https://lurvhgzauuzwftfymjym.supabase.co')
 SUPABASE_KEY = os.environ.get('SUPABASE_SERVICE_KEY', '')  # Service role key for admin operations
 
+# Size of the thread pool that runs blocking PostgREST calls off the event loop
+SUPABASE_POOL_SIZE = int(os.environ.get('SUPABASE_POOL_SIZE', '16'))
+# Shared deadline (seconds) for a group of queries issued with gather_queries
+SUPABASE_FANOUT_TIMEOUT = float(os.environ.get('SUPABASE_FANOUT_TIMEOUT', '10'))
+
 # Create Supabase client
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_KEY else None
 
+_executor = ThreadPoolExecutor(max_workers=SUPABASE_POOL_SIZE, thread_name_prefix='supabase')
+
 def get_supabase_client() -> Client:
     """Get Supabase client instance"""
     if not supabase:
         raise Exception("Supabase client not initialized. Set SUPABASE_SERVICE_KEY environment variable.")
     return supabase
+
+async def run_query(query):
+    """
+    Execute a built Supabase query without blocking the event loop.
+    The synchronous client runs on a bounded thread pool (SUPABASE_POOL_SIZE)
+    so a slow round trip only occupies one worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    table, operation = describe_query(query)
+    supabase_calls_in_flight.inc()
+    started = time.perf_counter()
+    try:
+        with span(f"supabase {operation} {table}", table=table, operation=operation):
+            return await loop.run_in_executor(_executor, query.execute)
+    except Exception:
+        supabase_call_errors.inc(table, operation)
+        raise
+    finally:
+        supabase_calls_in_flight.dec()
+        supabase_call_duration.observe(time.perf_counter() - started, table, operation)
+
+async def gather_queries(*queries, timeout: float = SUPABASE_FANOUT_TIMEOUT) -> list:
+    """
+    Run independent queries concurrently and return their responses in order.
+    All queries share one deadline. If any query fails, or the deadline
+    passes, the remaining ones are cancelled and the error is raised.
+    """
+    tasks = [asyncio.ensure_future(run_query(query)) for query in queries]
+    try:
+        done, pending = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+    errors = [task.exception() for task in done if task.exception() is not None]
+    if errors:
+        raise errors[0]
+    if pending:
+        raise asyncio.TimeoutError(f"Supabase queries did not finish within {timeout}s")
+    return [task.result() for task in tasks]
+
+def shutdown_query_pool():
+    """Stop the query thread pool, waiting for in-flight calls to finish"""
+    _executor.shutdown(wait=True)
@@ -0,0 +1,254 @@
+import os
+import math
+import time
+import heapq
+import asyncio
+from bisect import bisect_left, bisect_right, insort
+from typing import List, Optional
+
+from supabase_client import get_supabase_client, run_query
+from pagination import paginate, split_page, encode_cursor
+from export import iter_rows
+from geo import geocode, haversine_km
+
+# In-memory index of artists who teach, for art-class matching. Teachers are
+# bucketed by (category, mode) and kept sorted by (teaching_rate, id) in each
+# bucket, so a match is a bisect to the low end of the budget and a short walk.
+# The index follows profiles.updated_at (see SUPABASE_PROFILES_UPDATED_AT.sql)
+# and is rebuilt from scratch now and then to drop profiles deleted elsewhere.
+TEACHER_INDEX_REFRESH_INTERVAL = float(os.environ.get('TEACHER_INDEX_REFRESH_INTERVAL', '15'))
+TEACHER_INDEX_REBUILD_INTERVAL = float(os.environ.get('TEACHER_INDEX_REBUILD_INTERVAL', '900'))
+TEACHER_INDEX_BATCH_SIZE = int(os.environ.get('TEACHER_INDEX_BATCH_SIZE', '1000'))
+
+# Offline teachers with a geocoded location are also bucketed by (category,
+# place), and places by grid cell, for nearest-teacher matching
+TEACHER_GRID_CELL_DEG = float(os.environ.get('TEACHER_GRID_CELL_DEG', '0.25'))
+OFFLINE_MATCH_RADIUS_KM = float(os.environ.get('OFFLINE_MATCH_RADIUS_KM', '40'))
+# Teachers this close to each other in distance are ranked by rate instead
+OFFLINE_MATCH_DISTANCE_BAND_KM = float(os.environ.get('OFFLINE_MATCH_DISTANCE_BAND_KM', '5'))
+
+TEACHER_COLUMNS = 'id, role, is_approved, is_active, teaching_rate, teaches_online, teaches_offline, categories, location, updated_at'
+
+# Bucket modes: every teacher is in 'any'; online/offline follow their flags
+ANY_MODE = 'any'
+
+class TeacherIndex:
+    """
+    Teaching artists bucketed by (category or None, mode), and offline ones
+    with a geocoded location also by (category or None, 'offline', lat, lon).
+    Every bucket is sorted by (rate, id).
+    """
+
+    def __init__(self):
+        self._teachers = {}  # id -> (rate, bucket keys, lowercased location, (lat, lon) or None)
+        self._buckets = {}   # bucket key -> sorted [(rate, id)]
+        # grid cell -> geocoded places in it; never pruned, as places come from the gazetteer
+        self._cells = {}
+
+    def __len__(self):
+        return len(self._teachers)
+
+    def upsert(self, profile: dict):
+        """Add, move or drop one profile according to its current columns"""
+        self.remove(profile['id'])
+        teacher = _teacher_entry(profile)
+        if teacher is None:
+            return
+        rate, keys = teacher[:2]
+        for key in keys:
+            insort(self._buckets.setdefault(key, []), (rate, profile['id']))
+        self._teachers[profile['id']] = teacher
+        self._add_place(teacher[3])
+
+    def load(self, profiles):
+        """Bulk insert into an empty index: sort the teachers once, then append in order"""
+        teachers = []
+        for profile in profiles:
+            teacher = _teacher_entry(profile)
+            if teacher is not None:
+                teachers.append((teacher[0], profile['id'], teacher))
+        teachers.sort(key=lambda item: item[:2])
+        for rate, teacher_id, teacher in teachers:
+            for key in teacher[1]:
+                self._buckets.setdefault(key, []).append((rate, teacher_id))
+            self._teachers[teacher_id] = teacher
+            self._add_place(teacher[3])
+
+    def _add_place(self, point):
+        if point is not None:
+            self._cells.setdefault((_cell(point[0]), _cell(point[1])), set()).add(point)
+
+    def remove(self, profile_id: str):
+        teacher = self._teachers.pop(profile_id, None)
+        if teacher is None:
+            return
+        rate, keys = teacher[:2]
+        entry = (rate, profile_id)
+        for key in keys:
+            bucket = self._buckets[key]
+            del bucket[bisect_left(bucket, entry)]
+            if not bucket:
+                del self._buckets[key]
+
+    def match(self, category: Optional[str], mode: Optional[str], min_rate: Optional[float] = None,
+              max_rate: Optional[float] = None, location: Optional[str] = None, limit: int = 3) -> List[str]:
+        """
+        Ids of the cheapest teachers of `category` (any when None) teaching in
+        `mode` ('online', 'offline' or None for either) with a rate within
+        [min_rate, max_rate] and, if given, `location` in their location.
+        """
+        bucket = self._buckets.get((category or None, mode or ANY_MODE), [])
+        start, end = _rate_range(bucket, min_rate, max_rate)
+        if not location:
+            return [teacher_id for _, teacher_id in bucket[start:min(end, start + limit)]]
+        needle = location.lower()
+        matched = []
+        for i in range(start, end):
+            teacher_id = bucket[i][1]
+            if needle in self._teachers[teacher_id][2]:
+                matched.append(teacher_id)
+                if len(matched) == limit:
+                    break
+        return matched
+
+    def match_nearby(self, category: Optional[str], lat: float, lon: float, min_rate: Optional[float] = None,
+                     max_rate: Optional[float] = None, radius_km: float = OFFLINE_MATCH_RADIUS_KM,
+                     limit: int = 3) -> List[str]:
+        """
+        Ids of the offline teachers of `category` within `radius_km` of
+        (lat, lon) and within budget, nearest first; teachers in the same
+        OFFLINE_MATCH_DISTANCE_BAND_KM band are cheapest first. Only the places
+        in grid cells overlapping the radius are visited, and each of those
+        contributes at most `limit` teachers.
+        """
+        dlat = radius_km / 111.0
+        dlon = radius_km / (111.32 * max(math.cos(math.radians(lat)), 0.01))
+        rows = range(_cell(lat - dlat), _cell(lat + dlat) + 1)
+        columns = range(_cell(lon - dlon), _cell(lon + dlon) + 1)
+        candidates = []
+        for row in rows:
+            for column in columns:
+                for point in self._cells.get((row, column), ()):
+                    distance = haversine_km(lat, lon, *point)
+                    bucket = self._buckets.get((category or None, 'offline') + point)
+                    if distance > radius_km or not bucket:
+                        continue
+                    band = int(distance // OFFLINE_MATCH_DISTANCE_BAND_KM)
+                    start, end = _rate_range(bucket, min_rate, max_rate)
+                    candidates.extend((band, rate, teacher_id) for rate, teacher_id in bucket[start:min(end, start + limit)])
+        return [teacher_id for _, _, teacher_id in heapq.nsmallest(limit, candidates)]
+
+def _rate_range(bucket: list, min_rate: Optional[float], max_rate: Optional[float]):
+    """Slice bounds of the entries with min_rate <= rate <= max_rate"""
+    start = 0 if min_rate is None else bisect_left(bucket, (float(min_rate),))
+    # '\uffff' sorts after every id, so the bound includes rate == max_rate
+    end = len(bucket) if max_rate is None else bisect_right(bucket, (float(max_rate), '\uffff'))
+    return start, end
+
+def _cell(degrees: float) -> int:
+    return math.floor(degrees / TEACHER_GRID_CELL_DEG)
+
+def _teacher_entry(profile: dict):
+    """(rate, bucket keys, lowercased location, point) for an approved, active artist with a rate, else None"""
+    if not (
+        profile.get('role') == 'artist'
+        and profile.get('is_approved') is True
+        and profile.get('is_active') is True
+        and profile.get('teaching_rate') is not None
+    ):
+        return None
+    modes = [ANY_MODE]
+    if profile.get('teaches_online'):
+        modes.append('online')
+    if profile.get('teaches_offline'):
+        modes.append('offline')
+    categories = [None] + list(set(profile.get('categories') or []))
+    keys = [(category, mode) for category in categories for mode in modes]
+    point = geocode(profile.get('location')) if profile.get('teaches_offline') else None
+    if point is not None:
+        keys.extend((category, 'offline') + point for category in categories)
+    return float(profile['teaching_rate']), keys, (profile.get('location') or '').lower(), point
+
+_index: Optional[TeacherIndex] = None
+_cursor: Optional[str] = None  # keyset position in the (updated_at, id) change feed
+_rebuilt_at = 0.0
+_refresh_task: Optional[asyncio.Task] = None
+
+def teacher_index_ready() -> bool:
+    return _index is not None
+
+def match_teachers(*args, **kwargs) -> List[str]:
+    return _index.match(*args, **kwargs)
+
+def match_nearby_teachers(*args, **kwargs) -> List[str]:
+    return _index.match_nearby(*args, **kwargs)
+
+def upsert_teacher(profile: dict):
+    """Apply a profile this worker just wrote, ahead of the next refresh"""
+    if _index is not None and profile and 'role' in profile:
+        _index.upsert(profile)
+
+def remove_teacher(profile_id: str):
+    if _index is not None:
+        _index.remove(profile_id)
+
+async def rebuild_teacher_index():
+    """Load every artist profile into a fresh index and swap it in"""
+    global _index, _cursor, _rebuilt_at
+    supabase = get_supabase_client()
+    profiles = [profile async for profile in iter_rows(
+        lambda: supabase.table('profiles').select(TEACHER_COLUMNS).eq('role', 'artist'),
+        column='updated_at', desc=False, batch_size=TEACHER_INDEX_BATCH_SIZE,
+    )]
+    index = TeacherIndex()
+    index.load(profiles)
+    if profiles and profiles[-1].get('updated_at'):
+        _cursor = encode_cursor(profiles[-1], 'updated_at')
+    _index = index
+    _rebuilt_at = time.monotonic()
+
+async def refresh_teacher_index():
+    """Apply profiles changed since the last refresh"""
+    global _cursor
+    if _index is None or _cursor is None:
+        await rebuild_teacher_index()
+        return
+    supabase = get_supabase_client()
+    while True:
+        query = paginate(supabase.table('profiles').select(TEACHER_COLUMNS), _cursor, TEACHER_INDEX_BATCH_SIZE,
+                         column='updated_at', desc=False)
+        result = await run_query(query)
+        rows, next_cursor = split_page(result.data or [], TEACHER_INDEX_BATCH_SIZE, column='updated_at')
+        for profile in rows:
+            _index.upsert(profile)
+        if rows and rows[-1].get('updated_at'):
+            _cursor = encode_cursor(rows[-1], 'updated_at')
+        if not next_cursor:
+            return
+
+async def _refresh_loop():
+    while True:
+        try:
+            if time.monotonic() - _rebuilt_at >= TEACHER_INDEX_REBUILD_INTERVAL:
+                await rebuild_teacher_index()
+            else:
+                await refresh_teacher_index()
+        except Exception as e:
+            print(f"Error refreshing teacher index: {e}")
+        await asyncio.sleep(TEACHER_INDEX_REFRESH_INTERVAL)
+
+def start_teacher_index():
+    """Build the index in the background and keep it current"""
+    global _refresh_task
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.ensure_future(_refresh_loop())
+
+async def stop_teacher_index():
+    global _refresh_task
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except asyncio.CancelledError:
+            pass
+        _refresh_task = None
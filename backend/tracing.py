@@ -0,0 +1,155 @@
+import os
+import re
+import time
+import random
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# Requests slower than this are kept in the trace buffer
+TRACE_SLOW_THRESHOLD_MS = float(os.environ.get('TRACE_SLOW_THRESHOLD_MS', '500'))
+# How many slow traces to keep; the oldest is dropped first
+TRACE_BUFFER_SIZE = int(os.environ.get('TRACE_BUFFER_SIZE', '200'))
+
+_slow_traces = deque(maxlen=TRACE_BUFFER_SIZE)
+
+_current_trace = ContextVar('current_trace', default=None)
+_current_span = ContextVar('current_span', default=None)
+
+_TRACEPARENT = re.compile(r'^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+_TRACE_ID = re.compile(r'^[0-9A-Za-z-]{8,64}$')
+
+def _new_id(bits: int) -> str:
+    return f'{random.getrandbits(bits):0{bits // 4}x}'
+
+class Span:
+    __slots__ = ('name', 'span_id', 'parent_id', 'start', 'end', 'attributes', 'error')
+
+    def __init__(self, name: str, parent_id: Optional[str], attributes: dict):
+        self.name = name
+        self.span_id = _new_id(64)
+        self.parent_id = parent_id
+        self.start = time.perf_counter()
+        self.end = None
+        self.attributes = attributes
+        self.error = None
+
+    def to_dict(self, origin: float) -> dict:
+        end = self.end if self.end is not None else time.perf_counter()
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": round((end - self.start) * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+class Trace:
+    """One request: a root span and every span opened while serving it"""
+    __slots__ = ('trace_id', 'parent_span_id', 'root', 'spans', 'started_at')
+
+    def __init__(self, trace_id: str, parent_span_id: Optional[str], name: str):
+        self.trace_id = trace_id
+        self.parent_span_id = parent_span_id
+        self.root = Span(name, parent_span_id, {})
+        self.spans = [self.root]
+        self.started_at = time.time()
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.root.end - self.root.start) * 1000
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.root.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 3),
+            "spans": [span.to_dict(self.root.start) for span in self.spans],
+        }
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Time a block as a child of the current span. Outside a traced request
+    (e.g. background tasks) it does nothing.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    current = Span(name, _current_span.get(), attributes)
+    trace.spans.append(current)
+    token = _current_span.set(current.span_id)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        current.end = time.perf_counter()
+        _current_span.reset(token)
+
+def current_trace_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.trace_id if trace is not None else None
+
+def _incoming_trace(headers: dict):
+    """(trace id, parent span id) from a W3C traceparent or X-Trace-Id header"""
+    match = _TRACEPARENT.match(headers.get(b'traceparent', b'').decode('latin-1'))
+    if match:
+        return match.group(1), match.group(2)
+    trace_id = headers.get(b'x-trace-id', b'').decode('latin-1')
+    if _TRACE_ID.match(trace_id):
+        return trace_id, None
+    return _new_id(128), None
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening one trace per HTTP request. The trace id is
+    taken from an incoming traceparent / X-Trace-Id header (or generated)
+    and returned in X-Trace-Id. Requests slower than TRACE_SLOW_THRESHOLD_MS
+    are kept in a bounded buffer, read through slow_traces().
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        trace_id, parent_span_id = _incoming_trace(dict(scope['headers']))
+        trace = Trace(trace_id, parent_span_id, f"{scope['method']} {scope['path']}")
+        trace_token = _current_trace.set(trace)
+        span_token = _current_span.set(trace.root.span_id)
+
+        async def send_with_trace_id(message):
+            if message['type'] == 'http.response.start':
+                trace.root.attributes['status'] = message['status']
+                message['headers'] = list(message.get('headers', [])) + [(b'x-trace-id', trace_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        except BaseException as e:
+            trace.root.error = type(e).__name__
+            raise
+        finally:
+            trace.root.end = time.perf_counter()
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            route = getattr(scope.get('route'), 'path', None)
+            if route:
+                trace.root.name = f"{scope['method']} {route}"
+                trace.root.attributes['path'] = scope['path']
+            if trace.duration_ms >= TRACE_SLOW_THRESHOLD_MS:
+                _slow_traces.append(trace)
+
+def slow_traces(limit: int = 50) -> list:
+    """The most recent slow traces, newest first"""
+    return [trace.to_dict() for trace in list(_slow_traces)[::-1][:limit]]
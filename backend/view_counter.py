@@ -0,0 +1,54 @@
+import os
+import asyncio
+from collections import Counter
+from typing import Optional
+from supabase_client import get_supabase_client, run_query
+
+# Artwork page views are counted in memory and written back in batches
+# through the increment_artwork_views RPC (see SUPABASE_VIEW_COUNTER.sql).
+VIEW_FLUSH_INTERVAL = float(os.environ.get('VIEW_FLUSH_INTERVAL', '10'))
+
+_pending = Counter()
+_flush_task: Optional[asyncio.Task] = None
+
+def record_view(artwork_id: str):
+    """Count one view; it is persisted on the next flush"""
+    _pending[artwork_id] += 1
+
+async def flush_views():
+    """Write all buffered view counts in one atomic batched increment"""
+    global _pending
+    if not _pending:
+        return
+    
+    batch, _pending = _pending, Counter()
+    try:
+        supabase = get_supabase_client()
+        await run_query(supabase.rpc('increment_artwork_views', {'view_counts': dict(batch)}))
+    except Exception as e:
+        # Keep the counts for the next attempt
+        print(f"Error flushing artwork views: {e}")
+        _pending.update(batch)
+
+async def _flush_loop():
+    while True:
+        await asyncio.sleep(VIEW_FLUSH_INTERVAL)
+        await flush_views()
+
+def start_view_flusher():
+    """Start the periodic background flush"""
+    global _flush_task
+    if _flush_task is None or _flush_task.done():
+        _flush_task = asyncio.ensure_future(_flush_loop())
+
+async def stop_view_flusher():
+    """Stop the background flush and persist whatever is still buffered"""
+    global _flush_task
+    if _flush_task is not None:
+        _flush_task.cancel()
+        try:
+            await _flush_task
+        except asyncio.CancelledError:
+            pass
+        _flush_task = None
+    await flush_views()
@@ -0,0 +1,68 @@
+"""
+Round trips and latency of GET /api/public/art-class-matches/{id} as the
+number of matched artists grows. Each simulated round trip costs LATENCY
+seconds. Before batching the handler issued 1 + 2N queries for N matches.
+
+Usage:
+python benchmarks/bench_art_class_matches.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import orjson
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+import server  # noqa: E402
+from fake_supabase import FakeSupabase  # noqa: E402
+
+LATENCY = 0.02
+
+
+def build_dataset(num_artists: int, artworks_per_artist: int = 8):
+    user_id = str(uuid.uuid4())
+    artists = [{"id": str(uuid.uuid4()), "full_name": f"Artist {i}", "phone": "999", "role": "artist"} for i in range(num_artists)]
+    artworks = [
+        {"id": str(uuid.uuid4()), "artist_id": artist["id"], "title": f"Work {j}", "is_approved": True, "views": j}
+        for artist in artists
+        for j in range(artworks_per_artist)
+    ]
+    enquiry = {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "art_type": "Painting",
+        "skill_level": "beginner",
+        "class_type": "online",
+        "budget_range": "250-350",
+        "matched_artists": [artist["id"] for artist in artists],
+        "contacts_revealed": [],
+        "expires_at": (datetime.now(timezone.utc) + timedelta(days=30)).isoformat(),
+    }
+    tables = {"profiles": artists, "artworks": artworks, "art_class_enquiries": [enquiry]}
+    return tables, enquiry["id"], {"id": user_id}
+
+
+def main():
+    print(f"{'matches':>8} {'round trips':>12} {'previous':>9} {'latency ms':>11}")
+    for num_artists in (1, 3, 10, 50):
+        tables, enquiry_id, user = build_dataset(num_artists)
+        fake = FakeSupabase(tables, latency=LATENCY)
+        server.get_supabase_client = lambda: fake
+
+        started = time.perf_counter()
+        response = asyncio.run(server.get_art_class_matches(enquiry_id, user=user))
+        elapsed = (time.perf_counter() - started) * 1000
+        result = orjson.loads(response.body)
+
+        assert len(result["artists"]) == num_artists
+        assert all(len(artist["sample_artworks"]) == 3 for artist in result["artists"])
+        print(f"{num_artists:>8} {len(fake.calls):>12} {1 + 2 * num_artists:>9} {elapsed:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
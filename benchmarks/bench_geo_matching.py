@@ -0,0 +1,74 @@
+"""
+Offline art-class matching by place: the location substring match (what the
+ilike query does, and the teacher index without a geocoded location) against
+the spatial grid, which returns the nearest teachers within
+OFFLINE_MATCH_RADIUS_KM. Reports latency per enquiry, how many of the three
+slots get filled, and how far away the matched teachers are.
+
+Usage:
+python benchmarks/bench_geo_matching.py [--sizes 1000,10000,100000] [--lookups 2000]
+"""
+
+import argparse
+import csv
+import os
+import random
+import statistics
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from geo import GAZETTEER_PATH, geocode, haversine_km  # noqa: E402
+from teacher_index import TeacherIndex  # noqa: E402
+from bench_teacher_index import CATEGORIES, BUDGETS, make_teachers, per_lookup_us  # noqa: E402
+
+with open(GAZETTEER_PATH, newline="", encoding="utf-8") as f:
+    PLACES = [row["name"] for row in csv.DictReader(f)]
+# Teachers and students cluster in the big metros and their satellite towns
+METROS = ["Mumbai", "Thane", "Navi Mumbai", "Delhi", "Gurugram", "Noida", "Bengaluru", "Hyderabad", "Pune", "Chennai", "Kolkata"]
+NEIGHBOURHOODS = ["", "Sector 12, ", "Civil Lines, ", "Station Road, ", "MG Road, "]
+
+
+def place(rng):
+    return rng.choice(METROS) if rng.random() < 0.7 else rng.choice(PLACES)
+
+
+def make_enquiries(count, rng):
+    return [(rng.choice(CATEGORIES), place(rng), *rng.choice(BUDGETS)) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'teachers':>10} {'path':>10} {'us/enquiry':>11} {'filled':>8} {'none':>7} {'p95 km':>8}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        rng = random.Random(size)
+        teachers = make_teachers(size, rng)
+        for profile in teachers:
+            profile["location"] = f"{rng.choice(NEIGHBOURHOODS)}{place(rng)}"
+        points = {profile["id"]: geocode(profile["location"]) for profile in teachers}
+        index = TeacherIndex()
+        index.load(teachers)
+        enquiries = make_enquiries(args.lookups, rng)
+
+        paths = {
+            "substring": lambda category, location, low, high: index.match(category, "offline", low, high, location),
+            "grid": lambda category, location, low, high: index.match_nearby(category, *geocode(location), low, high),
+        }
+        for name, match in paths.items():
+            us = per_lookup_us(match, enquiries)
+            filled, distances = [], []
+            for enquiry in enquiries:
+                matched = match(*enquiry)
+                filled.append(len(matched))
+                origin = geocode(enquiry[1])
+                distances += [haversine_km(*origin, *points[teacher_id]) for teacher_id in matched]
+            print(f"{size:>10} {name:>10} {us:>11.2f} {sum(filled) / len(filled):>6.2f}/3 "
+                  f"{filled.count(0) / len(filled):>7.1%} {statistics.quantiles(distances, n=20)[-1] if len(distances) > 1 else 0:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
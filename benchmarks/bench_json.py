@@ -0,0 +1,79 @@
+"""
+Cost of serializing a large list response: FastAPI's default path
+(jsonable_encoder, then stdlib json in JSONResponse) against
+FastJSONResponse, which encodes the Supabase rows directly with orjson.
+The payload is the /api/public/paintings shape: artwork rows with their
+embedded artist profile.
+
+Usage:
+python benchmarks/bench_json.py [--rows 10000] [--runs 20]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from fake_supabase import FakeSupabase, seed_dataset  # noqa: E402
+from fast_json import FastJSONResponse  # noqa: E402
+
+
+def paintings_payload(rows: int) -> dict:
+    # Half the seeded artworks are approved; seed enough to fill the page
+    dataset = seed_dataset(artworks=rows * 3)
+    supabase = FakeSupabase(dataset["tables"], latency=0)
+    result = supabase.table('artworks').select(
+        '*, profiles.inner(id, full_name, avatar, location)'
+    ).eq('is_approved', True).order('created_at', desc=True).limit(rows).execute()
+    return {"paintings": result.data, "next_cursor": None, "facets": None}
+
+
+def default_path(payload) -> bytes:
+    """What FastAPI does with a returned dict when there is no response_model"""
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def fast_path(payload) -> bytes:
+    return FastJSONResponse(payload).body
+
+
+def measure(fn, payload, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn(payload)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = paintings_payload(args.rows)
+    rows = len(payload["paintings"])
+    default_body, fast_body = default_path(payload), fast_path(payload)
+    assert json.loads(default_body) == json.loads(fast_body), "encoders disagree"
+
+    print(f"{rows} painting rows, {len(fast_body) / 1024 / 1024:.1f} MiB of JSON, {args.runs} runs")
+    print(f"{'path':<40}{'p50 ms':>10}{'min ms':>10}")
+    results = {}
+    for name, fn in (("jsonable_encoder + json (default)", default_path), ("FastJSONResponse (orjson)", fast_path)):
+        timings = measure(fn, payload, args.runs)
+        results[name] = statistics.median(timings)
+        print(f"{name:<40}{results[name]:>10.2f}{min(timings):>10.2f}")
+    default_ms, fast_ms = results.values()
+    print(f"speedup: {default_ms / fast_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
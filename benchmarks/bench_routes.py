@@ -0,0 +1,327 @@
+"""
+End-to-end latency of every route in server.py against the in-process
+Supabase stand-in. Requests go through the ASGI app (routing, auth,
+validation, serialization); each upstream round trip costs LATENCY
+seconds. Reports p50/p99 latency, throughput and upstream round trips
+per request, and saves the results as JSON so runs can be compared.
+
+Usage:
+python benchmarks/bench_routes.py [--artworks 10000] [--latency 0.02] [--requests 200]
+    [--concurrency 10] [--cold] [--only paintings] [--output results.json] [--compare old.json]
+
+--cold clears the in-process caches before every request, to measure the
+uncached path. Mutating routes run last so they do not skew the reads.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "backend"))
+
+# Offline configuration, set before the app reads its environment
+JWT_SECRET = "bench-secret-for-offline-route-benchmarks"
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+os.environ.setdefault("AWS_S3_BUCKET", "bench-bucket")
+
+import httpx  # noqa: E402
+import jwt  # noqa: E402
+
+import auth_utils  # noqa: E402
+import cache_utils  # noqa: E402
+import server  # noqa: E402
+import supabase_client  # noqa: E402
+import teacher_index  # noqa: E402
+import view_counter  # noqa: E402
+from fake_supabase import FakeSupabase, seed_dataset  # noqa: E402
+
+
+def make_token(user_id: str) -> str:
+    now = int(time.time())
+    return jwt.encode(
+        {"sub": user_id, "email": f"{user_id}@example.com", "aud": "authenticated", "iat": now, "exp": now + 3600},
+        JWT_SECRET,
+        algorithm="HS256",
+    )
+
+
+class Scenario:
+    """One route, and how to build its i-th request"""
+
+    def __init__(self, name, method, path, role=None, body=None, mutates=False):
+        self.name = name
+        self.method = method
+        self.path = path  # str, or callable(i, ids) -> str
+        self.role = role  # None, a staff role, "artist", or "user" (rotates through seeded users)
+        self.body = body  # None, dict, or callable(i, ids) -> dict
+        self.mutates = mutates
+
+    def build(self, i, ids, tokens):
+        path = self.path(i, ids) if callable(self.path) else self.path
+        body = self.body(i, ids) if callable(self.body) else self.body
+        headers = {}
+        if self.role == "user":
+            user_id = ids["users"][i % len(ids["users"])]
+            headers["Authorization"] = f"Bearer {tokens.setdefault(user_id, make_token(user_id))}"
+        elif self.role:
+            headers["Authorization"] = f"Bearer {tokens[self.role]}"
+        return self.method, path, body, headers
+
+
+def pick(key):
+    return lambda i, ids: ids[key][i % len(ids[key])]
+
+
+ENQUIRY = {"art_type": "Painting", "skill_level": "beginner", "duration": "1 month",
+           "budget_range": "250-350", "class_type": "online"}
+
+SCENARIOS = [
+    Scenario("GET /api/health", "GET", "/api/health"),
+    Scenario("GET /api/metrics", "GET", "/api/metrics"),
+    Scenario("GET /api/public/stats", "GET", "/api/public/stats"),
+    Scenario("GET /api/public/featured-artists", "GET", "/api/public/featured-artists"),
+    Scenario("GET /api/public/artists", "GET", "/api/public/artists"),
+    Scenario("GET /api/public/artist/{id}", "GET", lambda i, ids: f"/api/public/artist/{pick('approved_artists')(i, ids)}"),
+    Scenario("GET /api/public/artist/{id} (missing)", "GET", lambda i, ids: f"/api/public/artist/{uuid.UUID(int=i + 1)}"),
+    Scenario("GET /api/public/paintings", "GET", "/api/public/paintings"),
+    Scenario("GET /api/public/paintings (filtered)", "GET",
+             "/api/public/paintings?category=Painting&min_price=5000&max_price=50000&sort=price_asc"),
+    Scenario("GET /api/public/painting/{id}", "GET", lambda i, ids: f"/api/public/painting/{pick('approved_artworks')(i, ids)}"),
+    Scenario("GET /api/public/featured-artist/{id}", "GET", lambda i, ids: f"/api/public/featured-artist/{pick('featured')(i, ids)}"),
+    Scenario("GET /api/public/exhibitions", "GET", "/api/public/exhibitions"),
+    Scenario("GET /api/public/exhibitions/active", "GET", "/api/public/exhibitions/active"),
+    Scenario("GET /api/public/exhibitions/archived", "GET", "/api/public/exhibitions/archived"),
+    Scenario("GET /api/public/art-class-matches/{id}", "GET",
+             lambda i, ids: f"/api/public/art-class-matches/{pick('enquiries')(i, ids)}", role="user"),
+    Scenario("GET /api/user/my-enquiries", "GET", "/api/user/my-enquiries", role="user"),
+    Scenario("GET /api/user/profile", "GET", "/api/user/profile", role="user"),
+    Scenario("GET /api/admin/dashboard", "GET", "/api/admin/dashboard", role="admin"),
+    Scenario("GET /api/admin/pending-artists", "GET", "/api/admin/pending-artists", role="admin"),
+    Scenario("GET /api/admin/pending-artworks", "GET", "/api/admin/pending-artworks", role="admin"),
+    Scenario("GET /api/admin/pending-exhibitions", "GET", "/api/admin/pending-exhibitions", role="admin"),
+    Scenario("GET /api/admin/users", "GET", "/api/admin/users", role="admin"),
+    Scenario("GET /api/admin/users/export", "GET", "/api/admin/users/export", role="admin"),
+    Scenario("GET /api/admin/users/export (csv)", "GET", "/api/admin/users/export?format=csv", role="admin"),
+    Scenario("GET /api/admin/approved-artists", "GET", "/api/admin/approved-artists", role="admin"),
+    Scenario("GET /api/admin/sub-admins", "GET", "/api/admin/sub-admins", role="admin"),
+    Scenario("GET /api/admin/cache-stats", "GET", "/api/admin/cache-stats", role="admin"),
+    Scenario("GET /api/admin/traces", "GET", "/api/admin/traces", role="admin"),
+    Scenario("GET /api/admin/kalakar/exhibitions-analytics", "GET", "/api/admin/kalakar/exhibitions-analytics", role="kalakar"),
+    Scenario("GET /api/admin/kalakar/revenue-report", "GET", "/api/admin/kalakar/revenue-report?period=week",
+             role="kalakar"),
+    Scenario("GET /api/admin/kalakar/payment-records", "GET", "/api/admin/kalakar/payment-records", role="kalakar"),
+    Scenario("GET /api/admin/kalakar/payment-records/export", "GET", "/api/admin/kalakar/payment-records/export",
+             role="kalakar"),
+    Scenario("GET /api/artist/profile", "GET", "/api/artist/profile", role="artist"),
+    Scenario("GET /api/artist/artworks", "GET", "/api/artist/artworks", role="artist"),
+    Scenario("GET /api/artist/dashboard", "GET", "/api/artist/dashboard", role="artist"),
+    Scenario("GET /api/artist/orders", "GET", "/api/artist/orders", role="artist"),
+    Scenario("GET /api/artist/exhibitions", "GET", "/api/artist/exhibitions", role="artist"),
+    # Mutating routes
+    Scenario("POST /api/upload-url", "POST", "/api/upload-url", role="user", mutates=True,
+             body={"filename": "work.jpg", "content_type": "image/jpeg", "folder": "artworks"}),
+    Scenario("POST /api/public/art-class-enquiry", "POST", "/api/public/art-class-enquiry", role="user",
+             body=ENQUIRY, mutates=True),
+    Scenario("POST /api/public/reveal-contact", "POST", "/api/public/reveal-contact", role="user", mutates=True,
+             body=lambda i, ids: {"enquiry_id": pick("enquiries")(i, ids), "artist_id": pick("enquiry_matches")(i, ids)[0]}),
+    Scenario("PUT /api/auth/profile", "PUT", "/api/auth/profile", role="artist", mutates=True,
+             body=lambda i, ids: {"bio": f"Updated bio {i}"}),
+    Scenario("POST /api/artist/artworks", "POST", "/api/artist/artworks", role="artist", mutates=True,
+             body=lambda i, ids: {"title": f"Bench work {i}", "category": "Painting", "price": 12000}),
+    Scenario("POST /api/artist/portfolio", "POST", "/api/artist/portfolio", role="artist", mutates=True,
+             body=lambda i, ids: {"title": f"Bench portfolio {i}", "category": "Sketch", "price": 4000}),
+    Scenario("POST /api/artist/exhibitions", "POST", "/api/artist/exhibitions", role="artist", mutates=True,
+             body=lambda i, ids: {"name": f"Bench show {i}", "start_date": "2025-01-01", "end_date": "2025-01-04"}),
+    Scenario("POST /api/admin/approve-artist", "POST",
+             lambda i, ids: f"/api/admin/approve-artist?artist_id={pick('pending_artists')(i, ids)}&approved=true",
+             role="admin", mutates=True),
+    Scenario("POST /api/admin/approve-artwork", "POST", "/api/admin/approve-artwork", role="admin", mutates=True,
+             body=lambda i, ids: {"artwork_id": pick("pending_artworks")(i, ids), "approved": True}),
+    Scenario("POST /api/admin/lead-chitrakar/approve-artwork", "POST", "/api/admin/lead-chitrakar/approve-artwork",
+             role="lead_chitrakar", mutates=True,
+             body=lambda i, ids: {"artwork_id": pick("pending_artworks")(i, ids), "approved": True}),
+    Scenario("POST /api/admin/approve-exhibition", "POST", "/api/admin/approve-exhibition", role="admin", mutates=True,
+             body=lambda i, ids: {"exhibition_id": pick("pending_exhibitions")(i, ids), "approved": True}),
+    Scenario("POST /api/admin/feature-contemporary-artist", "POST", "/api/admin/feature-contemporary-artist",
+             role="admin", mutates=True,
+             body={"name": "Guest Artist", "bio": "Visiting", "categories": ["Painting"]}),
+    Scenario("POST /api/admin/feature-registered-artist", "POST", "/api/admin/feature-registered-artist",
+             role="admin", mutates=True,
+             body=lambda i, ids: {"artist_id": pick("approved_artists")(i, ids), "featured": True}),
+    Scenario("DELETE /api/admin/feature-contemporary-artist/{id}", "DELETE",
+             lambda i, ids: f"/api/admin/feature-contemporary-artist/{pick('featured')(i, ids)}", role="admin", mutates=True),
+    Scenario("POST /api/admin/create-sub-admin", "POST", "/api/admin/create-sub-admin", role="admin", mutates=True,
+             body={"name": "Helper", "email": "helper@example.com", "password": "secret", "role": "kalakar"}),
+    Scenario("DELETE /api/artist/artworks/{id}", "DELETE",
+             lambda i, ids: f"/api/artist/artworks/{pick('artist_artworks')(i, ids)}", role="artist", mutates=True),
+]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def clear_caches():
+    for cache in cache_utils._caches.values():
+        if hasattr(cache, "clear"):
+            cache.clear()
+
+
+async def run_scenario(client, fake, scenario, ids, tokens, requests, concurrency, warmup, cold):
+    for i in range(warmup):
+        method, path, body, headers = scenario.build(i, ids, tokens)
+        await client.request(method, path, json=body, headers=headers)
+
+    latencies = []
+    statuses = {}
+    next_index = iter(range(warmup, warmup + requests))
+
+    async def worker():
+        for i in next_index:
+            method, path, body, headers = scenario.build(i, ids, tokens)
+            if cold:
+                clear_caches()
+            started = time.perf_counter()
+            response = await client.request(method, path, json=body, headers=headers)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    fake.reset_calls()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    calls = fake.reset_calls()
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+        "throughput_rps": round(requests / elapsed, 1),
+        "round_trips_per_request": round(len(calls) / requests, 2),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, text=True).strip()
+    except Exception:
+        return None
+
+
+def print_results(results, previous=None):
+    header = f"{'route':<56} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>8} {'trips':>6}  status"
+    if previous:
+        header += "   p50 vs before"
+    print(header)
+    for name, stats in results.items():
+        statuses = " ".join(f"{code}x{count}" for code, count in stats["statuses"].items())
+        line = (f"{name:<56} {stats['p50_ms']:>9.2f} {stats['p99_ms']:>9.2f} "
+                f"{stats['throughput_rps']:>8.1f} {stats['round_trips_per_request']:>6.2f}  {statuses}")
+        before = (previous or {}).get(name)
+        if before and before["p50_ms"]:
+            line += f"   {(stats['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100:+.0f}%"
+        print(line)
+
+
+async def run(args):
+    print(f"Seeding {args.artworks} artworks...")
+    dataset = seed_dataset(artworks=args.artworks, seed=args.seed)
+    ids = dataset["ids"]
+    ids["enquiry_matches"] = [enquiry["matched_artists"] for enquiry in dataset["tables"]["art_class_enquiries"]]
+    fake = FakeSupabase(dataset["tables"], latency=args.latency, jitter=args.jitter, seed=args.seed)
+
+    server.get_supabase_client = lambda: fake
+    supabase_client.get_supabase_client = lambda: fake
+    view_counter.get_supabase_client = lambda: fake
+    teacher_index.get_supabase_client = lambda: fake
+    auth_utils.SUPABASE_JWT_SECRET = JWT_SECRET
+    # Built at startup by the app; ASGITransport does not run startup events
+    if not args.no_teacher_index:
+        await teacher_index.rebuild_teacher_index()
+
+    tokens = {role: make_token(ids[role]) for role in ("admin", "lead_chitrakar", "kalakar", "artist")}
+    scenarios = [s for s in SCENARIOS if not args.only or args.only in s.name]
+    scenarios.sort(key=lambda s: s.mutates)
+
+    results = {}
+    transport = httpx.ASGITransport(app=server.app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for scenario in scenarios:
+            # Include the artworks created by earlier scenarios, so deletes find rows
+            ids["artist_artworks"] = list(fake.index("artworks", "artist_id").get(ids["artist"], {}))
+            results[scenario.name] = await run_scenario(
+                client, fake, scenario, ids, tokens, args.requests, args.concurrency, args.warmup, args.cold
+            )
+    # Views recorded by the painting detail route are flushed outside the measured requests
+    await view_counter.flush_views()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--artworks", type=int, default=10_000, help="size of the seeded dataset (10k-1M)")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per upstream round trip")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random seconds per round trip, up to this much")
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per route")
+    parser.add_argument("--concurrency", type=int, default=10, help="requests in flight at once")
+    parser.add_argument("--warmup", type=int, default=5, help="unmeasured requests per route first")
+    parser.add_argument("--cold", action="store_true", help="clear in-process caches before every request")
+    parser.add_argument("--only", help="only run routes whose name contains this")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-teacher-index", action="store_true",
+                        help="match art-class enquiries with a database query instead of the in-memory index")
+    parser.add_argument("--output", help="where to save the JSON results (default: benchmarks/results/routes-<time>.json)")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare p50 against")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)["routes"]
+    print()
+    print_results(results, previous)
+
+    started_at = datetime.now(timezone.utc)
+    output = args.output or os.path.join(BENCH_DIR, "results", f"routes-{started_at:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "meta": {
+                "timestamp": started_at.isoformat(),
+                "git_commit": git_commit(),
+                "python": platform.python_version(),
+                "artworks": args.artworks,
+                "latency": args.latency,
+                "jitter": args.jitter,
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "cold": args.cold,
+                "pool_size": supabase_client.SUPABASE_POOL_SIZE,
+            },
+            "routes": results,
+        }, f, indent=2)
+    print(f"\nSaved {output}")
+
+
+if __name__ == "__main__":
+    main()
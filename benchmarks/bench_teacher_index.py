@@ -0,0 +1,101 @@
+"""
+Art-class matching latency as the number of teaching artists grows: the
+in-memory teacher index (bisect into a (category, mode) bucket) against a
+filter over every teacher, which is what the database query does without
+an index on the match columns. Also times applying one changed profile.
+
+Usage:
+python benchmarks/bench_teacher_index.py [--sizes 1000,10000,100000] [--lookups 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from teacher_index import TeacherIndex  # noqa: E402
+
+CATEGORIES = ["Painting", "Sketch", "Sculpture", "Digital", "Photography", "Calligraphy", "Mural", "Pottery"]
+LOCATIONS = ["Mumbai", "Delhi", "Bengaluru", "Hyderabad", "Chennai", "Kolkata", "Pune", "Jaipur"]
+BUDGETS = [(250, 350), (350, 500), (500, 1000)]
+
+
+def make_teachers(count, rng):
+    return [{
+        "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        "role": "artist", "is_approved": True, "is_active": True,
+        "teaching_rate": rng.randrange(200, 1200, 10),
+        "teaches_online": rng.random() < 0.6, "teaches_offline": rng.random() < 0.6,
+        "categories": rng.sample(CATEGORIES, rng.randint(1, 3)),
+        "location": f"{rng.choice(LOCATIONS)}, India",
+    } for _ in range(count)]
+
+
+def make_enquiries(count, rng):
+    enquiries = []
+    for _ in range(count):
+        mode = rng.choice(["online", "offline"])
+        low, high = rng.choice(BUDGETS[:2] if mode == "online" else BUDGETS)
+        location = rng.choice(LOCATIONS) if mode == "offline" else None
+        enquiries.append((rng.choice(CATEGORIES), mode, low, high, location))
+    return enquiries
+
+
+def scan_match(teachers, category, mode, low, high, location, limit=3):
+    """The database query's filters, evaluated over every teacher"""
+    found = [
+        teacher for teacher in teachers
+        if teacher[f"teaches_{mode}"]
+        and low <= teacher["teaching_rate"] <= high
+        and category in teacher["categories"]
+        and (not location or location.lower() in teacher["location"].lower())
+    ]
+    found.sort(key=lambda teacher: (teacher["teaching_rate"], teacher["id"]))
+    return [teacher["id"] for teacher in found[:limit]]
+
+
+def per_lookup_us(fn, enquiries):
+    started = time.perf_counter()
+    for enquiry in enquiries:
+        fn(*enquiry)
+    return (time.perf_counter() - started) / len(enquiries) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'teachers':>10} {'build ms':>10} {'index us':>10} {'scan us':>12} {'update us':>10}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        rng = random.Random(size)
+        teachers = make_teachers(size, rng)
+        enquiries = make_enquiries(args.lookups, rng)
+
+        started = time.perf_counter()
+        index = TeacherIndex()
+        index.load(teachers)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        for enquiry in enquiries[:50]:
+            assert index.match(*enquiry) == scan_match(teachers, *enquiry), enquiry
+
+        index_us = per_lookup_us(index.match, enquiries)
+        scan_us = per_lookup_us(lambda *enquiry: scan_match(teachers, *enquiry), enquiries[:max(20, args.lookups // 50)])
+
+        changed = [dict(teacher, teaching_rate=rng.randrange(200, 1200, 10)) for teacher in rng.sample(teachers, 1000)]
+        started = time.perf_counter()
+        for teacher in changed:
+            index.upsert(teacher)
+        update_us = (time.perf_counter() - started) / len(changed) * 1e6
+
+        print(f"{size:>10} {build_ms:>10.1f} {index_us:>10.2f} {scan_us:>12.1f} {update_us:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,797 @@
+"""
+In-process stand-in for the Supabase client used by the benchmarks.
+Supports the query-builder and RPC calls server.py makes, answers them
+from tables held as lists of row dicts, and records every call.
+
+Each round trip takes `latency` seconds (plus up to `jitter`) in total:
+the time spent evaluating the query counts towards it, so as long as that
+stays below the latency the fake behaves like a database with a fixed
+response time. Equality filters use lazily built hash indexes and ordered
+scans reuse cached sort orders, so seeded datasets of up to ~1M artworks
+stay cheap to query.
+"""
+
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeAPIError(Exception):
+    """Raised where PostgREST would answer with an error"""
+
+
+def _copy_row(row: dict) -> dict:
+    # Callers may mutate the rows and the lists in them (e.g. contacts_revealed)
+    return {key: list(value) if isinstance(value, list) else value for key, value in row.items()}
+
+
+def _coerce(row_value, value):
+    """Convert a filter value (often a string from a cursor) to the row value's type"""
+    if row_value is None or value is None or isinstance(value, type(row_value)):
+        return value
+    if isinstance(row_value, bool):
+        return str(value).lower() == "true"
+    if isinstance(row_value, (int, float)):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return value
+    return str(value)
+
+
+def _compare(op, row_value, value):
+    if op == "is":
+        expected = {"null": None, "true": True, "false": False}.get(str(value).lower(), value)
+        return row_value is expected
+    if op == "in":
+        return row_value in value
+    if op == "cs":
+        return set(value) <= set(row_value or [])
+    value = _coerce(row_value, value)
+    if op == "eq":
+        return row_value == value
+    if op == "neq":
+        return row_value != value
+    if row_value is None:
+        return False
+    if op == "gt":
+        return row_value > value
+    if op == "gte":
+        return row_value >= value
+    if op == "lt":
+        return row_value < value
+    if op == "lte":
+        return row_value <= value
+    if op in ("like", "ilike"):
+        pattern = str(value).strip("%*")
+        if op == "ilike":
+            return pattern.lower() in str(row_value).lower()
+        return pattern in str(row_value)
+    raise FakeAPIError(f"Unsupported operator: {op}")
+
+
+def _split_top_level(text: str) -> list:
+    """Split on commas that are not inside parentheses or double quotes"""
+    parts, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    if current:
+        parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+
+def _parse_logic_tree(text: str, conjunction: str = "or"):
+    """Turn a PostgREST or=(...)/and(...) filter string into a row predicate"""
+    checks = []
+    for part in _split_top_level(text):
+        if part.startswith(("and(", "or(")):
+            inner = part[part.index("(") + 1:-1]
+            checks.append(_parse_logic_tree(inner, part[:part.index("(")]))
+            continue
+        column, op, value = part.split(".", 2)
+        negate = op == "not"
+        if negate:
+            op, value = value.split(".", 1)
+        if value.startswith('"') and value.endswith('"'):
+            value = value[1:-1]
+        checks.append(lambda row, column=column, op=op, value=value, negate=negate:
+                      _compare(op, row.get(column), value) != negate)
+    if conjunction == "and":
+        return lambda row: all(check(row) for check in checks)
+    return lambda row: any(check(row) for check in checks)
+
+
+def _parse_select(columns: str):
+    """Split a select string into plain columns and embedded resources"""
+    plain, embeds = [], []
+    for part in _split_top_level(columns or "*"):
+        if "(" in part:
+            name, inner = part[:-1].split("(", 1)
+            inner_join = name.endswith((".inner", "!inner"))
+            name = name.replace("!inner", "").replace(".inner", "")
+            embeds.append((name, [c.strip() for c in inner.split(",")], inner_join))
+        else:
+            plain.append(part)
+    return plain, embeds
+
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.operation = "select"
+        self.payload = None
+        self.count = None
+        self.columns = "*"
+        self.filters = []  # (column, op, value) or a predicate for or_()
+        self.orders = []
+        self.limit_to = None
+        self.offset_by = 0
+        self.single_row = False
+        self._negate = False
+
+    @property
+    def path(self) -> str:
+        return f"/{self.table}"
+
+    @property
+    def http_method(self) -> str:
+        return {"select": "GET", "insert": "POST", "update": "PATCH", "delete": "DELETE"}[self.operation]
+
+    # ---- operations ----
+    def select(self, columns="*", count=None):
+        self.operation = "select"
+        self.columns = columns
+        self.count = count
+        return self
+
+    def insert(self, payload):
+        self.operation = "insert"
+        self.payload = payload
+        return self
+
+    def update(self, payload):
+        self.operation = "update"
+        self.payload = payload
+        return self
+
+    def delete(self):
+        self.operation = "delete"
+        return self
+
+    # ---- filters ----
+    def _filter(self, column, op, value):
+        if self._negate:
+            self._negate = False
+            self.filters.append(lambda row, check=self._check(column, op, value): not check(row))
+        else:
+            self.filters.append((column, op, value))
+        return self
+
+    @property
+    def not_(self):
+        self._negate = True
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, "eq", value)
+
+    def neq(self, column, value):
+        return self._filter(column, "neq", value)
+
+    def gt(self, column, value):
+        return self._filter(column, "gt", value)
+
+    def gte(self, column, value):
+        return self._filter(column, "gte", value)
+
+    def lt(self, column, value):
+        return self._filter(column, "lt", value)
+
+    def lte(self, column, value):
+        return self._filter(column, "lte", value)
+
+    def like(self, column, pattern):
+        return self._filter(column, "like", pattern)
+
+    def ilike(self, column, pattern):
+        return self._filter(column, "ilike", pattern)
+
+    def is_(self, column, value):
+        return self._filter(column, "is", value)
+
+    def in_(self, column, values):
+        return self._filter(column, "in", set(values))
+
+    def contains(self, column, values):
+        return self._filter(column, "cs", list(values))
+
+    def or_(self, filters):
+        self.filters.append(_parse_logic_tree(filters))
+        return self
+
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, size):
+        self.limit_to = size
+        return self
+
+    def offset(self, size):
+        self.offset_by = size
+        return self
+
+    def range(self, start, end):
+        self.offset_by = start
+        self.limit_to = end - start + 1
+        return self
+
+    def single(self):
+        self.single_row = True
+        return self
+
+    # ---- execution ----
+    def _check(self, column, op, value):
+        if "." in column:
+            # Filter on an embedded resource, e.g. profiles.location
+            relation, column = column.split(".", 1)
+            return lambda row: _compare(op, (self.client.related(self.table, relation, row) or {}).get(column), value)
+        return lambda row: _compare(op, row.get(column), value)
+
+    def _predicates(self):
+        checks = [f if callable(f) else self._check(*f) for f in self.filters]
+        _, embeds = _parse_select(self.columns)
+        for relation, _, inner_join in embeds:
+            if inner_join:
+                checks.append(lambda row, relation=relation: self.client.related(self.table, relation, row) is not None)
+        return checks
+
+    def _candidates(self):
+        """Rows to scan: the smallest equality-index bucket, or the whole table"""
+        best = None
+        for f in self.filters:
+            if callable(f) or "." in f[0] or f[1] not in ("eq", "in"):
+                continue
+            column, op, value = f
+            index = self.client.index(self.table, column)
+            if op == "eq":
+                bucket = list(index.get(value, {}).values()) if _hashable(value) else None
+            else:
+                bucket = [row for v in value for row in index.get(v, {}).values()]
+            if bucket is not None and (best is None or len(bucket) < len(best)):
+                best = bucket
+        return best
+
+    def _select_rows(self):
+        checks = self._predicates()
+        candidates = self._candidates()
+        needed = None if self.count or self.limit_to is None else self.offset_by + self.limit_to
+
+        if self.orders and needed is not None and (candidates is None or len(candidates) > SORT_SCAN_THRESHOLD):
+            # Walk the cached sort order and stop once the page is full
+            rows = []
+            for row in self.client.sorted_rows(self.table, tuple(self.orders)):
+                if all(check(row) for check in checks):
+                    rows.append(row)
+                    if len(rows) >= needed:
+                        break
+            return rows, None
+
+        rows = candidates if candidates is not None else self.client.tables.setdefault(self.table, [])
+        rows = [row for row in rows if all(check(row) for check in checks)]
+        for column, desc in reversed(self.orders):
+            rows.sort(key=lambda row: _sort_key(row.get(column)), reverse=desc)
+        return rows, len(rows)
+
+    def _project(self, row, parsed):
+        plain, embeds = parsed
+        if "*" in plain or not plain:
+            result = _copy_row(row)
+        else:
+            result = {column: row.get(column) for column in plain}
+        for relation, columns, _ in embeds:
+            related = self.client.related(self.table, relation, row)
+            if related is not None and "*" not in columns:
+                related = {column: related.get(column) for column in columns}
+            result[relation] = _copy_row(related) if related is not None else None
+        return result
+
+    def execute(self):
+        started = time.perf_counter()
+        try:
+            with self.client.lock:
+                return self._execute()
+        finally:
+            self.client.record(self.path, self.http_method, time.perf_counter() - started)
+
+    def _execute(self):
+        if self.operation == "insert":
+            payload = self.payload if isinstance(self.payload, list) else [self.payload]
+            inserted = [self.client.insert_row(self.table, dict(item)) for item in payload]
+            return FakeResponse([_copy_row(row) for row in inserted])
+
+        if self.operation in ("update", "delete"):
+            candidates = self._candidates()
+            rows = candidates if candidates is not None else list(self.client.tables.get(self.table, []))
+            checks = self._predicates()
+            matched = [row for row in rows if all(check(row) for check in checks)]
+            for row in matched:
+                if self.operation == "update":
+                    self.client.update_row(self.table, row, self.payload)
+                else:
+                    self.client.delete_row(self.table, row)
+            return FakeResponse([_copy_row(row) for row in matched])
+
+        rows, total = self._select_rows()
+        if self.offset_by or self.limit_to is not None:
+            end = None if self.limit_to is None else self.offset_by + self.limit_to
+            rows = rows[self.offset_by:end]
+        parsed = _parse_select(self.columns)
+        data = [self._project(row, parsed) for row in rows]
+        if self.single_row:
+            if len(data) != 1:
+                raise FakeAPIError("JSON object requested, multiple (or no) rows returned")
+            data = data[0]
+        return FakeResponse(data, count=total if self.count else None)
+
+
+class FakeRPC:
+    def __init__(self, client, name, params):
+        self.client = client
+        self.name = name
+        self.params = params or {}
+
+    @property
+    def path(self) -> str:
+        return f"/rpc/{self.name}"
+
+    @property
+    def http_method(self) -> str:
+        return "POST"
+
+    def execute(self):
+        started = time.perf_counter()
+        try:
+            function = self.client.functions.get(self.name)
+            if function is None:
+                raise FakeAPIError(f"Could not find the function public.{self.name}")
+            with self.client.lock:
+                return FakeResponse(function(self.client, self.params))
+        finally:
+            self.client.record(self.path, self.http_method, time.perf_counter() - started)
+
+
+def _hashable(value) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+# Ordered, limited selects matching more candidate rows than this walk the
+# cached sort order instead of sorting the candidates
+SORT_SCAN_THRESHOLD = 2000
+
+
+def _sort_key(value):
+    return (value is None, value if value is not None else 0)
+
+
+# Embedded resources resolve through the row's foreign key; `users` is the
+# legacy name of the profiles table used by some selects
+RELATION_TABLES = {"users": "profiles", "profiles": "profiles"}
+FOREIGN_KEYS = ("artist_id", "user_id", "buyer_id")
+
+
+class FakeSupabase:
+    """Fake client holding tables as lists of row dicts"""
+
+    def __init__(self, tables=None, latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        self.tables = tables or {}
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = []  # (path, method) per round trip
+        self.lock = threading.RLock()
+        self.functions = dict(DEFAULT_FUNCTIONS)
+        self._record_lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._indexes = {}  # (table, column) -> {value: {row id: row}}
+        self._sorted = {}  # (table, orders) -> rows in that order
+        self._memo = {}  # per-function results, dropped on any write
+        self.version = 0
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def from_(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params=None):
+        return FakeRPC(self, name, params)
+
+    # ---- call recorder ----
+    def record(self, path, method, elapsed: float = 0.0):
+        with self._record_lock:
+            self.calls.append((path, method))
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > elapsed:
+            time.sleep(delay - elapsed)
+
+    def reset_calls(self) -> list:
+        with self._record_lock:
+            calls, self.calls = self.calls, []
+        return calls
+
+    # ---- storage ----
+    def index(self, table, column):
+        key = (table, column)
+        index = self._indexes.get(key)
+        if index is None:
+            index = {}
+            for row in self.tables.setdefault(table, []):
+                value = row.get(column)
+                if _hashable(value):
+                    index.setdefault(value, {})[row["id"]] = row
+            self._indexes[key] = index
+        return index
+
+    def sorted_rows(self, table, orders):
+        key = (table, orders)
+        rows = self._sorted.get(key)
+        if rows is None:
+            rows = list(self.tables.setdefault(table, []))
+            for column, desc in reversed(orders):
+                rows.sort(key=lambda row: _sort_key(row.get(column)), reverse=desc)
+            self._sorted[key] = rows
+        return rows
+
+    def related(self, table, relation, row):
+        target = RELATION_TABLES.get(relation, relation)
+        for column in FOREIGN_KEYS:
+            if row.get(column) is not None:
+                bucket = self.index(target, "id").get(row[column])
+                return next(iter(bucket.values())) if bucket else None
+        return None
+
+    def _changed(self, table, columns=None):
+        self.version += 1
+        self._memo.clear()
+        for key in [k for k in self._sorted if k[0] == table]:
+            if columns is None or any(column in columns for column, _ in key[1]):
+                del self._sorted[key]
+
+    def insert_row(self, table, row):
+        row.setdefault("id", str(uuid.uuid4()))
+        row.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+        self.tables.setdefault(table, []).append(row)
+        for (index_table, column), index in self._indexes.items():
+            if index_table == table and _hashable(row.get(column)):
+                index.setdefault(row.get(column), {})[row["id"]] = row
+        self._changed(table)
+        return row
+
+    def update_row(self, table, row, payload):
+        if "updated_at" in row and "updated_at" not in payload:
+            # The update_*_updated_at triggers
+            payload = {**payload, "updated_at": datetime.now(timezone.utc).isoformat()}
+        for column, value in payload.items():
+            index = self._indexes.get((table, column))
+            if index is not None and _hashable(row.get(column)):
+                index.get(row.get(column), {}).pop(row["id"], None)
+            row[column] = value
+            if index is not None and _hashable(value):
+                index.setdefault(value, {})[row["id"]] = row
+        self._changed(table, set(payload))
+
+    def delete_row(self, table, row):
+        rows = self.tables.get(table, [])
+        rows.remove(row)
+        for (index_table, column), index in self._indexes.items():
+            if index_table == table and _hashable(row.get(column)):
+                index.get(row.get(column), {}).pop(row["id"], None)
+        self._changed(table)
+
+    def memo(self, key, compute):
+        """Cache an RPC result until the next write"""
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+
+# ---- RPC implementations (see the SUPABASE_*.sql files) ----
+
+def _painting_facets(client, params):
+    def compute():
+        location = params.get("p_location")
+        available = params.get("p_available")
+        min_price = params.get("p_min_price")
+        max_price = params.get("p_max_price")
+        category = params.get("p_category")
+        categories, buckets, total = {}, {}, 0
+        for row in client.index("artworks", "is_approved").get(True, {}).values():
+            if available is not None and row.get("is_available") != available:
+                continue
+            if location:
+                artist = client.related("artworks", "profiles", row) or {}
+                if location.lower() not in str(artist.get("location") or "").lower():
+                    continue
+            price = row.get("price") or 0
+            in_price = (min_price is None or price >= min_price) and (max_price is None or price < max_price)
+            in_category = category is None or row.get("category") == category
+            if in_price:
+                categories[row.get("category")] = categories.get(row.get("category"), 0) + 1
+                total += in_category
+            if in_category:
+                bucket = ("under-5000" if price < 5000 else "5000-15000" if price < 15000
+                          else "15000-50000" if price < 50000 else "above-50000")
+                buckets[bucket] = buckets.get(bucket, 0) + 1
+        return {"total": total, "categories": categories, "price_buckets": buckets}
+    return client.memo(("painting_facets", tuple(sorted(params.items()))), compute)
+
+
+def _artist_dashboard_stats(client, params):
+    artist_id = params.get("p_artist_id")
+    artworks = list(client.index("artworks", "artist_id").get(artist_id, {}).values())
+    return {
+        "total_artworks": len(artworks),
+        "portfolio_views": sum(row.get("views") or 0 for row in artworks),
+        "completed_orders": len(client.index("orders", "artist_id").get(artist_id, {})),
+    }
+
+
+def _increment_artwork_views(client, params):
+    by_id = client.index("artworks", "id")
+    for artwork_id, count in (params.get("view_counts") or {}).items():
+        for row in list(by_id.get(artwork_id, {}).values()):
+            client.update_row("artworks", row, {"views": (row.get("views") or 0) + int(count)})
+    return None
+
+
+def _reconcile_platform_counters(client, params):
+    counters = compute_platform_counters(client.tables)
+    before = next(iter(client.tables.get("platform_counters", [])), None)
+    client.tables["platform_counters"] = [counters]
+    client._indexes.pop(("platform_counters", "id"), None)
+    return {"before": before, "after": counters}
+
+
+def _exhibition_revenue_columns(client, params):
+    def parse(value):
+        return datetime.fromisoformat(value) if value else None
+
+    def compute():
+        since, until = parse(params.get("p_since")), parse(params.get("p_until"))
+        columns = {name: [] for name in ("created_at", "exhibition_type", "fees",
+                                         "additional_artwork_fee", "voluntary_platform_fee")}
+        for row in client.tables.get("exhibitions", []):
+            created_at = datetime.fromisoformat(row["created_at"])
+            if (since and created_at < since) or (until and created_at >= until):
+                continue
+            columns["created_at"].append(created_at.timestamp())
+            columns["exhibition_type"].append(row.get("exhibition_type") or "Kalakanksh")
+            for name in ("fees", "additional_artwork_fee", "voluntary_platform_fee"):
+                columns[name].append(row.get(name) or 0)
+        return columns
+    return client.memo(("exhibition_revenue_columns", tuple(sorted(params.items()))), compute)
+
+
+def _artist_sample_artworks(client, params):
+    by_artist = client.index("artworks", "artist_id")
+    samples = []
+    for artist_id in params.get("p_artist_ids") or []:
+        approved = [row for row in by_artist.get(artist_id, {}).values() if row.get("is_approved")]
+        approved.sort(key=lambda row: _sort_key(row.get("views")), reverse=True)
+        samples.extend(_copy_row(row) for row in approved[:params.get("p_per_artist", 3)])
+    return samples
+
+
+def _create_art_class_enquiry(client, params):
+    # Runs under the client lock, like the function's per-user advisory lock
+    user_id = params["p_user_id"]
+    since = datetime.now(timezone.utc) - timedelta(days=30)
+    for row in client.index("art_class_enquiries", "user_id").get(user_id, {}).values():
+        if datetime.fromisoformat(row["created_at"]) >= since:
+            return None
+    profile = next(iter(client.index("profiles", "id").get(user_id, {}).values()), {})
+    matched = list(params.get("p_matched_artists") or [])
+    now = datetime.now(timezone.utc)
+    return _copy_row(client.insert_row("art_class_enquiries", {
+        "user_id": user_id, "user_name": profile.get("full_name") or "", "user_email": profile.get("email") or "",
+        "user_location": params.get("p_user_location") or profile.get("location") or "",
+        "art_type": params["p_art_type"], "skill_level": params["p_skill_level"], "duration": params["p_duration"],
+        "budget_range": params.get("p_budget_range"), "class_type": params["p_class_type"],
+        "status": "matched" if matched else "pending", "matched_artists": matched, "contacts_revealed": [],
+        "created_at": now.isoformat(), "expires_at": (now + timedelta(days=30)).isoformat(),
+    }))
+
+
+DEFAULT_FUNCTIONS = {
+    "painting_facets": _painting_facets,
+    "artist_dashboard_stats": _artist_dashboard_stats,
+    "increment_artwork_views": _increment_artwork_views,
+    "reconcile_platform_counters": _reconcile_platform_counters,
+    "exhibition_revenue_columns": _exhibition_revenue_columns,
+    "create_art_class_enquiry": _create_art_class_enquiry,
+    "artist_sample_artworks": _artist_sample_artworks,
+}
+
+
+def compute_platform_counters(tables: dict) -> dict:
+    """The platform_counters row the triggers would maintain for these tables"""
+    profiles = tables.get("profiles", [])
+    artworks = tables.get("artworks", [])
+    exhibitions = tables.get("exhibitions", [])
+    artists = [p for p in profiles if p.get("role") == "artist"]
+    return {
+        "id": 1,
+        "total_users": len(profiles),
+        "approved_artists": sum(p.get("is_approved") is True for p in artists),
+        "pending_artists": sum(p.get("is_approved") is False for p in artists),
+        "approved_artworks": sum(a.get("is_approved") is True for a in artworks),
+        "pending_artworks": sum(a.get("is_approved") is False for a in artworks),
+        "total_exhibitions": len(exhibitions),
+        "approved_exhibitions": sum(e.get("is_approved") is True for e in exhibitions),
+        "pending_exhibitions": sum(e.get("is_approved") is False for e in exhibitions),
+        "active_exhibitions": sum(e.get("status") == "active" for e in exhibitions),
+        "archived_exhibitions": sum(e.get("status") == "archived" for e in exhibitions),
+        "total_revenue": sum(e.get("fees") or 0 for e in exhibitions),
+        "voluntary_platform_fees": sum(e.get("voluntary_platform_fee") or 0 for e in exhibitions),
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+# ---- seeded datasets ----
+
+CATEGORIES = ["Painting", "Sketch", "Sculpture", "Digital Art", "Photography", "Mural", "Calligraphy"]
+LOCATIONS = ["Mumbai", "Delhi", "Bengaluru", "Pune", "Jaipur", "Kolkata", "Chennai", "Hyderabad"]
+STAFF_ROLES = ("admin", "lead_chitrakar", "kalakar")
+
+
+def seed_dataset(artworks: int = 10_000, seed: int = 42) -> dict:
+    """
+    Deterministic synthetic tables sized by the number of artworks (10k-1M).
+    Returns {"tables": ..., "ids": ...}, where ids names rows the benchmarks
+    act as or look up: one profile per staff role, an approved artist with
+    artworks, plain users with matched art-class enquiries, and so on.
+    """
+    rng = random.Random(seed)
+    start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+    def new_id():
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    def timestamp(offset_minutes):
+        return (start + timedelta(minutes=offset_minutes)).isoformat()
+
+    num_artists = max(50, artworks // 20)
+    num_users = num_artists * 4
+
+    profiles = []
+    for role in STAFF_ROLES:
+        profiles.append({
+            "id": new_id(), "full_name": f"{role.title()} One", "name": f"{role.title()} One",
+            "email": f"{role}@example.com", "role": role, "is_approved": True, "is_active": True,
+            "categories": [], "created_at": timestamp(0),
+        })
+    for i in range(num_artists):
+        teaches = i % 3 == 0
+        profiles.append({
+            "id": new_id(), "full_name": f"Artist {i}", "name": f"Artist {i}",
+            "email": f"artist{i}@example.com", "phone": f"98{i:08d}", "role": "artist",
+            "bio": "Works in mixed media.", "avatar": f"https://cdn.example.com/avatars/{i}.jpg",
+            "categories": rng.sample(CATEGORIES, 2), "location": rng.choice(LOCATIONS),
+            "teaching_rate": rng.choice([250, 300, 350, 400, 450, 600, 800]) if teaches else None,
+            "teaches_online": teaches and i % 2 == 0, "teaches_offline": teaches and i % 2 == 1,
+            "is_approved": i % 10 != 9, "is_active": True, "created_at": timestamp(i * 7),
+        })
+    for i in range(num_users):
+        profiles.append({
+            "id": new_id(), "full_name": f"User {i}", "name": f"User {i}", "email": f"user{i}@example.com",
+            "role": "user", "location": rng.choice(LOCATIONS), "categories": [],
+            "is_approved": True, "is_active": True, "created_at": timestamp(i * 3 + 1),
+        })
+    for profile in profiles:
+        profile["updated_at"] = profile["created_at"]
+    artists = [p for p in profiles if p["role"] == "artist"]
+    approved_artists = [p for p in artists if p["is_approved"]]
+    users = [p for p in profiles if p["role"] == "user"]
+
+    artwork_rows = []
+    for i in range(artworks):
+        artist = artists[i % num_artists]
+        artwork_rows.append({
+            "id": new_id(), "artist_id": artist["id"], "title": f"Untitled {i}", "description": None,
+            "category": CATEGORIES[i % len(CATEGORIES)], "price": float(rng.randrange(500, 100000, 50)),
+            "image": f"https://cdn.example.com/artworks/{i}.jpg",
+            "is_approved": artist["is_approved"] and i % 10 != 0, "is_available": i % 4 != 0,
+            "views": rng.randrange(0, 5000), "created_at": timestamp(i),
+        })
+
+    exhibitions = []
+    statuses = ["upcoming", "active", "completed", "archived"]
+    for i in range(max(20, artworks // 50)):
+        exhibitions.append({
+            "id": new_id(), "artist_id": artists[i % num_artists]["id"], "name": f"Exhibition {i}",
+            "description": None, "start_date": "2024-01-01", "end_date": "2024-01-04",
+            "artwork_ids": [], "status": statuses[i % 4], "views": 0, "exhibition_type": "Kalakanksh",
+            "fees": 1000, "voluntary_platform_fee": rng.choice([0, 0, 100, 250]),
+            "is_approved": i % 8 != 0, "created_at": timestamp(i * 60),
+        })
+
+    featured = []
+    for i in range(12):
+        artist = approved_artists[i]
+        featured.append({
+            "id": new_id(), "name": artist["full_name"], "full_name": artist["full_name"], "bio": artist["bio"],
+            "avatar": artist["avatar"], "categories": artist["categories"], "location": artist["location"],
+            "artworks": [], "type": "contemporary" if i % 2 else "registered",
+            "artist_id": None if i % 2 else artist["id"], "is_featured": True, "created_at": timestamp(i),
+        })
+
+    teachers = [p for p in approved_artists if p.get("teaching_rate")]
+    now = datetime.now(timezone.utc)
+    enquiries = []
+    for i, user in enumerate(users[:max(100, num_users // 4)]):
+        enquiries.append({
+            "id": new_id(), "user_id": user["id"], "user_name": user["full_name"], "user_email": user["email"],
+            "user_location": user["location"], "art_type": "Painting", "skill_level": "beginner",
+            "duration": "1 month", "budget_range": "250-350", "class_type": "online", "status": "matched",
+            "matched_artists": [t["id"] for t in rng.sample(teachers, min(3, len(teachers)))],
+            "contacts_revealed": [],
+            # Older than 30 days, so these users may submit a new enquiry
+            "created_at": (now - timedelta(days=40 + i % 200)).isoformat(),
+            "expires_at": (now + timedelta(days=30)).isoformat(),
+        })
+
+    orders = []
+    for i in range(max(100, artworks // 10)):
+        artwork = artwork_rows[rng.randrange(artworks)]
+        orders.append({
+            "id": new_id(), "artwork_id": artwork["id"], "buyer_id": rng.choice(users)["id"],
+            "artist_id": artwork["artist_id"], "amount": artwork["price"], "status": "completed",
+            "created_at": timestamp(i * 5),
+        })
+
+    tables = {
+        "profiles": profiles, "artworks": artwork_rows, "exhibitions": exhibitions,
+        "featured_artists": featured, "art_class_enquiries": enquiries, "orders": orders,
+    }
+    tables["platform_counters"] = [compute_platform_counters(tables)]
+
+    bench_artist = approved_artists[0]
+    ids = {
+        "admin": profiles[0]["id"],
+        "lead_chitrakar": profiles[1]["id"],
+        "kalakar": profiles[2]["id"],
+        "artist": bench_artist["id"],
+        "users": [e["user_id"] for e in enquiries],
+        "enquiries": [e["id"] for e in enquiries],
+        "approved_artists": [p["id"] for p in approved_artists],
+        "pending_artists": [p["id"] for p in artists if not p["is_approved"]],
+        "approved_artworks": [a["id"] for a in artwork_rows[:1000] if a["is_approved"]],
+        "pending_artworks": [a["id"] for a in artwork_rows if not a["is_approved"]][:1000],
+        "artist_artworks": [a["id"] for a in artwork_rows if a["artist_id"] == bench_artist["id"]],
+        "pending_exhibitions": [e["id"] for e in exhibitions if not e["is_approved"]],
+        "featured": [f["id"] for f in featured],
+    }
+    return {"tables": tables, "ids": ids}
@@ -4,6 +4,8 @@ import { publicAPI } from '../services/api';
 
 function ArtistsPage() {
   const [artists, setArtists] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [featuredArtists, setFeaturedArtists] = useState({ contemporary: [], registered: [] });
   const [loading, setLoading] = useState(true);
   const [activeTab, setActiveTab] = useState('registered');
@@ -19,6 +21,7 @@ function ArtistsPage() {
         publicAPI.getFeaturedArtists()
       ]);
       setArtists(artistsRes.artists || []);
+      setNextCursor(artistsRes.next_cursor || null);
       setFeaturedArtists(featuredRes);
     } catch (error) {
       console.error('Error fetching artists:', error);
@@ -27,6 +30,19 @@ function ArtistsPage() {
     }
   };
 
+  const loadMoreArtists = async () => {
+    setLoadingMore(true);
+    try {
+      const response = await publicAPI.getArtists({ cursor: nextCursor });
+      setArtists(prev => [...prev, ...(response.artists || [])]);
+      setNextCursor(response.next_cursor || null);
+    } catch (error) {
+      console.error('Error fetching more artists:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   if (loading) {
     return (
       <div className="min-h-screen flex items-center justify-center">
@@ -125,6 +141,17 @@ function ArtistsPage() {
                 ))}
               </div>
             )}
+            {nextCursor && (
+              <div className="text-center mt-8">
+                <button
+                  onClick={loadMoreArtists}
+                  disabled={loadingMore}
+                  className="px-6 py-2 bg-white border border-orange-300 text-orange-600 rounded-lg hover:bg-orange-50 disabled:opacity-50"
+                >
+                  {loadingMore ? 'Loading...' : 'Load More Artists'}
+                </button>
+              </div>
+            )}
           </>
         )}
 
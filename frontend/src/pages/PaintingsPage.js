@@ -1,72 +1,77 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useCallback } from 'react';
 import { Link } from 'react-router-dom';
 import { publicAPI } from '../services/api';
 import { ART_CATEGORIES } from '../utils/branding';
 
+// Price filter buckets: [min (inclusive), max (exclusive)]
+const PRICE_RANGES = {
+  'under-5000': [0, 5000],
+  '5000-15000': [5000, 15000],
+  '15000-50000': [15000, 50000],
+  'above-50000': [50000, null],
+};
+
+// UI sort option -> server sort key
+const SORT_KEYS = {
+  'latest': 'newest',
+  'popular': 'views',
+  'price-low': 'price_asc',
+  'price-high': 'price_desc',
+};
+
 function PaintingsPage() {
   const [paintings, setPaintings] = useState([]);
-  const [filteredPaintings, setFilteredPaintings] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [facets, setFacets] = useState({ total: 0, categories: {}, price_buckets: {} });
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [selectedCategory, setSelectedCategory] = useState('all');
   const [sortBy, setSortBy] = useState('latest');
   const [priceRange, setPriceRange] = useState('all');
 
+  // Filtering and sorting happen on the server; only the current page is fetched
+  const filterParams = useCallback(() => {
+    const [minPrice, maxPrice] = PRICE_RANGES[priceRange] || [];
+    return {
+      category: selectedCategory !== 'all' ? selectedCategory : undefined,
+      min_price: minPrice,
+      max_price: maxPrice,
+      sort: SORT_KEYS[sortBy],
+    };
+  }, [selectedCategory, priceRange, sortBy]);
+
   const fetchPaintings = useCallback(async () => {
     try {
-      const response = await publicAPI.getPaintings();
+      const response = await publicAPI.getPaintings(filterParams());
       setPaintings(response.paintings || []);
+      setNextCursor(response.next_cursor || null);
+      if (response.facets) {
+        setFacets(response.facets);
+      }
     } catch (error) {
       console.error('Error fetching paintings:', error);
     } finally {
       setLoading(false);
     }
-  }, []);
-
-  const filterAndSortPaintings = useCallback(() => {
-    let filtered = [...paintings];
-
-    if (selectedCategory !== 'all') {
-      filtered = filtered.filter(p => p.category === selectedCategory);
-    }
-
-    if (priceRange !== 'all') {
-      const ranges = {
-        'under-5000': [0, 5000],
-        '5000-15000': [5000, 15000],
-        '15000-50000': [15000, 50000],
-        'above-50000': [50000, Infinity],
-      };
-      const [min, max] = ranges[priceRange];
-      filtered = filtered.filter(p => p.price >= min && p.price < max);
-    }
+  }, [filterParams]);
 
-    switch (sortBy) {
-      case 'price-low':
-        filtered.sort((a, b) => a.price - b.price);
-        break;
-      case 'price-high':
-        filtered.sort((a, b) => b.price - a.price);
-        break;
-      case 'popular':
-        filtered.sort((a, b) => (b.views || 0) - (a.views || 0));
-        break;
-      default:
-        filtered.sort(
-          (a, b) => new Date(b.created_at) - new Date(a.created_at)
-        );
+  const loadMorePaintings = async () => {
+    setLoadingMore(true);
+    try {
+      const response = await publicAPI.getPaintings({ ...filterParams(), cursor: nextCursor });
+      setPaintings(prev => [...prev, ...(response.paintings || [])]);
+      setNextCursor(response.next_cursor || null);
+    } catch (error) {
+      console.error('Error fetching more paintings:', error);
+    } finally {
+      setLoadingMore(false);
     }
-
-    setFilteredPaintings(filtered);
-  }, [paintings, selectedCategory, priceRange, sortBy]);
+  };
 
   useEffect(() => {
     fetchPaintings();
   }, [fetchPaintings]);
 
-  useEffect(() => {
-    filterAndSortPaintings();
-  }, [filterAndSortPaintings]);
-
   if (loading) {
     return (
       <div className="min-h-screen flex items-center justify-center">
@@ -101,7 +106,7 @@ function PaintingsPage() {
               >
                 <option value="all">All Categories</option>
                 {ART_CATEGORIES.map(cat => (
-                  <option key={cat} value={cat}>{cat}</option>
+                  <option key={cat} value={cat}>{cat} ({facets.categories?.[cat] || 0})</option>
                 ))}
               </select>
             </div>
@@ -115,10 +120,10 @@ function PaintingsPage() {
                 className="w-full px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-orange-500 focus:border-transparent"
               >
                 <option value="all">All Prices</option>
-                <option value="under-5000">Under ₹5,000</option>
-                <option value="5000-15000">₹5,000 - ₹15,000</option>
-                <option value="15000-50000">₹15,000 - ₹50,000</option>
-                <option value="above-50000">Above ₹50,000</option>
+                <option value="under-5000">Under ₹5,000 ({facets.price_buckets?.['under-5000'] || 0})</option>
+                <option value="5000-15000">₹5,000 - ₹15,000 ({facets.price_buckets?.['5000-15000'] || 0})</option>
+                <option value="15000-50000">₹15,000 - ₹50,000 ({facets.price_buckets?.['15000-50000'] || 0})</option>
+                <option value="above-50000">Above ₹50,000 ({facets.price_buckets?.['above-50000'] || 0})</option>
               </select>
             </div>
 
@@ -141,11 +146,11 @@ function PaintingsPage() {
 
         {/* Results Count */}
         <p className="text-gray-600 mb-6">
-          Showing <span className="font-semibold">{filteredPaintings.length}</span> painting{filteredPaintings.length !== 1 ? 's' : ''}
+          Showing <span className="font-semibold">{paintings.length}</span> of {facets.total} painting{facets.total !== 1 ? 's' : ''}
         </p>
 
         {/* Paintings Grid */}
-        {filteredPaintings.length === 0 ? (
+        {paintings.length === 0 ? (
           <div className="text-center py-16 bg-white rounded-xl">
             <span className="text-6xl mb-4 block">🎨</span>
             <h3 className="text-xl font-semibold text-gray-900 mb-2">No paintings found</h3>
@@ -153,7 +158,7 @@ function PaintingsPage() {
           </div>
         ) : (
           <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-6">
-            {filteredPaintings.map(painting => (
+            {paintings.map(painting => (
               <Link 
                 key={painting.id} 
                 to={`/painting/${painting.id}`}
@@ -196,6 +201,18 @@ function PaintingsPage() {
           </div>
         )}
 
+        {nextCursor && (
+          <div className="text-center mt-8">
+            <button
+              onClick={loadMorePaintings}
+              disabled={loadingMore}
+              className="px-6 py-2 bg-white border border-orange-300 text-orange-600 rounded-lg hover:bg-orange-50 disabled:opacity-50"
+            >
+              {loadingMore ? 'Loading...' : 'Load More Paintings'}
+            </button>
+          </div>
+        )}
+
         {/* Contact Note */}
         <div className="mt-12 bg-orange-50 border border-orange-200 rounded-xl p-6 text-center">
           <h3 className="text-lg font-semibold text-orange-800 mb-2">
@@ -42,6 +42,14 @@ const apiCall = async (endpoint, options = {}) => {
   return data;
 };
 
+// Append non-empty query parameters (e.g. pagination cursor) to an endpoint
+const withParams = (endpoint, params = {}) => {
+  const query = new URLSearchParams(
+    Object.entries(params).filter(([, value]) => value !== undefined && value !== null && value !== '')
+  ).toString();
+  return query ? `${endpoint}?${query}` : endpoint;
+};
+
 // Auth APIs - Now using Supabase directly, these are for profile updates only
 export const authAPI = {
   updateProfile: (data) => apiCall('/auth/profile', {
@@ -54,11 +62,11 @@ export const authAPI = {
 export const publicAPI = {
   getStats: () => apiCall('/public/stats'),
   getFeaturedArtists: () => apiCall('/public/featured-artists'),
-  getArtists: () => apiCall('/public/artists'),
+  getArtists: (params) => apiCall(withParams('/public/artists', params)),
   getArtistDetail: (artistId) => apiCall(`/public/artist/${artistId}`),
-  getPaintings: () => apiCall('/public/paintings'),
+  getPaintings: (params) => apiCall(withParams('/public/paintings', params)),
   getPaintingDetail: (paintingId) => apiCall(`/public/painting/${paintingId}`),
-  getExhibitions: () => apiCall('/public/exhibitions'),
+  getExhibitions: (params) => apiCall(withParams('/public/exhibitions', params)),
   getActiveExhibitions: () => apiCall('/public/exhibitions/active'),
   getArchivedExhibitions: () => apiCall('/public/exhibitions/archived'),
   getFeaturedArtistDetail: (artistId) => apiCall(`/public/featured-artist/${artistId}`),
@@ -0,0 +1,61 @@
+"""
+Script to recompute the platform counters from scratch
+Run this if the numbers on the homepage or dashboards look off
+
+Prerequisites:
+1. SUPABASE_PLATFORM_COUNTERS.sql has been run
+2. Set environment variables in .env:
+   - SUPABASE_URL
+   - SUPABASE_SERVICE_KEY (service_role key, not anon key!)
+
+Usage:
+python reconcile_counters.py
+"""
+
+import os
+from supabase import create_client, Client
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SUPABASE_URL = os.getenv('SUPABASE_URL', 'https://lurvhgzauuzwftfymjym.supabase.co')
+SUPABASE_SERVICE_KEY = os.getenv('SUPABASE_SERVICE_KEY', '')
+
+if not SUPABASE_SERVICE_KEY:
+    print("❌ ERROR: SUPABASE_SERVICE_KEY not set!")
+    print("Get it from: Supabase Dashboard → Settings → API → service_role key")
+    exit(1)
+
+# Create Supabase client with service role
+supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+
+def main():
+    print("\n🔄 Recomputing platform counters...")
+    
+    try:
+        result = supabase.rpc('reconcile_platform_counters', {}).execute()
+    except Exception as e:
+        print(f"❌ Error reconciling counters: {e}")
+        exit(1)
+    
+    before = (result.data or {}).get('before') or {}
+    after = (result.data or {}).get('after') or {}
+    
+    drifted = False
+    for name, value in after.items():
+        if name in ('id', 'updated_at'):
+            continue
+        old = before.get(name)
+        if old != value:
+            drifted = True
+            print(f"  ⚠️  {name}: {old} → {value}")
+        else:
+            print(f"  ✅ {name}: {value}")
+    
+    if drifted:
+        print("\n✅ Counters had drifted and have been corrected")
+    else:
+        print("\n✅ Counters were already accurate")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Streaming exports: keyset paging through every row, NDJSON and CSV encoding.
+"""
+
+import asyncio
+import json
+
+import export
+from pagination import decode_cursor
+
+
+class PageQuery:
+    path = "/profiles"
+    http_method = "GET"
+
+    def __init__(self, rows, cursor, size):
+        self.rows, self.cursor, self.size = rows, cursor, size
+
+    def execute(self):
+        rows = self.rows
+        if self.cursor:
+            created_at, row_id = decode_cursor(self.cursor)
+            rows = [row for row in rows if (row["created_at"], row["id"]) < (created_at, row_id)]
+        return type("Response", (), {"data": rows[:self.size + 1]})
+
+
+def make_rows(count):
+    return [
+        {"id": f"00000000-0000-4000-8000-{i:012d}", "created_at": f"2024-01-01T00:00:{i % 60:02d}+00:00",
+         "name": f"User {i}", "categories": ["Painting"] if i % 2 else None}
+        for i in range(count)
+    ]
+
+
+def stream(monkeypatch, rows, encode, batch_size):
+    ordered = sorted(rows, key=lambda row: (row["created_at"], row["id"]), reverse=True)
+    pages = []
+
+    def paginate(query, cursor, size, column, desc):
+        pages.append(cursor)
+        return PageQuery(ordered, cursor, size)
+
+    monkeypatch.setattr(export, "paginate", paginate)
+
+    async def collect():
+        return [chunk async for chunk in encode(export.iter_rows(lambda: None, batch_size=batch_size))]
+
+    return asyncio.run(collect()), pages, ordered
+
+
+def test_ndjson_export_pages_through_every_row(monkeypatch):
+    chunks, pages, ordered = stream(monkeypatch, make_rows(25), export.ndjson_lines, batch_size=10)
+
+    assert [json.loads(chunk) for chunk in chunks] == ordered
+    assert len(pages) == 3 and pages[0] is None
+
+
+def test_csv_export_writes_header_and_nested_values_as_json(monkeypatch):
+    chunks, _, _ = stream(monkeypatch, make_rows(3), export.csv_lines, batch_size=10)
+
+    lines = "".join(chunks).splitlines()
+    assert lines[0] == "id,created_at,name,categories"
+    assert len(lines) == 4
+    assert sum(line.endswith(',"[""Painting""]"') for line in lines[1:]) == 1
+    assert sum(line.endswith(",") for line in lines[1:]) == 2
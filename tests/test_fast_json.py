@@ -0,0 +1,25 @@
+"""
+orjson-encoded route responses.
+"""
+
+import asyncio
+import inspect
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import orjson
+
+from fast_json import FastJSONResponse, fast_json
+
+
+@fast_json
+async def handler(item_id: str, limit: int = 10):
+    return {"id": item_id, "limit": limit, "price": Decimal("12.5"), "at": datetime(2025, 1, 1, tzinfo=timezone.utc)}
+
+
+def test_keeps_signature_and_accepts_positional_calls():
+    assert list(inspect.signature(handler).parameters) == ["item_id", "limit"]
+
+    response = asyncio.run(handler("a", limit=3))
+    assert isinstance(response, FastJSONResponse)
+    assert orjson.loads(response.body) == {"id": "a", "limit": 3, "price": 12.5, "at": "2025-01-01T00:00:00+00:00"}
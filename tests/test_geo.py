@@ -0,0 +1,41 @@
+"""
+Offline geocoding and nearest-teacher matching for offline art classes.
+"""
+
+from geo import geocode, haversine_km
+from teacher_index import TeacherIndex
+from tests.test_teacher_index import teacher
+
+
+def test_geocode_free_text_locations():
+    mumbai = geocode("Mumbai")
+    assert geocode("Andheri West, BOMBAY") == mumbai
+    assert geocode("Thane, Mumbai") == geocode("thane")
+    assert geocode("Sector 17, Navi Mumbai") == geocode("Navi Mumbai") != mumbai
+    assert geocode("Anand Vihar, Delhi") == geocode("Delhi")
+    assert geocode("Atlantis") is None
+    assert geocode(None) is None
+    assert 110 < haversine_km(*mumbai, *geocode("Pune")) < 130
+
+
+def test_match_nearby_is_nearest_then_cheapest_within_radius():
+    index = TeacherIndex()
+    index.load([
+        teacher("mumbai", 450, offline=True, location="Bandra, Mumbai"),
+        teacher("thane", 300, offline=True, location="Thane"),
+        teacher("navi", 260, offline=True, location="Vashi"),
+        teacher("pune", 250, offline=True, location="Pune"),
+        teacher("online-only", 250, location="Mumbai"),
+        teacher("unknown", 250, offline=True, location="Somewhere"),
+    ])
+    lat, lon = geocode("Mumbai")
+
+    # Navi Mumbai (~17 km) and Thane (~19 km) share a 5 km band, so the cheaper comes first
+    assert index.match_nearby("Painting", lat, lon, 250, 500) == ["mumbai", "navi", "thane"]
+    assert index.match_nearby("Painting", lat, lon, 250, 350) == ["navi", "thane"]
+    assert index.match_nearby("Painting", lat, lon, 250, 500, radius_km=200, limit=5) == ["mumbai", "navi", "thane", "pune"]
+    assert index.match_nearby("Sketch", lat, lon, 250, 500) == []
+
+    index.remove("navi")
+    index.upsert(teacher("thane", 300, offline=False, location="Thane"))
+    assert index.match_nearby("Painting", lat, lon, 250, 500) == ["mumbai"]
@@ -0,0 +1,205 @@
+"""
+JWKS verification tests against a local stand-in for Supabase's
+/auth/v1/.well-known/jwks.json endpoint.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from fastapi import HTTPException
+
+import auth_utils
+
+
+class JWKSServer:
+    """Serves a mutable JWKS document and counts fetches"""
+
+    def __init__(self, delay: float = 0.0):
+        self.keys = []
+        self.fetches = 0
+        self.delay = delay
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.fetches += 1
+                time.sleep(server.delay)
+                body = json.dumps({"keys": server.keys}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/auth/v1/.well-known/jwks.json"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def publish(self, *signers):
+        self.keys = [signer.jwk for signer in signers]
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class Signer:
+    def __init__(self, kid: str, alg: str):
+        self.kid = kid
+        self.alg = alg
+        if alg == "RS256":
+            self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+            jwk = jwt.algorithms.RSAAlgorithm.to_jwk(self.private_key.public_key(), as_dict=True)
+        else:
+            self.private_key = ec.generate_private_key(ec.SECP256R1())
+            jwk = jwt.algorithms.ECAlgorithm.to_jwk(self.private_key.public_key(), as_dict=True)
+        self.jwk = {**jwk, "kid": kid, "alg": alg, "use": "sig"}
+
+    def token(self, sub: str = "user-1", **claims) -> str:
+        payload = {"sub": sub, "aud": "authenticated", "exp": int(time.time()) + 3600, **claims}
+        return jwt.encode(payload, self.private_key, algorithm=self.alg, headers={"kid": self.kid})
+
+
+@pytest.fixture
+def jwks_server(monkeypatch):
+    server = JWKSServer()
+    monkeypatch.setattr(auth_utils, "SUPABASE_JWKS_URL", server.url)
+    monkeypatch.setattr(auth_utils, "SUPABASE_JWT_SECRET", "")
+    monkeypatch.setattr(auth_utils, "_jwks_cache", None)
+    monkeypatch.setattr(auth_utils, "_jwks_keys", {})
+    monkeypatch.setattr(auth_utils, "_jwks_fetched_at", None)
+    monkeypatch.setattr(auth_utils, "_jwks_refresh", None)
+    auth_utils._token_cache.clear()
+    yield server
+    server.close()
+
+
+def test_verifies_rs256_and_es256_tokens(jwks_server):
+    rsa_signer = Signer("rsa-1", "RS256")
+    ec_signer = Signer("ec-1", "ES256")
+    jwks_server.publish(rsa_signer, ec_signer)
+
+    async def run():
+        return (
+            await auth_utils.decode_token(rsa_signer.token(sub="a")),
+            await auth_utils.decode_token(ec_signer.token(sub="b")),
+        )
+
+    rsa_claims, ec_claims = asyncio.run(run())
+    assert rsa_claims["sub"] == "a"
+    assert ec_claims["sub"] == "b"
+    assert jwks_server.fetches == 1
+    assert set(auth_utils._jwks_keys) == {"rsa-1", "ec-1"}
+
+
+def test_rejects_token_signed_by_unpublished_key(jwks_server):
+    published = Signer("rsa-1", "RS256")
+    forged = Signer("rsa-1", "RS256")
+    jwks_server.publish(published)
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        asyncio.run(auth_utils.decode_token(forged.token()))
+
+
+def test_rotation_refresh_is_coalesced(jwks_server):
+    old = Signer("old", "ES256")
+    new = Signer("new", "ES256")
+    jwks_server.publish(old)
+    asyncio.run(auth_utils.decode_token(old.token()))
+    assert jwks_server.fetches == 1
+
+    # Rotate; many requests with the new kid arrive at once
+    jwks_server.publish(old, new)
+    jwks_server.delay = 0.2
+    auth_utils._jwks_fetched_at -= auth_utils.JWKS_MIN_REFRESH_INTERVAL
+
+    async def run():
+        tokens = [new.token(sub=f"user-{i}") for i in range(20)]
+        return await asyncio.gather(*(auth_utils.decode_token(token) for token in tokens))
+
+    claims = asyncio.run(run())
+    assert [c["sub"] for c in claims] == [f"user-{i}" for i in range(20)]
+    assert jwks_server.fetches == 2
+
+
+def test_unknown_kid_refresh_is_rate_limited(jwks_server):
+    known = Signer("known", "RS256")
+    stranger = Signer("stranger", "RS256")
+    jwks_server.publish(known)
+    asyncio.run(auth_utils.decode_token(known.token()))
+
+    for i in range(5):
+        with pytest.raises(jwt.InvalidTokenError, match="Unknown signing key"):
+            asyncio.run(auth_utils.decode_token(stranger.token(sub=f"bot-{i}")))
+    assert jwks_server.fetches == 1
+
+
+def test_stale_keys_refresh_in_background(jwks_server):
+    signer = Signer("rsa-1", "RS256")
+    jwks_server.publish(signer)
+    asyncio.run(auth_utils.decode_token(signer.token(sub="a")))
+    auth_utils._jwks_fetched_at -= auth_utils.JWKS_TTL + 1
+    jwks_server.delay = 0.2
+
+    async def run():
+        started = time.monotonic()
+        claims = await auth_utils.decode_token(signer.token(sub="b"))
+        elapsed = time.monotonic() - started
+        await auth_utils._jwks_refresh
+        return claims, elapsed
+
+    claims, elapsed = asyncio.run(run())
+    assert claims["sub"] == "b"
+    assert elapsed < jwks_server.delay
+    assert jwks_server.fetches == 2
+
+
+def test_rejected_token_is_negatively_cached(jwks_server):
+    signer = Signer("rsa-1", "RS256")
+    jwks_server.publish(signer)
+    expired = signer.token(exp=int(time.time()) - 10)
+
+    with pytest.raises(jwt.ExpiredSignatureError):
+        asyncio.run(auth_utils.decode_token(expired))
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(auth_utils.decode_token(expired))
+    assert exc.value.status_code == 401
+    assert jwks_server.fetches == 1
+
+
+def test_rejects_symmetric_and_unsigned_tokens_without_a_secret(jwks_server):
+    jwks_server.publish(Signer("rsa-1", "RS256"))
+    claims = {"sub": "admin-id", "aud": "authenticated", "exp": int(time.time()) + 3600}
+    forged = [
+        jwt.encode(claims, "attacker-key", algorithm="HS256"),
+        jwt.encode(claims, None, algorithm="none"),
+    ]
+
+    for token in forged:
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(auth_utils._verify_token(token))
+        assert exc.value.status_code == 401
+
+
+def test_unverified_dev_tokens_are_not_cached(jwks_server, monkeypatch):
+    monkeypatch.setattr(auth_utils, "AUTH_INSECURE_SKIP_VERIFY", True)
+    token = jwt.encode({"sub": "dev", "exp": int(time.time()) + 3600}, "any-key-of-32-bytes-or-more-here", algorithm="HS256")
+
+    assert asyncio.run(auth_utils.decode_token(token))["sub"] == "dev"
+    assert auth_utils._token_cache.get(hashlib.sha256(token.encode()).digest()) is None
+
+    # Turning the flag off takes effect at once, not after the cache TTL
+    monkeypatch.setattr(auth_utils, "AUTH_INSECURE_SKIP_VERIFY", False)
+    with pytest.raises(jwt.InvalidAlgorithmError):
+        asyncio.run(auth_utils.decode_token(token))
@@ -0,0 +1,92 @@
+"""
+Metrics registry, request middleware and Supabase call instrumentation.
+"""
+
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+import metrics
+import supabase_client
+
+
+def series(text: str, prefix: str) -> dict:
+    """Sample lines starting with `prefix`, as {name+labels: value}"""
+    found = {}
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            key, value = line.rsplit(" ", 1)
+            found[key] = float(value)
+    return found
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = metrics.Histogram("test_latency_seconds", "Test latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "/a")
+
+    text = "\n".join(histogram.render())
+
+    assert "# TYPE test_latency_seconds histogram" in text
+    assert series(text, "test_latency_seconds") == {
+        'test_latency_seconds_bucket{route="/a",le="0.1"}': 1,
+        'test_latency_seconds_bucket{route="/a",le="1.0"}': 3,
+        'test_latency_seconds_bucket{route="/a",le="+Inf"}': 4,
+        'test_latency_seconds_sum{route="/a"}': 6.05,
+        'test_latency_seconds_count{route="/a"}': 4,
+    }
+
+
+def test_middleware_labels_requests_by_route_template():
+    app = FastAPI()
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        return {"id": item_id}
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            for item_id in ("a", "b", "c"):
+                await client.get(f"/items/{item_id}")
+            await client.get("/no/such/path")
+
+    asyncio.run(scenario())
+    text = metrics.render_metrics()
+
+    assert series(text, "http_requests_total")['http_requests_total{method="GET",route="/items/{item_id}",status="200"}'] >= 3
+    assert series(text, "http_requests_total")['http_requests_total{method="GET",route="unmatched",status="404"}'] >= 1
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}"}' in text
+    assert series(text, "http_requests_in_flight") == {"http_requests_in_flight": 0}
+
+
+class StubQuery:
+    def __init__(self, path, http_method, fail=False):
+        self.path = path
+        self.http_method = http_method
+        self.fail = fail
+
+    def execute(self):
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return "ok"
+
+
+def test_supabase_calls_are_labelled_by_table_and_operation():
+    async def scenario():
+        await supabase_client.run_query(StubQuery("/metrics_artworks", "PATCH"))
+        await supabase_client.run_query(StubQuery("/rpc/metrics_fn", "POST"))
+        try:
+            await supabase_client.run_query(StubQuery("/metrics_orders", "GET", fail=True))
+        except RuntimeError:
+            pass
+
+    asyncio.run(scenario())
+    text = metrics.render_metrics()
+
+    assert 'supabase_call_duration_seconds_count{table="metrics_artworks",operation="update"} 1' in text
+    assert 'supabase_call_duration_seconds_count{table="metrics_fn",operation="rpc"} 1' in text
+    assert 'supabase_call_errors_total{table="metrics_orders",operation="select"} 1' in text
+    assert series(text, "supabase_calls_in_flight") == {"supabase_calls_in_flight": 0}
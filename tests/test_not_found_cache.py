@@ -0,0 +1,57 @@
+"""
+Cached 404s for public detail lookups, and clearing them on approval.
+"""
+
+import asyncio
+import threading
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+import server
+
+
+class EmptyLookup:
+    """A select that finds nothing, held until `release` is set"""
+
+    path = "/artworks"
+    http_method = "GET"
+
+    def __init__(self, release):
+        self.release = release
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        self.release.wait(5)
+        return SimpleNamespace(data=[])
+
+
+def lookup_painting(monkeypatch, approve_during_lookup):
+    release = threading.Event()
+    monkeypatch.setattr(server, "get_supabase_client", lambda: SimpleNamespace(table=lambda name: EmptyLookup(release)))
+    painting_id = str(uuid.uuid4())
+
+    async def run():
+        generation = server.check_public_id("painting", painting_id, "Painting not found")
+        lookup = asyncio.ensure_future(server._load_painting(painting_id, generation))
+        await asyncio.sleep(0.05)
+        if approve_during_lookup:
+            server.forget_not_found("painting", painting_id)
+        release.set()
+        with pytest.raises(HTTPException):
+            await lookup
+
+    asyncio.run(run())
+    return server.not_found_cache.get(("painting", painting_id))
+
+
+def test_miss_is_cached(monkeypatch):
+    assert lookup_painting(monkeypatch, approve_during_lookup=False) is True
+
+
+def test_miss_from_a_lookup_begun_before_approval_is_not_cached(monkeypatch):
+    assert lookup_painting(monkeypatch, approve_during_lookup=True) is None
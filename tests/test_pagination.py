@@ -0,0 +1,48 @@
+"""
+Keyset cursors over sort columns that may hold NULLs.
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from pagination import encode_cursor, decode_cursor, paginate
+
+ROW_ID = "00000000-0000-4000-8000-000000000001"
+
+
+class RecordingQuery:
+    def __init__(self):
+        self.filters = None
+        self.orders = []
+
+    def or_(self, filters):
+        self.filters = filters
+        return self
+
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, size):
+        return self
+
+
+def test_cursor_round_trips_null_and_numeric_values():
+    assert decode_cursor(encode_cursor({"id": ROW_ID, "views": None}, "views"), "views") == (None, ROW_ID)
+    assert decode_cursor(encode_cursor({"id": ROW_ID, "views": 7}, "views"), "views") == (7, ROW_ID)
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor({"id": ROW_ID, "views": [1]}, "views"), "views")
+
+
+@pytest.mark.parametrize("value, desc, expected", [
+    # NULLs sort after every value: first when descending, last when ascending
+    (5, True, f'views.lt."5",and(views.eq."5",id.lt.{ROW_ID})'),
+    (5, False, f'views.gt."5",and(views.eq."5",id.gt.{ROW_ID}),views.is.null'),
+    (None, True, f'views.not.is.null,and(views.is.null,id.lt.{ROW_ID})'),
+    (None, False, f'and(views.is.null,id.gt.{ROW_ID})'),
+])
+def test_keyset_filter_continues_past_nulls(value, desc, expected):
+    cursor = encode_cursor({"id": ROW_ID, "views": value}, "views")
+    query = paginate(RecordingQuery(), cursor, 10, column="views", desc=desc)
+    assert query.filters == expected
+    assert query.orders == [("views", desc), ("id", desc)]
@@ -0,0 +1,65 @@
+"""
+On-demand CPU sampling and allocation profiles.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import profiler
+
+
+def busy_loop(seconds):
+    deadline = time.monotonic() + seconds
+    total = 0
+    while time.monotonic() < deadline:
+        total += 1
+    return total
+
+
+def test_cpu_profile_returns_collapsed_stacks_of_busy_threads():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        work = loop.run_in_executor(None, busy_loop, 0.3)
+        collapsed = await profiler.cpu_profile(0.2, interval=0.005)
+        await work
+        return collapsed
+
+    collapsed = asyncio.run(scenario())
+
+    lines = collapsed.splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any("busy_loop (tests/test_profiler.py:" in line for line in lines)
+
+
+def test_memory_profile_reports_growth_and_stops_tracing():
+    kept = []
+
+    async def allocate():
+        await asyncio.sleep(0.05)
+        kept.extend(bytearray(1024) for _ in range(500))
+
+    async def scenario():
+        _, report = await asyncio.gather(allocate(), profiler.memory_profile(0.2, limit=5))
+        return report
+
+    report = asyncio.run(scenario())
+
+    assert not profiler.tracemalloc.is_tracing()
+    top = report["top"][0]
+    assert "test_profiler.py" in top["traceback"][0]
+    assert top["size_diff_kb"] >= 500
+
+
+def test_only_one_profile_runs_at_a_time():
+    async def scenario():
+        first = asyncio.ensure_future(profiler.cpu_profile(0.2))
+        await asyncio.sleep(0.05)
+        with pytest.raises(profiler.ProfilerBusy):
+            await profiler.memory_profile(0.1)
+        await first
+
+    asyncio.run(scenario())
@@ -0,0 +1,89 @@
+"""
+Public response cache: stale-while-revalidate, invalidation and the byte budget.
+"""
+
+import asyncio
+
+from cache_utils import ResponseCache
+
+
+class Loader:
+    """Returns `value`, counting calls; waits for `gate` when one is set"""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+        self.gate = None
+
+    async def __call__(self):
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        return self.value
+
+
+def test_stale_entry_is_served_while_one_refresh_runs():
+    cache = ResponseCache("test_swr", max_bytes=1 << 20)
+    loader = Loader({"v": 1})
+
+    async def run():
+        assert await cache.get_or_load("/r", "k", loader, ttl=0, stale_ttl=60) == {"v": 1}
+        loader.value = {"v": 2}
+        # Stale: both callers get the old value at once, and share one refresh
+        assert await cache.get_or_load("/r", "k", loader, ttl=0, stale_ttl=60) == {"v": 1}
+        assert await cache.get_or_load("/r", "k", loader, ttl=0, stale_ttl=60) == {"v": 1}
+        await asyncio.sleep(0.01)
+        assert loader.calls == 2
+        # The refresh replaced the entry
+        return await cache.get_or_load("/r", "k", loader, ttl=60, stale_ttl=60)
+
+    assert asyncio.run(run()) == {"v": 2}
+
+
+def test_load_started_before_invalidation_is_not_stored():
+    cache = ResponseCache("test_generation", max_bytes=1 << 20)
+    old = Loader({"v": "old"})
+
+    async def run():
+        old.gate = asyncio.Event()
+        pending = asyncio.ensure_future(cache.get_or_load("/r", "k", old, ttl=60, stale_ttl=60))
+        await asyncio.sleep(0)
+        cache.invalidate("/r")
+        old.gate.set()
+        assert await pending == {"v": "old"}
+        return await cache.get_or_load("/r", "k", Loader({"v": "new"}), ttl=60, stale_ttl=60)
+
+    assert asyncio.run(run()) == {"v": "new"}
+
+
+def test_least_recently_used_entries_are_evicted_past_the_byte_budget():
+    value = {"data": "x" * 100}
+    cache = ResponseCache("test_budget", max_bytes=250)
+
+    async def run():
+        for key in ("a", "b"):
+            await cache.get_or_load("/r", key, Loader(value), ttl=60, stale_ttl=0)
+        await cache.get_or_load("/r", "a", Loader(value), ttl=60, stale_ttl=0)  # touch a
+        await cache.get_or_load("/r", "c", Loader(value), ttl=60, stale_ttl=0)
+        # Larger than the whole budget: returned, never stored
+        await cache.get_or_load("/r", "huge", Loader({"data": "x" * 1000}), ttl=60, stale_ttl=0)
+
+    asyncio.run(run())
+    assert [key for _, key in cache._data] == ["a", "c"]
+    assert cache.total_bytes <= cache.max_bytes
+
+
+def test_refresh_too_big_to_cache_drops_the_stale_entry():
+    cache = ResponseCache("test_oversized_refresh", max_bytes=250)
+    loader = Loader({"data": "x" * 100})
+
+    async def run():
+        await cache.get_or_load("/r", "k", loader, ttl=0, stale_ttl=60)
+        loader.value = {"data": "x" * 1000}
+        await cache.get_or_load("/r", "k", loader, ttl=0, stale_ttl=60)
+        await asyncio.sleep(0.01)
+        # Served uncached from now on, not stale
+        return await cache.get_or_load("/r", "k", loader, ttl=0, stale_ttl=60)
+
+    assert asyncio.run(run()) == {"data": "x" * 1000}
+    assert not cache._data and cache.total_bytes == 0
@@ -0,0 +1,113 @@
+"""
+Revenue report bucketing: local-time periods and per-type totals.
+"""
+
+import asyncio
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+
+import revenue_report
+
+
+def epoch(text):
+    return datetime.fromisoformat(text).timestamp()
+
+
+COLUMNS = {
+    "created_at": [
+        epoch("2024-03-31T20:00:00+00:00"),  # 1 April 01:30 in Kolkata
+        epoch("2024-04-03T10:00:00+00:00"),
+        epoch("2024-04-08T10:00:00+00:00"),
+        epoch("2024-04-09T10:00:00+00:00"),
+    ],
+    "exhibition_type": ["Kalakanksh", "KalaDeeksh", "Kalakanksh", "Kalakanksh"],
+    "fees": [1000, 3000, 1000, 1000],
+    "additional_artwork_fee": [200, 0, 0, 100],
+    "voluntary_platform_fee": [50, 0, 25.5, 0],
+}
+
+
+def test_weekly_buckets_start_on_local_monday(monkeypatch):
+    monkeypatch.setattr(revenue_report, "REVENUE_REPORT_TIMEZONE", "Asia/Kolkata")
+
+    report = revenue_report.build_revenue_report(COLUMNS, "week")
+
+    assert [bucket["start"] for bucket in report["buckets"]] == ["2024-04-01", "2024-04-08"]
+    first, second = report["buckets"]
+    assert first["totals"] == {"fees": 4000, "additional_artwork_fee": 200, "voluntary_platform_fee": 50, "exhibitions": 2}
+    assert set(first["by_type"]) == {"Kalakanksh", "KalaDeeksh"}
+    assert second["by_type"] == {
+        "Kalakanksh": {"fees": 2000, "additional_artwork_fee": 100, "voluntary_platform_fee": 25.5, "exhibitions": 2}
+    }
+    assert report["totals"]["fees"] == 6000
+
+
+def test_monthly_buckets_follow_the_configured_timezone(monkeypatch):
+    monkeypatch.setattr(revenue_report, "REVENUE_REPORT_TIMEZONE", "UTC")
+
+    report = revenue_report.build_revenue_report(COLUMNS, "month")
+
+    assert [bucket["start"] for bucket in report["buckets"]] == ["2024-03-01", "2024-04-01"]
+    assert report["buckets"][0]["totals"]["exhibitions"] == 1
+
+
+def test_empty_report():
+    report = revenue_report.build_revenue_report({}, "day")
+
+    assert report["buckets"] == []
+    assert report["totals"]["exhibitions"] == 0
+
+
+class BlockingSupabase:
+    """Serves COLUMNS from the RPC, holding each call until `release` is set"""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+
+    def rpc(self, name, params):
+        supabase = self
+
+        class Query:
+            path = f"/rpc/{name}"
+
+            def execute(self):
+                supabase.calls += 1
+                supabase.release.wait(5)
+                return SimpleNamespace(data=COLUMNS)
+
+        return Query()
+
+
+def test_invalidation_during_a_load_is_not_undone():
+    revenue_report.revenue_report_cache.clear()
+    supabase = BlockingSupabase()
+
+    async def run():
+        before = asyncio.ensure_future(revenue_report.revenue_report(supabase, "month"))
+        await asyncio.sleep(0.05)
+        revenue_report.invalidate_revenue_reports()
+        # Arrives after the write: starts its own load instead of joining the old one
+        after = asyncio.ensure_future(revenue_report.revenue_report(supabase, "month"))
+        await asyncio.sleep(0.05)
+        assert supabase.calls == 2
+        supabase.release.set()
+        await asyncio.gather(before, after)
+
+    asyncio.run(run())
+    assert revenue_report.revenue_report_cache.get(("month", None, None)) is not None
+
+    # A load overtaken by an invalidation is returned but not cached
+    supabase.release.clear()
+    supabase.calls = 0
+
+    async def rerun():
+        before = asyncio.ensure_future(revenue_report.revenue_report(supabase, "day"))
+        await asyncio.sleep(0.05)
+        revenue_report.invalidate_revenue_reports()
+        supabase.release.set()
+        await before
+
+    asyncio.run(rerun())
+    assert revenue_report.revenue_report_cache.get(("day", None, None)) is None
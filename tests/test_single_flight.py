@@ -0,0 +1,94 @@
+"""
+Coalescing of concurrent identical calls.
+"""
+
+import asyncio
+
+import pytest
+
+from cache_utils import ResponseCache, SingleFlight, cached_response, single_flight
+
+
+def test_concurrent_callers_share_one_call_and_its_result():
+    flight = SingleFlight("test_flight_result")
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return {"rows": [1, 2]}
+
+    async def run():
+        return await asyncio.gather(*(flight.do("k", load) for _ in range(10)))
+
+    results = asyncio.run(run())
+    assert results == [{"rows": [1, 2]}] * 10
+    assert len(calls) == 1
+    assert (flight.calls, flight.coalesced) == (1, 9)
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_error_reaches_every_caller_and_the_next_call_retries():
+    flight = SingleFlight("test_flight_error")
+    attempts = []
+
+    async def load():
+        attempts.append(1)
+        await asyncio.sleep(0.02)
+        if len(attempts) == 1:
+            raise RuntimeError("upstream down")
+        return "ok"
+
+    async def run():
+        results = await asyncio.gather(*(flight.do("k", load) for _ in range(5)), return_exceptions=True)
+        return results, await flight.do("k", load)
+
+    results, retried = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert retried == "ok"
+    assert len(attempts) == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    flight = SingleFlight("test_flight_cancel")
+
+    async def load():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run():
+        first = asyncio.ensure_future(flight.do("k", load))
+        second = asyncio.ensure_future(flight.do("k", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "done"
+
+
+def test_calls_after_invalidation_do_not_join_an_earlier_load():
+    cache = ResponseCache("test_flight_generation", max_bytes=1 << 20)
+    flight = SingleFlight("test_flight_generation")
+    data = {"v": "old"}
+
+    @cached_response(cache, "/r", ttl=60, stale_ttl=60)
+    @single_flight(flight, "/r", generation=lambda: cache.generation("/r"))
+    async def handler():
+        snapshot = dict(data)
+        await asyncio.sleep(0.05)
+        return snapshot
+
+    async def run():
+        before = asyncio.ensure_future(handler())
+        await asyncio.sleep(0.01)
+        data["v"] = "new"
+        cache.invalidate("/r")
+        after = await handler()
+        return await before, after, await handler()
+
+    before, after, cached = asyncio.run(run())
+    assert before == {"v": "old"}
+    assert after == cached == {"v": "new"}
+    assert flight.coalesced == 0
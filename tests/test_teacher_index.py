@@ -0,0 +1,49 @@
+"""
+In-memory teacher index used for art-class matching.
+"""
+
+from teacher_index import TeacherIndex
+
+
+def teacher(teacher_id, rate, online=True, offline=False, categories=("Painting",), location="Mumbai", **extra):
+    return {
+        "id": teacher_id, "role": "artist", "is_approved": True, "is_active": True,
+        "teaching_rate": rate, "teaches_online": online, "teaches_offline": offline,
+        "categories": list(categories), "location": location, **extra,
+    }
+
+
+TEACHERS = [
+    teacher("a", 300),
+    teacher("b", 250, categories=("Sketch",)),
+    teacher("c", 350, offline=True, location="Navi Mumbai"),
+    teacher("d", 350, online=False, offline=True, location="Pune"),
+    teacher("e", 400),
+    teacher("f", 200, is_approved=False),
+    teacher("g", None),
+]
+
+
+def test_match_is_cheapest_first_within_inclusive_budget():
+    index = TeacherIndex()
+    index.load(TEACHERS)
+
+    assert index.match("Painting", "online", 250, 350) == ["a", "c"]
+    assert index.match("Painting", "offline", 250, 350, location="mumbai") == ["c"]
+    assert index.match("Painting", "offline", 300, 500) == ["c", "d"]
+    assert index.match(None, None, None, None, limit=10) == ["b", "a", "c", "d", "e"]
+    assert index.match("Sculpture", "online", 250, 350) == []
+
+
+def test_upsert_moves_and_drops_teachers():
+    index = TeacherIndex()
+    for profile in TEACHERS:
+        index.upsert(profile)
+
+    index.upsert(teacher("e", 260))
+    index.upsert(teacher("a", 300, is_active=False))
+    index.upsert(teacher("f", 270))
+    index.remove("c")
+
+    assert index.match("Painting", "online", 250, 350) == ["e", "f"]
+    assert len(index) == 4
@@ -0,0 +1,83 @@
+"""
+Per-request tracing: spans for Supabase calls, trace-id propagation and
+the slow-trace buffer.
+"""
+
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+import supabase_client
+import tracing
+
+
+class SlowQuery:
+    path = "/artworks"
+    http_method = "GET"
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def execute(self):
+        time.sleep(self.delay)
+        return "ok"
+
+
+def make_app():
+    app = FastAPI()
+    app.add_middleware(tracing.TracingMiddleware)
+
+    @app.get("/matches/{enquiry_id}")
+    async def matches(enquiry_id: str):
+        await supabase_client.run_query(SlowQuery(0.01))
+        await supabase_client.gather_queries(SlowQuery(0.02), SlowQuery(0.02))
+        return {"id": enquiry_id}
+
+    return app
+
+
+def request(app, path, headers=None):
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path, headers=headers)
+    return asyncio.run(send())
+
+
+def test_slow_request_is_kept_with_child_spans(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACE_SLOW_THRESHOLD_MS", 0)
+    monkeypatch.setattr(tracing, "_slow_traces", tracing.deque(maxlen=10))
+
+    response = request(make_app(), "/matches/abc")
+
+    trace = tracing.slow_traces()[0]
+    assert response.headers["x-trace-id"] == trace["trace_id"]
+    assert trace["name"] == "GET /matches/{enquiry_id}"
+    root, *children = trace["spans"]
+    assert root["attributes"] == {"status": 200, "path": "/matches/abc"}
+    assert [span["name"] for span in children] == ["supabase select artworks"] * 3
+    assert all(span["parent_id"] == root["span_id"] for span in children)
+    # The two gathered calls overlap
+    assert children[2]["start_ms"] < children[1]["start_ms"] + children[1]["duration_ms"]
+
+
+def test_incoming_trace_id_is_propagated(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACE_SLOW_THRESHOLD_MS", 0)
+    monkeypatch.setattr(tracing, "_slow_traces", tracing.deque(maxlen=10))
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+    response = request(make_app(), "/matches/abc", {"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"})
+
+    assert response.headers["x-trace-id"] == trace_id
+    assert tracing.slow_traces()[0]["spans"][0]["parent_id"] == "00f067aa0ba902b7"
+
+
+def test_fast_requests_are_not_kept(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACE_SLOW_THRESHOLD_MS", 10_000)
+    monkeypatch.setattr(tracing, "_slow_traces", tracing.deque(maxlen=10))
+
+    request(make_app(), "/matches/abc")
+
+    assert tracing.slow_traces() == []